@@ -227,11 +227,8 @@ class AnnotationManager:
         path = self.main.get_current_action_path()
         if not path: return
         
-        old_val = self.model.manual_annotations.get(path, {}).get(head)
-        for cmd in reversed(self.model.undo_stack):
-            if cmd['type'] == CmdType.UI_CHANGE and cmd['path'] == path and cmd['head'] == head:
-                old_val = cmd['new_val']; break
-                
+        # [FIX] O(1) lookup; scanning the undo stack decoded every paged-out entry on a miss
+        old_val = self.model.last_ui_value(path, head)
         self.model.push_undo(CmdType.UI_CHANGE, path=path, head=head, old_val=old_val, new_val=new_val)
 
     # ... handle_add_label_head, handle_remove_label_head ...
@@ -286,8 +283,10 @@ class AnnotationManager:
             self.main.show_temp_msg("Duplicate", "Label exists.", icon=QMessageBox.Icon.Warning)
             return
             
-        self.model.push_undo(CmdType.SCHEMA_ADD_LBL, head=head, label=txt)
-        labels.append(txt); labels.sort()
+        # [FIX] Insert at the sorted position without re-sorting the others: undo only removes the label
+        index = next((i for i, l in enumerate(labels) if l > txt), len(labels))
+        labels.insert(index, txt)
+        self.model.push_undo(CmdType.SCHEMA_ADD_LBL, head=head, label=txt, index=index)
         
         # Update UI directly
         from ui.classification.event_editor import DynamicSingleLabelGroup
@@ -304,13 +303,14 @@ class AnnotationManager:
             if defn['type'] == 'single_label' and v.get(head) == lbl: affected[k] = lbl
             elif defn['type'] == 'multi_label' and lbl in v.get(head, []): affected[k] = copy.deepcopy(v[head])
             
-        self.model.push_undo(CmdType.SCHEMA_DEL_LBL, head=head, label=lbl, affected_data=affected)
+        index = defn['labels'].index(lbl) if lbl in defn['labels'] else None
+        self.model.push_undo(CmdType.SCHEMA_DEL_LBL, head=head, label=lbl, index=index, affected_data=affected)
         
         if lbl in defn['labels']: defn['labels'].remove(lbl)
         
         for k, val in self.model.manual_annotations.items():
             if defn['type'] == 'single_label' and val.get(head) == lbl: val[head] = None
-            elif defn['type'] == 'multi_label' and lbl in val.get(head, []): val[head].remove(lbl)
+            elif defn['type'] == 'multi_label' and lbl in val.get(head, []): val[head] = [v for v in val[head] if v != lbl]
             
         from ui.classification.event_editor import DynamicSingleLabelGroup
         group = self.main.classification_panel.label_groups.get(head)
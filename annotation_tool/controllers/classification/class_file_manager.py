@@ -2,7 +2,6 @@ import os
 import json
 import datetime
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
-from utils import natural_sort_key
 
 class ClassFileManager:
     def __init__(self, main_window):
@@ -176,7 +175,7 @@ class ClassFileManager:
         
         json_dir = os.path.dirname(os.path.abspath(save_path))
         
-        sorted_items = sorted(self.model.action_item_data, key=lambda x: natural_sort_key(x.get('name', '')))
+        sorted_items = self.model.sorted_action_items()
         
         for item in sorted_items:
             path_key = item['path'] 
@@ -241,7 +240,8 @@ class ClassFileManager:
         try:
             with open(save_path, 'w', encoding='utf-8') as f: 
                 json.dump(out, f, indent=2, ensure_ascii=False)
-            
+            self.model.save_history(save_path)
+
             self.model.is_data_dirty = False
             self.main.update_save_export_button_state()
             self.main.show_temp_msg("Saved", f"Saved to {os.path.basename(save_path)}")
@@ -2,7 +2,7 @@ import os
 from PyQt6.QtWidgets import QMessageBox, QFileDialog, QWidget
 from PyQt6.QtCore import Qt, QModelIndex, QTimer
 # [Ref] Import from the correct models location
-from models.project_tree import ProjectTreeModel
+from models.project_tree import ProjectTreeModel, ClipStatus
 from utils import SUPPORTED_EXTENSIONS
 from controllers.media_controller import MediaController
 
@@ -62,10 +62,10 @@ class NavigationManager:
                     continue
                 
                 main_path = paths[0]
-                self.model.action_item_data.append({'name': name, 'path': main_path, 'source_files': paths})
+                entry = {'name': name, 'path': main_path, 'source_files': paths}
+                self.model.action_item_data.append(entry)
                 
-                item = self.main.tree_model.add_entry(name, main_path, paths)
-                self.model.action_item_map[main_path] = item
+                self.main.tree_model.append_entry(entry)
                 added_count += 1
                 
         else:
@@ -74,10 +74,10 @@ class NavigationManager:
                     continue
                 
                 name = os.path.basename(file_path)
-                self.model.action_item_data.append({'name': name, 'path': file_path, 'source_files': [file_path]})
+                entry = {'name': name, 'path': file_path, 'source_files': [file_path]}
+                self.model.action_item_data.append(entry)
                 
-                item = self.main.tree_model.add_entry(name, file_path, [file_path])
-                self.model.action_item_map[file_path] = item
+                self.main.tree_model.append_entry(entry)
                 added_count += 1
             
         if added_count > 0:
@@ -95,17 +95,14 @@ class NavigationManager:
         path = index.data(ProjectTreeModel.FilePathRole)
         
         # 1. Remove from Data
-        self.model.action_item_data = [d for d in self.model.action_item_data if d['path'] != path]
-        
-        if path in self.model.action_item_map:
-            del self.model.action_item_map[path]
+        self.model.action_item_data.remove_path(path)
             
         # 2. Remove Annotation if exists
         if path in self.model.manual_annotations:
             del self.model.manual_annotations[path]
             
         # 3. Remove from UI (Model)
-        self.main.tree_model.removeRow(index.row(), index.parent())
+        self.main.tree_model.remove_path(path)
         
         self.model.is_data_dirty = True
         self.main.show_temp_msg("Removed", "Item removed.")
@@ -129,34 +126,43 @@ class NavigationManager:
         
         # [CHANGED] Use MediaController for robust loading logic
         # This replaces the manual stop/load/timer sequence.
+        # It also leaves the multi-view grid if an action's views were shown.
         self.media_controller.load_and_play(path)
-        
-        # [UI FIX] Ensure we are in Single View mode (in case we were in Multi-View)
-        center_panel = self.main.center_panel
-        if hasattr(center_panel, 'view_layout'):
-             center_panel.view_layout.setCurrentWidget(center_panel.single_view_widget)
+
+    def on_action_selected(self, current):
+        """
+        [NEW] A multi-view action (row with views) was selected:
+        show its annotation and play all of its views in the grid.
+        """
+        if not current.isValid(): return
+        path = current.data(ProjectTreeModel.FilePathRole)
+        self.main.annot_manager.display_manual_annotation(path)
+        self.main.classification_panel.manual_box.setEnabled(True)
+        self.show_all_views(current)
 
     def play_video(self):
         """Toggle Play/Pause"""
         # [CHANGED] Use MediaController
         self.media_controller.toggle_play_pause()
 
-    def show_all_views(self):
+    def show_all_views(self, curr_idx=None):
         # [MV] Handle Multi-View
-        tree_view = self.main.left_panel.tree
-        curr_idx = tree_view.currentIndex()
+        if curr_idx is None:
+            curr_idx = self.main.left_panel.tree.currentIndex()
         if not curr_idx.isValid(): return
         
         # Check if item has children rows
-        model = self.main.tree_model
-        if model.rowCount(curr_idx) == 0: return
+        model = self.main.tree_proxy
+        if not model.hasChildren(curr_idx): return
+        model.fetchMore(curr_idx)
         
         paths = []
         for i in range(model.rowCount(curr_idx)):
             child_idx = model.index(i, 0, curr_idx)
             paths.append(child_idx.data(ProjectTreeModel.FilePathRole))
             
-        self.main.center_panel.media_preview.show_all_views([p for p in paths if p.lower().endswith(SUPPORTED_EXTENSIONS[:3])])
+        # [CHANGED] Views are played by pooled players owned by the MediaController
+        self.media_controller.show_views([p for p in paths if p.lower().endswith(SUPPORTED_EXTENSIONS[:3])])
 
     def apply_action_filter(self, index=None):
         """
@@ -166,47 +172,23 @@ class NavigationManager:
         2: Smart Labelled (Has confirmed smart annotation)
         3: No Labelled (Neither hand nor smart confirmed)
         """
-        tree = self.main.left_panel.tree
         combo = self.main.left_panel.filter_combo
         
         # Use the passed index from the signal, or the current combo box index
         filter_idx = combo.currentIndex() if index is None else index
         if filter_idx < 0: return
         
-        model = self.main.tree_model
-        
-        for row in range(model.rowCount()):
-            idx = model.index(row, 0)
-            item = model.itemFromIndex(idx)
-            if not item: continue
-                
-            path = item.data(ProjectTreeModel.FilePathRole)
-            
-            # 1. Is it Hand Labelled? (Exists in manual_annotations)
-            is_hand_labelled = path in self.model.manual_annotations and bool(self.model.manual_annotations[path])
-            
-            # 2. Is it Smart Labelled? (Has _confirmed flag in smart_annotations)
-            smart_data = self.model.smart_annotations.get(path, {})
-            # [MODIFIED] Removed the mutually exclusive condition "and not is_hand_labelled".
-            # Now an item can be treated as both Hand Labelled and Smart Labelled simultaneously.
-            is_smart_labelled = smart_data.get("_confirmed", False)
-            
-            # 3. No Labelled (Neither hand nor smart confirmed)
-            is_no_labelled = not is_hand_labelled and not is_smart_labelled
-            
-            # 4. Apply hiding logic based on the selected filter index
-            hidden = False
-            if filter_idx == 1 and not is_hand_labelled:
-                # Hide if "Hand Labelled" is selected but the item lacks hand labels
-                hidden = True
-            elif filter_idx == 2 and not is_smart_labelled:
-                # Hide if "Smart Labelled" is selected but the item lacks smart labels
-                hidden = True
-            elif filter_idx == 3 and not is_no_labelled:
-                # Hide if "No Labelled" is selected but the item has ANY label
-                hidden = True
-                
-            tree.setRowHidden(row, QModelIndex(), hidden)
+        # [NEW] The proxy filters on the cached ClipStatus (HAND = manual_annotations,
+        # SMART = confirmed smart annotation). An item can be both at the same time.
+        proxy = self.main.tree_proxy
+        if filter_idx == 1:
+            proxy.set_status_filter(require=ClipStatus.HAND)
+        elif filter_idx == 2:
+            proxy.set_status_filter(require=ClipStatus.SMART)
+        elif filter_idx == 3:
+            proxy.set_status_filter(exclude=ClipStatus.HAND | ClipStatus.SMART)
+        else:
+            proxy.set_status_filter()
 
     def nav_prev_action(self): self._nav_tree(step=-1, level='top')
     def nav_next_action(self): self._nav_tree(step=1, level='top')
@@ -218,7 +200,8 @@ class NavigationManager:
         curr = tree.currentIndex()
         if not curr.isValid(): return
         
-        model = self.main.tree_model
+        # The view's model is the filter proxy, so every row here is visible
+        model = self.main.tree_proxy
         
         if level == 'top':
             # Navigate Top Level Items (Siblings)
@@ -228,22 +211,17 @@ class NavigationManager:
                 
             new_row = curr.row() + step
             
-            # Simple bounds check, logic can be improved to skip hidden items
             if 0 <= new_row < model.rowCount(QModelIndex()):
-                # Check visibility (filter)
-                while 0 <= new_row < model.rowCount(QModelIndex()):
-                    if not tree.isRowHidden(new_row, QModelIndex()):
-                        new_idx = model.index(new_row, 0, QModelIndex())
-                        tree.setCurrentIndex(new_idx)
-                        tree.scrollTo(new_idx)
-                        break
-                    new_row += step
+                new_idx = model.index(new_row, 0, QModelIndex())
+                tree.setCurrentIndex(new_idx)
+                tree.scrollTo(new_idx)
         else:
             # Navigate Children
             parent = curr.parent()
             if not parent.isValid():
                 # Currently on top, go to child 0 if step 1
-                if step == 1 and model.rowCount(curr) > 0:
+                if step == 1 and model.hasChildren(curr):
+                    model.fetchMore(curr)
                     nxt = model.index(0, 0, curr)
                     tree.setCurrentIndex(nxt); tree.scrollTo(nxt)
             else:
@@ -1,92 +1,35 @@
 import os
 import sys
 import json
-import glob
 import ssl
 import copy
-import uuid
-import re
+import time
+import threading
 import yaml
-from models import CmdType
+from models import CmdType, action_base_id
 from PyQt6.QtCore import QThread, pyqtSignal, QObject
 from PyQt6.QtWidgets import QMessageBox
-from utils import natural_sort_key
 
 os.environ["WANDB_MODE"] = "disabled"
 ssl._create_default_https_context = ssl._create_unverified_context
 
-from opensportslib import model
+from .inference_server import InferenceServer
 
-
-def _run_opensportslib_inference(base_config_path: str, temp_data: dict, prefix: str):
-    """
-    [REFACTORED] A shared helper function to handle the repetitive setup, 
-    execution, and cleanup of the opensportslib inference process.
-    Used by both Single Inference and Batch Inference workers.
-    """
-    writable_dir = os.path.join(os.path.expanduser("~"), ".soccernet_workspace")
-    os.makedirs(writable_dir, exist_ok=True)
-    
-    writable_dir_fwd = writable_dir.replace('\\', '/')
-    logs_dir_fwd = os.path.join(writable_dir, "logs").replace('\\', '/')
-
-    unique_id = uuid.uuid4().hex[:8]
-    temp_json_path = os.path.join(writable_dir, f"temp_{prefix}_{unique_id}.json")
-    temp_config_path = os.path.join(writable_dir, f"temp_config_{prefix}_{unique_id}.yaml")
-
-    try:
-        # 1. Write the temporary JSON data
-        with open(temp_json_path, 'w', encoding='utf-8') as f:
-            json.dump(temp_data, f, indent=4)
-
-        # 2. Read and modify the YAML config dynamically
-        with open(base_config_path, 'r', encoding='utf-8') as f:
-            config_text = f.read()
-        
-        config_text = config_text.replace('./temp_workspace', writable_dir_fwd)
-        config_text = config_text.replace('./logs', logs_dir_fwd)
-
-        with open(temp_config_path, 'w', encoding='utf-8') as f:
-            f.write(config_text)
-
-        # 3. Initialize model and run inference
-        myModel = model.classification(config=temp_config_path)
-        metrics = myModel.infer(
-            test_set=temp_json_path,
-            pretrained="jeetv/snpro-classification-mvit"
-        )
-
-        # 4. Search for the generated prediction output
-        checkpoint_dir = os.path.join(writable_dir, "checkpoints")
-        search_pattern = os.path.join(checkpoint_dir, "**", "predictions_test_epoch_*.json")
-        pred_files = glob.glob(search_pattern, recursive=True)
-
-        if not pred_files:
-            raise FileNotFoundError("Could not find the generated prediction JSON file.")
-
-        latest_pred_file = max(pred_files, key=os.path.getctime)
-        with open(latest_pred_file, 'r', encoding='utf-8') as pf:
-            pred_data = json.load(pf)
-
-        return metrics if metrics else {}, pred_data
-
-    finally:
-        # 5. Guaranteed cleanup of temporary payload files
-        if os.path.exists(temp_json_path):
-            try: os.remove(temp_json_path)
-            except: pass
-        if os.path.exists(temp_config_path):
-            try: os.remove(temp_config_path)
-            except: pass
+# Default clips per batch inference request (the batch panel can change it)
+BATCH_CHUNK_CLIPS = 8
+# On exit, how long to wait for an inference thread once the server is terminated
+WORKER_STOP_TIMEOUT_MS = 3000
 
 
 class InferenceWorker(QThread):
     finished_signal = pyqtSignal(str, str, dict)
     error_signal = pyqtSignal(str)
 
-    def __init__(self, config_path, base_dir, action_id, json_path, video_path, label_map):
+    def __init__(self, config_path, base_dir, action_id, json_path, video_path, label_map, server):
         super().__init__()
         self.config_path = config_path
+        # [NEW] Resident model process (InferenceServer)
+        self.server = server
         self.base_dir = base_dir
         self.action_id = str(action_id)
         self.json_path = json_path
@@ -160,8 +103,8 @@ class InferenceWorker(QThread):
                 "data": [target_item]
             }
             
-            # Use the shared helper function to run inference
-            metrics, pred_data = _run_opensportslib_inference(self.config_path, temp_data, "infer")
+            # [CHANGED] Run on the resident model of the inference server
+            metrics, pred_data = self.server.infer(temp_data, "infer")
 
             predicted_label_idx = None
             confidence = 0.0
@@ -175,7 +118,7 @@ class InferenceWorker(QThread):
                     predicted_label_idx = str(raw_action_data["label"]).strip()
                     confidence = float(raw_action_data.get("confidence", 0.0))
             else:
-                clean_action_id = re.sub(r'_view\d+', '', self.action_id)
+                clean_action_id = action_base_id(self.action_id)
                 for item in pred_items:
                     out_id = str(item.get("id"))
                     if out_id == self.action_id or out_id == clean_action_id:
@@ -218,19 +161,34 @@ class InferenceWorker(QThread):
 
 
 class BatchInferenceWorker(QThread):
-    finished_signal = pyqtSignal(dict, list) 
+    """
+    [CHANGED] Runs the batch in chunks of chunk_size clips (one inference
+    request each) and streams each chunk's results (chunk_signal) and the
+    throughput / ETA (progress_signal) to the UI. cancel() stops the run
+    between chunks; finished_signal then reports the run as cancelled, and the
+    chunks already emitted are kept.
+    """
+    chunk_signal = pyqtSignal(list)
+    progress_signal = pyqtSignal(int, int, float, float)   # done, total, clips/s, ETA (s)
+    finished_signal = pyqtSignal(dict, bool)               # last metrics, cancelled
     error_signal = pyqtSignal(str)
 
-    def __init__(self, config_path, base_dir, json_path, target_clips, label_map):
+    def __init__(self, config_path, base_dir, json_path, target_clips, label_map, server, chunk_size=BATCH_CHUNK_CLIPS):
         super().__init__()
         self.config_path = config_path
         self.base_dir = base_dir
         self.json_path = json_path
         self.target_clips = target_clips 
+        self.server = server
+        self.chunk_size = max(1, int(chunk_size))
+        self._cancelled = threading.Event()
         
         # [DYNAMIC] Load map from external source
         self.label_map = label_map
 
+    def cancel(self):
+        self._cancelled.set()
+
     def _map_label(self, raw_label):
         valid_class_names = list(self.label_map.values())
         if raw_label in valid_class_names: return raw_label
@@ -240,77 +198,95 @@ class BatchInferenceWorker(QThread):
             if clean_idx in self.label_map: return self.label_map[clean_idx]
         return "Unknown"
 
-    def run(self):
-        try:
-            data_items = []
-            default_label = list(self.label_map.values())[0] if self.label_map else "Unknown"
-
-            for clip in self.target_clips:
-                inputs = []
-                for path in clip['paths']:
-                    video_abs_path = path
-                    if not os.path.isabs(video_abs_path):
-                        if self.json_path and os.path.exists(self.json_path):
-                            video_abs_path = os.path.join(os.path.dirname(self.json_path), video_abs_path)
-                        else:
-                            video_abs_path = os.path.abspath(video_abs_path)
-                    video_abs_path = os.path.normpath(video_abs_path).replace('\\', '/')
-                    inputs.append({"type": "video", "path": video_abs_path})
-
-                # Fallback to default label instead of hardcoded strings
-                safe_gt = clip['gt'] if clip['gt'] else default_label
-                
-                item = {
-                    "id": clip['id'],
-                    "inputs": inputs,
-                    "labels": {"action": {"label": safe_gt, "confidence": 1.0}}
-                }
-                data_items.append(item)
-
-            global_labels = {
-                "action": {
-                    "type": "single_label",
-                    "labels": list(self.label_map.values())
-                }
+    def _build_dataset(self, clips):
+        data_items = []
+        default_label = list(self.label_map.values())[0] if self.label_map else "Unknown"
+
+        for clip in clips:
+            inputs = []
+            for path in clip['paths']:
+                video_abs_path = path
+                if not os.path.isabs(video_abs_path):
+                    if self.json_path and os.path.exists(self.json_path):
+                        video_abs_path = os.path.join(os.path.dirname(self.json_path), video_abs_path)
+                    else:
+                        video_abs_path = os.path.abspath(video_abs_path)
+                video_abs_path = os.path.normpath(video_abs_path).replace('\\', '/')
+                inputs.append({"type": "video", "path": video_abs_path})
+
+            # Fallback to default label instead of hardcoded strings
+            safe_gt = clip['gt'] if clip['gt'] else default_label
+            
+            item = {
+                "id": clip['id'],
+                "inputs": inputs,
+                "labels": {"action": {"label": safe_gt, "confidence": 1.0}}
             }
+            data_items.append(item)
 
-            temp_data = {
-                "version": "2.0",
-                "task": "classification",
-                "labels": global_labels,
-                "data": data_items
+        global_labels = {
+            "action": {
+                "type": "single_label",
+                "labels": list(self.label_map.values())
             }
+        }
+
+        return {
+            "version": "2.0",
+            "task": "classification",
+            "labels": global_labels,
+            "data": data_items
+        }
+
+    def _collect_results(self, clips, pred_data):
+        pred_items = pred_data.get("data", [])
+        out_dict = {}
+        for item in pred_items:
+            out_id = str(item.get("id"))
+            raw_action = item.get("labels", {}).get("action", {})
+            raw_label = str(raw_action.get("label", "")).strip()
+            conf = float(raw_action.get("confidence", 0.0))
+            out_dict[out_id] = (self._map_label(raw_label), conf)
+
+        results = []
+        for clip in clips:
+            aid = clip['id']
+            clean_id = os.path.splitext(aid)[0]
             
-            # Use the shared helper function to run inference
-            metrics, pred_data = _run_opensportslib_inference(self.config_path, temp_data, "batch_infer")
+            pred_label, conf = out_dict.get(aid, (None, 0.0))
+            if pred_label is None:
+                pred_label, conf = out_dict.get(clean_id, ("Unknown", 0.0))
+
+            results.append({
+                'id': aid,
+                'gt': clip['gt'],
+                'pred': pred_label,
+                'conf': conf,
+                'original_items': clip['original_items']
+            })
+        return results
 
-            pred_items = pred_data.get("data", [])
-            out_dict = {}
-            for item in pred_items:
-                out_id = str(item.get("id"))
-                raw_action = item.get("labels", {}).get("action", {})
-                raw_label = str(raw_action.get("label", "")).strip()
-                conf = float(raw_action.get("confidence", 0.0))
-                out_dict[out_id] = (self._map_label(raw_label), conf)
-
-            results = []
-            for clip in self.target_clips:
-                aid = clip['id']
-                clean_id = os.path.splitext(aid)[0]
-                
-                pred_label, conf = out_dict.get(aid, (None, 0.0))
-                if pred_label is None:
-                    pred_label, conf = out_dict.get(clean_id, ("Unknown", 0.0))
+    def run(self):
+        try:
+            total = len(self.target_clips)
+            metrics = {}
+            done = 0
+            started = time.monotonic()
+            self.progress_signal.emit(0, total, 0.0, 0.0)
+
+            for first in range(0, total, self.chunk_size):
+                if self._cancelled.is_set():
+                    break
+                clips = self.target_clips[first:first + self.chunk_size]
+                # Run on the resident model of the inference server
+                metrics, pred_data = self.server.infer(self._build_dataset(clips), "batch_infer")
+                self.chunk_signal.emit(self._collect_results(clips, pred_data))
 
-                results.append({
-                    'id': aid,
-                    'gt': clip['gt'],
-                    'pred': pred_label,
-                    'conf': conf,
-                    'original_items': clip['original_items']
-                })
+                done += len(clips)
+                rate = done / max(1e-6, time.monotonic() - started)
+                self.progress_signal.emit(done, total, rate, (total - done) / rate)
 
-            self.finished_signal.emit(metrics, results)
+            self.finished_signal.emit(metrics, done < total)
 
         except Exception as e:
             self.error_signal.emit(str(e))
@@ -329,10 +305,40 @@ class InferenceManager(QObject):
         self.config_path = os.path.join(self.base_dir, "config.yaml")
         self.worker = None
         self.batch_worker = None
+        # [NEW] Started on the first inference, stopped after an idle timeout
+        self.server = InferenceServer(self.config_path)
         
         self.main.classification_panel.batch_run_requested.connect(self.start_batch_inference)
+        self.main.classification_panel.batch_cancel_requested.connect(self.cancel_batch_inference)
+        self.main.classification_panel.spin_chunk.setValue(BATCH_CHUNK_CLIPS)
+        # [NEW] Clips the running batch has applied (each chunk is its own Undo entry)
+        self._batch_applied = set()
         self.main.classification_panel.batch_confirm_requested.connect(self.confirm_batch_inference)
 
+    def shutdown_server(self):
+        """
+        Stop the inference server process (on exit) without waiting on a request
+        in progress: the batch is cancelled, the process terminated, and the
+        worker threads, whose request then fails, are waited for.
+        """
+        if self.batch_worker is not None:
+            self.batch_worker.cancel()
+        self.server.shutdown()
+        for worker in (self.worker, self.batch_worker):
+            if worker is not None:
+                worker.wait(WORKER_STOP_TIMEOUT_MS)
+        # Clean up what a worker left (a no-op if it already did)
+        self.server.shutdown()
+
+    def _report_server_memory(self):
+        if self.server.memory_mb is not None:
+            idle_min = self.server.idle_timeout_s / 60
+            self.main.show_temp_msg(
+                "Inference Server",
+                f"{self.server.memory_mb:.0f} MB resident, stops after {idle_min:.0f} min idle.",
+                duration=4000
+            )
+
     def _get_label_map_from_config(self) -> dict:
         """
         [DYNAMIC PARSING] Reads the config.yaml on-the-fly to extract the classes list.
@@ -361,6 +367,10 @@ class InferenceManager(QObject):
         return label_map
 
     def start_inference(self):
+        # [FIX] One inference at a time: a single run would take over the batch's progress and buttons
+        if self.batch_worker is not None:
+            self.main.show_temp_msg("Inference", "Batch inference is running; cancel it or wait for it to finish.", 3000)
+            return
         if not os.path.exists(self.config_path):
             QMessageBox.critical(self.main, "Error", f"config.yaml not found at:\n{self.config_path}")
             return
@@ -379,7 +389,7 @@ class InferenceManager(QObject):
         label_map = self._get_label_map_from_config()
 
         # 2. Pass labels to worker
-        self.worker = InferenceWorker(self.config_path, self.base_dir, action_id, current_json_path, current_video_path, label_map)
+        self.worker = InferenceWorker(self.config_path, self.base_dir, action_id, current_json_path, current_video_path, label_map, self.server)
         self.worker.finished_signal.connect(self._on_inference_success)
         self.worker.error_signal.connect(self._on_inference_error)
         self.worker.start()
@@ -421,6 +431,7 @@ class InferenceManager(QObject):
         
         self.main.model.is_data_dirty = True
         self.main.classification_panel.display_inference_result(target_head, label, conf_dict)
+        self._report_server_memory()
         self.worker = None
 
     def _on_inference_error(self, error_msg):
@@ -428,21 +439,15 @@ class InferenceManager(QObject):
         QMessageBox.critical(self.main, "Inference Error", f"An error occurred during inference:\n\n{error_msg}")
         self.worker = None
 
-    def start_batch_inference(self, start_idx: int, end_idx: int):
+    def start_batch_inference(self, start_idx: int, end_idx: int, chunk_size: int = BATCH_CHUNK_CLIPS):
+        if self.batch_worker is not None:
+            return
         if not os.path.exists(self.config_path):
             QMessageBox.critical(self.main, "Error", f"config.yaml not found at:\n{self.config_path}")
             return
 
-        sorted_items = sorted(self.main.model.action_item_data, key=lambda x: natural_sort_key(x.get('name', '')))
-        
-        action_groups = {}
-        for item in sorted_items:
-            base_id = re.sub(r'_view\d+', '', item['name'])
-            if base_id not in action_groups:
-                action_groups[base_id] = []
-            action_groups[base_id].append(item)
-            
-        sorted_base_ids = list(action_groups.keys())
+        # [CHANGED] Base-id -> views index is maintained by the model
+        sorted_base_ids = self.main.model.action_base_ids()
         max_idx = len(sorted_base_ids) - 1
         
         if start_idx < 0 or end_idx > max_idx or start_idx > end_idx:
@@ -453,7 +458,7 @@ class InferenceManager(QObject):
         
         target_clips = []
         for base_id in target_base_ids:
-            items = action_groups[base_id]
+            items = self.main.model.action_views(base_id)
             paths = [it['path'] for it in items]
             
             # Extract current ground truth
@@ -466,18 +471,27 @@ class InferenceManager(QObject):
                     
             target_clips.append({'id': base_id, 'paths': paths, 'gt': gt_label, 'original_items': items})
 
-        self.main.classification_panel.show_inference_loading(True)
+        self.main.classification_panel.start_batch_progress(len(target_clips))
+        self._batch_applied = set()
         
         # 1. Dynamically load labels from config
         label_map = self._get_label_map_from_config()
 
         # 2. Pass labels to batch worker
-        self.batch_worker = BatchInferenceWorker(self.config_path, self.base_dir, self.main.model.current_json_path, target_clips, label_map)
+        self.batch_worker = BatchInferenceWorker(self.config_path, self.base_dir, self.main.model.current_json_path, target_clips, label_map, self.server, chunk_size)
+        self.batch_worker.chunk_signal.connect(self._on_batch_chunk)
+        self.batch_worker.progress_signal.connect(self.main.classification_panel.show_batch_progress)
         self.batch_worker.finished_signal.connect(self._on_batch_inference_success)
         self.batch_worker.error_signal.connect(self._on_batch_inference_error)
         self.batch_worker.start()
 
-    def _on_batch_inference_success(self, metrics: dict, results_list: list):
+    def cancel_batch_inference(self):
+        """[NEW] Stop the batch after the chunk in progress; finished chunks are kept."""
+        if self.batch_worker is not None:
+            self.batch_worker.cancel()
+
+    def _on_batch_chunk(self, results_list: list):
+        """[NEW] Apply and show the predictions of one finished chunk."""
         # Auto-create the schema (Category) if it's a completely blank/new project
         target_head = "action"
         if target_head not in self.main.model.label_definitions:
@@ -489,13 +503,10 @@ class InferenceManager(QObject):
                 }
                 self.main.setup_dynamic_ui()
 
-        # Start building the output text without the accuracy metrics
-        text = "BATCH INFERENCE PREDICTIONS:\n\n"
+        text = ""
         batch_predictions = {}
-        
-        old_batch_data = {} 
-        new_batch_data = {} 
-        import copy
+        old_batch_data = {}
+        new_batch_data = {}
         
         for r in results_list:
             text += f"Video ID: {r['id']}\nPredicted Class: {r['pred']} (Confidence: {r['conf']*100:.1f}%)\n\n"
@@ -517,32 +528,49 @@ class InferenceManager(QObject):
                 
                 # Record old data for Undo
                 if path not in old_batch_data:
-                    old_batch_data[path] = self.main.model.smart_annotations.get(path, {})
+                    old_batch_data[path] = copy.deepcopy(self.main.model.smart_annotations.get(path, {}))
                 
                 # Prepare new data for Redo
-                new_batch_data[path] = {
+                new_data = {
                     target_head: {"label": r['pred'], "conf_dict": conf_dict}
                 }
-                
-        # [NEW FIX 1] Push Batch to Undo History using CORRECT keys 'old_data' and 'new_data'
-        self.main.model.push_undo(
-            CmdType.BATCH_SMART_ANNOTATION_RUN,
-            old_data=copy.deepcopy(old_batch_data),
-            new_data=copy.deepcopy(new_batch_data)
-        )
-        
-        # Apply new data to model
-        for path, data in new_batch_data.items():
-            self.main.model.smart_annotations[path] = data
-            
+                new_batch_data[path] = copy.deepcopy(new_data)
+                # Applied right away, so a cancelled or failed run keeps it
+                self.main.model.smart_annotations[path] = new_data
+                self.main.update_action_item_status(path)
+
+        # [FIX] One Undo entry per applied chunk, pushed as it is applied: the UI stays
+        # editable during the run, so the history must follow the order of the changes
+        if new_batch_data:
+            self.main.model.push_undo(CmdType.BATCH_SMART_ANNOTATION_RUN, old_data=old_batch_data, new_data=new_batch_data)
+            self._batch_applied.update(new_batch_data)
         self.main.model.is_data_dirty = True
-        self.main.classification_panel.display_batch_inference_result(text, batch_predictions)
+        self.main.classification_panel.append_batch_inference_result(text, batch_predictions)
+
+    def _finish_batch(self):
+        """[NEW] End the run; returns the number of clips it applied (kept when cancelled or failed)."""
+        applied = len(self._batch_applied)
+        self._batch_applied = set()
         self.batch_worker = None
+        self.main.update_save_export_button_state()
+        return applied
+
+    def _on_batch_inference_success(self, metrics: dict, cancelled: bool):
+        panel = self.main.classification_panel
+        header = "BATCH INFERENCE PREDICTIONS:\n\n"
+        text = header + panel.batch_result_text.toPlainText().strip() + "\n"
+        if cancelled:
+            text += f"\nCancelled: predictions kept for {len(panel.pending_batch_results)} video(s)."
+        panel.display_batch_inference_result(text, dict(panel.pending_batch_results))
+        self._finish_batch()
+        self._report_server_memory()
 
     def _on_batch_inference_error(self, error_msg):
         self.main.classification_panel.show_inference_loading(False)
+        applied = self._finish_batch()
+        if applied:
+            error_msg += f"\n\nPredictions already made for {applied} video(s) were kept."
         QMessageBox.critical(self.main, "Batch Inference Error", f"An error occurred during batch inference:\n\n{error_msg}")
-        self.batch_worker = None
 
     def confirm_batch_inference(self, results: dict):
         """
@@ -0,0 +1,332 @@
+import os
+import sys
+import ssl
+import copy
+import json
+import glob
+import time
+import uuid
+import queue
+import shutil
+import threading
+import multiprocessing
+
+import yaml
+
+WRITABLE_DIR = os.path.join(os.path.expanduser("~"), ".soccernet_workspace")
+PRETRAINED = "jeetv/snpro-classification-mvit"
+IDLE_TIMEOUT_S = 600       # the server process stops after 10 minutes without requests
+POLL_S = 0.5               # liveness check while waiting for a reply / for a request
+STOP_TIMEOUT_S = 5         # grace period of a stop request before the process is terminated
+
+
+def _memory_mb():
+    """Resident memory of the current process in MB (None when it cannot be read)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current size: bytes on macOS, KB elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def _load_config(base_config_path: str, run_dir: str) -> dict:
+    """
+    config.yaml as a dict, with its workspace and log folders moved to
+    WRITABLE_DIR and its checkpoint / prediction output to run_dir.
+    """
+    writable_dir_fwd = WRITABLE_DIR.replace('\\', '/')
+    logs_dir_fwd = os.path.join(WRITABLE_DIR, "logs").replace('\\', '/')
+    with open(base_config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+
+    def patch(value):
+        if isinstance(value, dict):
+            return {k: patch(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [patch(v) for v in value]
+        if isinstance(value, str):
+            return value.replace('./temp_workspace', writable_dir_fwd).replace('./logs', logs_dir_fwd)
+        return value
+
+    config = patch(config)
+    checkpoints = os.path.join(run_dir, "checkpoints").replace('\\', '/')
+    for section in ("SYSTEM", "TRAIN"):
+        if isinstance(config.get(section), dict):
+            config[section]["save_dir"] = checkpoints
+    return config
+
+
+class ResidentModel:
+    """
+    opensportslib classification model built once and reused for every request
+    (runs inside the server process).
+
+    The pretrained weights are passed to the first infer() only; later calls
+    run on the weights already loaded. If such a call fails, the weights are
+    passed again on every call from then on.
+
+    The config and the dataset are handed to the library as Python objects,
+    and the predictions are taken from infer()'s return value. Files are only
+    used where the library rejects the objects (temp YAML / JSON in run_dir)
+    or returns no predictions (the prediction file is read from run_dir, the
+    server's own output folder, and removed after reading).
+    """
+
+    def __init__(self, base_config_path: str):
+        from opensportslib import model
+        self.run_dir = os.path.join(WRITABLE_DIR, "inference", f"server_{uuid.uuid4().hex[:8]}")
+        os.makedirs(self.run_dir, exist_ok=True)
+        config = _load_config(base_config_path, self.run_dir)
+        try:
+            self.model = model.classification(config=copy.deepcopy(config))
+        except Exception as e:
+            print(f"[InferenceServer] Config not accepted as a dict ({e}); writing a temp YAML.")
+            config_path = os.path.join(self.run_dir, "config.yaml")
+            with open(config_path, 'w', encoding='utf-8') as f:
+                yaml.dump(config, f)
+            self.model = model.classification(config=config_path)
+        self.in_memory_data = True
+        self.weights_loaded = False
+        self.reload_weights = False
+
+    def infer(self, temp_data: dict, prefix: str):
+        started = time.time()
+        if self.in_memory_data:
+            try:
+                result = self._infer(copy.deepcopy(temp_data))
+            except (TypeError, AttributeError, ValueError) as e:
+                # Only switch to files for good if the file-based call works
+                result = self._infer_from_file(temp_data, prefix)
+                print(f"[InferenceServer] Dataset not accepted as a dict ({e}); using temp JSON files.")
+                self.in_memory_data = False
+        else:
+            result = self._infer_from_file(temp_data, prefix)
+
+        if isinstance(result, dict) and isinstance(result.get("data"), list):
+            return {}, result
+        return result if result else {}, self._read_predictions(started)
+
+    def _infer_from_file(self, temp_data, prefix):
+        temp_json_path = os.path.join(self.run_dir, f"temp_{prefix}_{uuid.uuid4().hex[:8]}.json")
+        try:
+            with open(temp_json_path, 'w', encoding='utf-8') as f:
+                json.dump(temp_data, f, indent=4)
+            return self._infer(temp_json_path)
+        finally:
+            if os.path.exists(temp_json_path):
+                try: os.remove(temp_json_path)
+                except OSError: pass
+
+    def _infer(self, test_set):
+        failed = None
+        if self.weights_loaded and not self.reload_weights:
+            try:
+                return self.model.infer(test_set=test_set)
+            except Exception as e:
+                failed = e
+        metrics = self.model.infer(test_set=test_set, pretrained=PRETRAINED)
+        if failed is not None:
+            print(f"[InferenceServer] Inference on the loaded weights failed ({failed}); reloading them per request.")
+            self.reload_weights = True
+        self.weights_loaded = True
+        return metrics
+
+    def _read_predictions(self, since):
+        """Prediction file written by this request (the newest in run_dir, not older than `since`)."""
+        pattern = os.path.join(self.run_dir, "**", "predictions_test_epoch_*.json")
+        pred_files = [p for p in glob.glob(pattern, recursive=True) if os.path.getmtime(p) >= since - 1]
+        if not pred_files:
+            raise FileNotFoundError("Could not find the generated prediction JSON file.")
+        latest_pred_file = max(pred_files, key=os.path.getmtime)
+        with open(latest_pred_file, 'r', encoding='utf-8') as pf:
+            pred_data = json.load(pf)
+        # Keep run_dir small: the next request finds only its own file
+        for path in pred_files:
+            try: os.remove(path)
+            except OSError: pass
+        return pred_data
+
+    def close(self):
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+
+def _serve(base_config_path, requests, replies):
+    """
+    Main loop of the server process: one (request id, data, prefix) tuple per
+    request, one reply dict per request. None stops the loop; so does the
+    parent process going away.
+    """
+    os.environ["WANDB_MODE"] = "disabled"
+    ssl._create_default_https_context = ssl._create_unverified_context
+    # [FIX] Watches the parent's sentinel (closed when it exits, on every platform);
+    # os.getppid() never changes on Windows
+    parent = multiprocessing.parent_process()
+    resident = None
+    try:
+        while True:
+            try:
+                request = requests.get(timeout=POLL_S)
+            except queue.Empty:
+                if parent is not None and not parent.is_alive():
+                    break
+                continue
+            if request is None:
+                break
+            request_id, temp_data, prefix = request
+            reply = {"id": request_id, "error": None, "metrics": None, "predictions": None}
+            try:
+                if resident is None:
+                    resident = ResidentModel(base_config_path)
+                reply["metrics"], reply["predictions"] = resident.infer(temp_data, prefix)
+            except Exception as e:
+                reply["error"] = str(e) or type(e).__name__
+            reply["memory_mb"] = _memory_mb()
+            replies.put(reply)
+    finally:
+        if resident is not None:
+            resident.close()
+
+
+class InferenceServer:
+    """
+    [NEW] Long-lived classification inference process.
+
+    The process is started on the first request and keeps the model (and the
+    imported libraries) resident, so only the first request pays for model
+    setup. Requests go over a multiprocessing queue; infer() blocks the
+    calling thread (an inference QThread) until the reply arrives, and only
+    one request runs at a time. The process stops after idle_timeout_s
+    without requests and is started again by the next one.
+
+    memory_mb is the server's resident memory, as reported with its last reply.
+    """
+
+    def __init__(self, base_config_path: str, idle_timeout_s: float = IDLE_TIMEOUT_S):
+        self.base_config_path = base_config_path
+        self.idle_timeout_s = idle_timeout_s
+        self.memory_mb = None
+        self.requests_served = 0
+        self._process = None
+        self._requests = None
+        self._replies = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._idle_timer = None
+        self._last_used = 0.0
+
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def infer(self, temp_data: dict, prefix: str):
+        """(metrics, prediction data) for an opensportslib dataset dict."""
+        with self._lock:
+            self._start()
+            request_id = uuid.uuid4().hex
+            self._requests.put((request_id, temp_data, prefix))
+            try:
+                reply = self._wait_reply(request_id)
+            finally:
+                self._last_used = time.monotonic()
+                self._schedule_idle_stop()
+        self.requests_served += 1
+        self.memory_mb = reply.get("memory_mb")
+        if reply["error"]:
+            raise RuntimeError(reply["error"])
+        return reply["metrics"], reply["predictions"]
+
+    def shutdown(self):
+        """
+        Stop the server process (on exit); a later request starts it again.
+
+        [FIX] Never waits for a request in progress: the process is terminated
+        instead, and the blocked infer() fails in its own thread (and cleans
+        up) once it notices.
+        """
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self._lock.acquire(blocking=False):
+            try:
+                self._stop()
+            finally:
+                self._lock.release()
+            return
+        self._stopping.set()
+        process = self._process
+        if process is not None and process.is_alive():
+            process.terminate()
+
+    # ------------------------------------------------------------------
+    def _start(self):
+        if self.is_running():
+            return
+        self._stop()
+        self._stopping.clear()
+        # spawn: a forked copy of the GUI process (Qt threads) is not safe
+        ctx = multiprocessing.get_context("spawn")
+        self._requests = ctx.Queue()
+        self._replies = ctx.Queue()
+        self._process = ctx.Process(
+            target=_serve, args=(self.base_config_path, self._requests, self._replies),
+            name="InferenceServer", daemon=True
+        )
+        self._process.start()
+
+    def _wait_reply(self, request_id):
+        while True:
+            try:
+                reply = self._replies.get(timeout=POLL_S)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    code = self._process.exitcode
+                    self._stop()
+                    if self._stopping.is_set():
+                        raise RuntimeError("The inference server was shut down.")
+                    raise RuntimeError(f"The inference server stopped unexpectedly (exit code {code}).")
+                continue
+            # Replies to requests abandoned by an earlier error are skipped
+            if reply.get("id") == request_id:
+                return reply
+
+    def _stop(self):
+        process, self._process = self._process, None
+        if process is not None:
+            if process.is_alive():
+                try:
+                    self._requests.put(None)
+                except (OSError, ValueError):
+                    pass
+                process.join(STOP_TIMEOUT_S)
+            if process.is_alive():
+                process.terminate()
+                process.join(STOP_TIMEOUT_S)
+        for q in (self._requests, self._replies):
+            if q is not None:
+                q.close()
+                q.cancel_join_thread()
+        self._requests = self._replies = None
+        self.memory_mb = None
+
+    def _schedule_idle_stop(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        self._idle_timer = threading.Timer(self.idle_timeout_s, self._on_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _on_idle(self):
+        with self._lock:
+            if time.monotonic() - self._last_used >= self.idle_timeout_s - POLL_S:
+                self._stop()
@@ -3,7 +3,6 @@ import json
 import datetime
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 from PyQt6.QtCore import QUrl
-from utils import natural_sort_key
 
 class DenseFileManager:
     """
@@ -138,7 +137,8 @@ class DenseFileManager:
                 self.model.imported_action_metadata[aid] = item["metadata"]
 
             # Register Clip
-            self.model.action_item_data.append({"name": aid, "path": final_path, "source_files": [final_path]})
+            # [CHANGED] Keep the input's fps: saved again until the clip has been probed
+            self.model.action_item_data.append({"name": aid, "path": final_path, "source_files": [final_path], "fps": inputs[0].get("fps")})
             self.model.action_path_to_name[final_path] = aid
 
             # Load Events (dense_captions)
@@ -196,9 +196,7 @@ class DenseFileManager:
         
         base_dir = os.path.dirname(path)
         
-        sorted_items = sorted(
-            self.model.action_item_data, key=lambda d: natural_sort_key(d.get("name", ""))
-        )
+        sorted_items = self.model.sorted_action_items()
 
         for data in sorted_items:
             abs_path = data["path"]
@@ -222,9 +220,14 @@ class DenseFileManager:
                 })
 
             # Build Item Entry
+            video_input = {"type": "video", "path": rel_path}
+            # [FIX] Probed / loaded FPS; left out until the background probe reports (next save writes it)
+            fps = self.model.clip_fps(data)
+            if fps:
+                video_input["fps"] = fps
             entry = {
                 "id": aid,
-                "inputs": [{"type": "video", "path": rel_path, "fps": 25}], # FPS is hardcoded or needs retrieval
+                "inputs": [video_input],
                 "dense_captions": export_events
             }
             
@@ -238,7 +241,8 @@ class DenseFileManager:
         try:
             with open(path, "w", encoding="utf-8") as f:
                 json.dump(output, f, indent=4, ensure_ascii=False)
-            
+            self.model.save_history(path)
+
             self.model.current_json_path = path
             self.model.is_data_dirty = False
             self.main.statusBar().showMessage(f"Saved — {os.path.basename(path)}", 1500)
@@ -5,10 +5,12 @@ from PyQt6.QtCore import Qt, QTimer, QModelIndex
 from PyQt6.QtGui import QColor
 from PyQt6.QtMultimedia import QMediaPlayer
 
-from utils import natural_sort_key
-from models import CmdType 
+from models import CmdType, ClipStatus, EventTimeIndex
 from controllers.media_controller import MediaController
 
+# An event within this distance of the playhead is "the event at this time"
+EVENT_TOLERANCE_MS = 50
+
 class DenseManager:
     """
     Controller for Dense Description mode.
@@ -29,11 +31,10 @@ class DenseManager:
         
         self.current_video_path = None
         
-        # Timer to throttle text updates during playback/scrubbing
-        self.sync_timer = QTimer(self.main)
-        self.sync_timer.setSingleShot(True)
-        self.sync_timer.setInterval(100)
-        self.sync_timer.timeout.connect(self._sync_editor_to_timeline)
+        # [CHANGED] Editor text sync is throttled by the playback UI scheduler (see setup_connections)
+        self.sync_interval_ms = 100
+        # [NEW] Sorted position index of the current clip's events (rebuilt on refresh)
+        self.event_index = EventTimeIndex()
 
     def reset_ui(self):
         """Reset the dense description editor UI for a new project."""
@@ -47,11 +48,13 @@ class DenseManager:
         # --- Left Panel (Clip Tree) handled centrally in main_window.py ---
         
         # --- Center Panel (Playback & Timeline) ---
-        media = self.center_panel.media_preview
         timeline = self.center_panel.timeline
         pb = self.center_panel.playback
         
-        media.positionChanged.connect(self._on_media_position_changed)
+        # [CHANGED] Coalesced by the playback UI scheduler, and only while DENSE is shown
+        is_dense = self.main._is_dense_mode
+        self.main.playback_ui.subscribe(self._on_media_position_changed, when=is_dense)
+        self.main.playback_ui.subscribe(self._sync_editor_to_timeline, interval_ms=self.sync_interval_ms, when=is_dense)
         
         # --- Right Panel (Text Input & Table) ---
         input_w = self.right_panel.input_widget
@@ -66,14 +69,9 @@ class DenseManager:
         table.annotationModified.connect(self._on_annotation_modified)
 
     def _on_media_position_changed(self, ms):
-        """Update timeline and the time label in the input widget."""
-        self.center_panel.timeline.set_position(ms)
+        """Update the time label in the input widget (the timeline is updated by the main window)."""
         time_str = self._fmt_ms_full(ms)
         self.right_panel.input_widget.update_time(time_str)
-        
-        # Try to sync editor text if playback stops or during scrub
-        if not self.sync_timer.isActive():
-            self.sync_timer.start()
 
     def _on_clip_selected(self, current_idx, previous_idx):
         """Load video and refresh annotations when a tree item is clicked."""
@@ -120,15 +118,8 @@ class DenseManager:
         pos_ms = self.center_panel.media_preview.player.position()
         events = self.model.dense_description_events.get(self.current_video_path, [])
         
-        tolerance = 50 
-        existing_event = None
-        existing_index = -1
-        
-        for i, e in enumerate(events):
-            if abs(e['position_ms'] - pos_ms) <= tolerance:
-                existing_event = e
-                existing_index = i
-                break
+        # [CHANGED] Nearest event within the tolerance, by bisect
+        existing_index, existing_event = self.event_index.nearest(events, pos_ms, EVENT_TOLERANCE_MS)
         
         if existing_event:
             # --- MODIFY EXISTING EVENT ---
@@ -186,6 +177,8 @@ class DenseManager:
 
         # 2. Update Data
         events = self.model.dense_description_events.get(path, [])
+        if path == self.current_video_path:
+            self.event_index.rebuild(events)
         sorted_events = sorted(events, key=lambda x: x.get('position_ms', 0))
         
         self.right_panel.table.set_data(sorted_events)
@@ -201,31 +194,25 @@ class DenseManager:
         if path == self.current_video_path:
             self._sync_editor_to_timeline()
 
-    def _sync_editor_to_timeline(self):
+    def _sync_editor_to_timeline(self, current_ms=None):
         """
         Checks if there is an event at the current playback position.
         If yes, populates the editor with its text.
         """
         if not self.current_video_path: return
         
-        current_ms = self.center_panel.media_preview.player.position()
+        if current_ms is None:
+            current_ms = self.center_panel.media_preview.player.position()
         events = self.model.dense_description_events.get(self.current_video_path, [])
         
-        # Same tolerance as submission
-        tolerance = 50 
-        target_text = ""
-        found = False
-        
-        for e in events:
-            if abs(e['position_ms'] - current_ms) <= tolerance:
-                target_text = e['text']
-                found = True
-                break
+        # [CHANGED] Same tolerance as submission; O(log n) lookup of the nearest event
+        _, event = self.event_index.nearest(events, current_ms, EVENT_TOLERANCE_MS)
         
         # Update UI only if changed to avoid cursor jumping
         # Only update if we found an event. If we didn't find one, we keep the text 
         # (user might be typing a new one, or we just undid an Add).
-        if found:
+        if event is not None:
+            target_text = event['text']
             current_ui_text = self.right_panel.input_widget.text_editor.toPlainText()
             if current_ui_text != target_text:
                 self.right_panel.input_widget.set_text(target_text)
@@ -245,6 +232,8 @@ class DenseManager:
         
         events[index] = new_event
         self.model.is_data_dirty = True
+        # [FIX] The display (which rebuilds the index) is deferred: mark it stale now
+        self.event_index.invalidate()
         
         # Defer display refresh to fix QAbstractItemView error
         QTimer.singleShot(0, lambda: self._display_events_for_item(self.current_video_path))
@@ -268,23 +257,11 @@ class DenseManager:
     def populate_tree(self):
         """Rebuilds the left project tree for Dense Description mode."""
         self.left_panel.tree.blockSignals(True) 
-        self.tree_model.clear()
-        self.model.action_item_map.clear()
+        sorted_list = self.model.sorted_action_items()
         
-        sorted_list = sorted(self.model.action_item_data, key=lambda d: natural_sort_key(d.get('name', '')))
-        
-        first_idx = None
-        for i, data in enumerate(sorted_list):
-            name = data['name']
-            path = data['path']
-            item = self.tree_model.add_entry(name, path, data.get('source_files'))
-            self.model.action_item_map[path] = item
-            
-            events = self.model.dense_description_events.get(path, [])
-            item.setIcon(self.main.done_icon if events else self.main.empty_icon)
-            
-            if i == 0:
-                first_idx = item.index()
+        # [NEW] Virtual model: rows and icons are served straight from the entry dicts
+        self.tree_model.set_entries(sorted_list)
+        first_idx = self.main.tree_proxy.index(0, 0)
         
         self._apply_clip_filter(self.left_panel.filter_combo.currentIndex())
         
@@ -296,13 +273,11 @@ class DenseManager:
 
     def _apply_clip_filter(self, index):
         """Filter the tree based on 'Show Annotated' vs 'Not Annotated'."""
-        root = self.tree_model.invisibleRootItem()
-        for i in range(root.rowCount()):
-            item = root.child(i)
-            path = item.data(Qt.ItemDataRole.UserRole)
-            has_anno = len(self.model.dense_description_events.get(path, [])) > 0
-            hide = (index == 1 and not has_anno) or (index == 2 and has_anno)
-            self.left_panel.tree.setRowHidden(i, QModelIndex(), hide)
+        # [NEW] Evaluated by the proxy on the cached status (HAND = has dense events)
+        proxy = self.main.tree_proxy
+        if index == 1: proxy.set_status_filter(require=ClipStatus.HAND)
+        elif index == 2: proxy.set_status_filter(exclude=ClipStatus.HAND)
+        else: proxy.set_status_filter()
 
 
     def remove_single_item(self, index: QModelIndex):
@@ -334,21 +309,14 @@ class DenseManager:
 
         # 4. Remove from Data Model (AppState)
         # Remove from action_item_data list
-        self.model.action_item_data = [
-            item for item in self.model.action_item_data 
-            if item['path'] != path
-        ]
-        
-        # Remove from path mapping
-        if path in self.model.action_item_map:
-            del self.model.action_item_map[path]
-            
+        self.model.action_item_data.remove_path(path)
+        
         # Remove associated dense events
         if path in self.model.dense_description_events:
             del self.model.dense_description_events[path]
 
         # 5. Remove from Tree View Model
-        self.tree_model.removeRow(index.row())
+        self.tree_model.remove_path(path)
         
         # 6. Mark project as dirty
         self.model.is_data_dirty = True
@@ -382,12 +350,10 @@ class DenseManager:
 
     def _select_row_by_time(self, time_ms):
         """Selects the row in the table that matches the given timestamp."""
-        model = self.right_panel.table.model
-        for row in range(model.rowCount()):
-            item = model.get_annotation_at(row)
-            if item and abs(item.get('position_ms', 0) - time_ms) < 20:
-                self.right_panel.table.table.selectRow(row)
-                break
+        # [CHANGED] Indexed lookup instead of a row scan
+        row = self.right_panel.table.model.row_at_time(time_ms, 19)
+        if row >= 0:
+            self.right_panel.table.table.selectRow(row)
 
     def _on_add_video_clicked(self):
         """Handles adding videos to the current project."""
@@ -406,14 +372,14 @@ class DenseManager:
                 continue
             
             name = os.path.basename(file_path)
-            self.model.action_item_data.append({'name': name, 'path': file_path, 'source_files': [file_path]})
+            entry = {'name': name, 'path': file_path, 'source_files': [file_path]}
+            self.model.action_item_data.append(entry)
             self.model.action_path_to_name[file_path] = name
             
-            item = self.tree_model.add_entry(name=name, path=file_path, source_files=[file_path])
-            self.model.action_item_map[file_path] = item
+            new_idx = self.main.tree_proxy.mapFromSource(self.tree_model.append_entry(entry))
             
             if added_count == 0:
-                first_new_item_idx = item.index()
+                first_new_item_idx = new_idx
             added_count += 1
 
         if added_count > 0:
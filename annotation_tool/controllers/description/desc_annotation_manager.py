@@ -37,7 +37,7 @@ class DescAnnotationManager:
 
         # 1. Identify the Action Path
         path = current.data(ProjectTreeModel.FilePathRole)
-        model = self.main.tree_model
+        model = self.main.tree_proxy
         
         # If user clicked a child (video), find the parent (action) to show shared annotations
         if not model.hasChildren(current) and current.parent().isValid():
@@ -160,9 +160,8 @@ class DescAnnotationManager:
 
     def _update_tree_icon(self, path, is_done):
         """Updates the checkmark icon in the tree view."""
-        item = self.model.action_item_map.get(path)
-        if item:
-            item.setIcon(self.main.done_icon if is_done else self.main.empty_icon)
+        # The icon is derived from the captions by the tree model; just repaint the row
+        self.main.tree_model.refresh_path(path)
 
     def _auto_advance(self):
         """Moves selection to the next Action in the tree automatically."""
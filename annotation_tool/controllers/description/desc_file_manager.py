@@ -2,7 +2,6 @@ import os
 import json
 import datetime
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
-from utils import natural_sort_key
 
 class DescFileManager:
     """
@@ -170,7 +169,7 @@ class DescFileManager:
         self.model.json_loaded = True
         
         # Populate UI Tree
-        # The viewer will call tree_model.add_entry using 'name', 'path', and 'source_files' from our entry
+        # The tree model is rebuilt in one pass from the sorted entries ('name', 'path', 'source_files')
         self.main.populate_action_tree()
         self.main.update_save_export_button_state()
         
@@ -205,7 +204,7 @@ class DescFileManager:
         }
         
         base_dir = os.path.dirname(path)
-        sorted_items = sorted(self.model.action_item_data, key=lambda d: natural_sort_key(d.get("name", "")))
+        sorted_items = self.model.sorted_action_items()
         
         for data in sorted_items:
             # We reconstruct the item from our internal model data
@@ -254,6 +253,7 @@ class DescFileManager:
         try:
             with open(path, "w", encoding="utf-8") as f:
                 json.dump(output, f, indent=4, ensure_ascii=False)
+            self.model.save_history(path)
             self.model.is_data_dirty = False
             self.main.statusBar().showMessage(f"Saved to {os.path.basename(path)}", 2000)
             return True
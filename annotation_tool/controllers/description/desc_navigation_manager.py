@@ -3,7 +3,7 @@ from PyQt6.QtCore import QModelIndex
 from PyQt6.QtWidgets import QMessageBox, QFileDialog, QWidget
 
 # [Ref] Import Model Roles
-from models.project_tree import ProjectTreeModel
+from models.project_tree import ProjectTreeModel, ClipStatus
 
 # [Ref] Import the Unified MediaController
 from controllers.media_controller import MediaController
@@ -43,10 +43,11 @@ class DescNavigationManager:
         if not current.isValid(): return
 
         path = current.data(ProjectTreeModel.FilePathRole)
-        model = self.main.tree_model
+        model = self.main.tree_proxy
         
         # Handle folder selection: try to play first child
         if model.hasChildren(current):
+            model.fetchMore(current)
             first_child_idx = model.index(0, 0, current)
             if first_child_idx.isValid():
                 path = first_child_idx.data(ProjectTreeModel.FilePathRole)
@@ -97,6 +98,9 @@ class DescNavigationManager:
             name = os.path.basename(file_path)
             
             new_item = {
+                "name": name,
+                "path": file_path,
+                "source_files": [file_path],
                 "id": name,
                 "metadata": {"path": file_path, "questions": []},
                 "inputs": [{"type": "video", "name": name, "path": file_path}],
@@ -104,14 +108,14 @@ class DescNavigationManager:
             }
             
             self.model.action_item_data.append(new_item)
+            self.model.action_path_to_name[file_path] = name
             
             # Add entry to the tree model
-            item = self.main.tree_model.add_entry(name=name, path=file_path, source_files=[file_path])
-            self.model.action_item_map[file_path] = item
+            new_idx = self.main.tree_proxy.mapFromSource(self.main.tree_model.append_entry(new_item))
             
             # [NEW] Capture the index of the first added item
             if added_count == 0:
-                first_new_idx = item.index()
+                first_new_idx = new_idx
                 
             added_count += 1
             
@@ -131,41 +135,12 @@ class DescNavigationManager:
     def apply_action_filter(self):
         """Filters the tree items based on Done/Not Done status."""
         idx = self.main.left_panel.filter_combo.currentIndex()
-        tree_view = self.main.left_panel.tree
-        model = self.main.tree_model
+        proxy = self.main.tree_proxy
         
-        FILTER_DONE = self.main.FILTER_DONE
-        FILTER_NOT_DONE = self.main.FILTER_NOT_DONE
-        
-        root = model.invisibleRootItem()
-        for i in range(root.rowCount()):
-            item = root.child(i)
-            path = item.data(ProjectTreeModel.FilePathRole)
-            
-            is_done = False
-            
-            data_item = None
-            for d in self.model.action_item_data:
-                if d.get("metadata", {}).get("path") == path:
-                    data_item = d
-                    break
-            
-            if not data_item:
-                for d in self.model.action_item_data:
-                    if d.get("id") == item.text():
-                        data_item = d
-                        break
-            
-            if data_item:
-                captions = data_item.get("captions", [])
-                if captions and captions[0].get("text", "").strip():
-                    is_done = True
-            
-            should_hide = False
-            if idx == FILTER_DONE and not is_done: should_hide = True
-            elif idx == FILTER_NOT_DONE and is_done: should_hide = True
-            
-            tree_view.setRowHidden(i, QModelIndex(), should_hide)
+        # [NEW] "Done" is the cached HAND bit (a non-empty caption), see MainWindow._clip_status
+        if idx == self.main.FILTER_DONE: proxy.set_status_filter(require=ClipStatus.HAND)
+        elif idx == self.main.FILTER_NOT_DONE: proxy.set_status_filter(exclude=ClipStatus.HAND)
+        else: proxy.set_status_filter()
 
     # -------------------------------------------------------------------------
     #  Tree Navigation Helpers
@@ -180,7 +155,7 @@ class DescNavigationManager:
         curr = tree.currentIndex()
         if not curr.isValid(): return
         
-        model = self.main.tree_model
+        model = self.main.tree_proxy
         
         if level == 'top':
             if curr.parent().isValid(): curr = curr.parent()
@@ -193,7 +168,8 @@ class DescNavigationManager:
         elif level == 'child':
             parent = curr.parent()
             if not parent.isValid():
-                if step == 1 and model.rowCount(curr) > 0:
+                if step == 1 and model.hasChildren(curr):
+                    model.fetchMore(curr)
                     child = model.index(0, 0, curr)
                     tree.setCurrentIndex(child)
                 elif step == -1:
@@ -20,6 +20,7 @@ class HistoryManager:
         self.model.redo_stack.append(cmd)
         
         self._apply_state_change(cmd, is_undo=True)
+        self._refresh_clip_status(cmd)
         
         self.main.update_save_export_button_state()
         self._is_undoing_redoing = False
@@ -32,6 +33,7 @@ class HistoryManager:
         self.model.undo_stack.append(cmd)
         
         self._apply_state_change(cmd, is_undo=False)
+        self._refresh_clip_status(cmd)
         
         self.main.update_save_export_button_state()
         self._is_undoing_redoing = False
@@ -57,8 +59,8 @@ class HistoryManager:
             self.main.loc_manager._refresh_schema_ui()
             # Refresh Events (Table & Timeline)
             self.main.loc_manager._refresh_current_clip_events()
-            # Refresh left side
-            self.main.loc_manager.populate_tree()
+            # [CHANGED] The left tree is no longer rebuilt: the affected rows are
+            # refreshed through dataChanged by _refresh_clip_status()
 
         # 2: Description Mode
         elif tab_idx == 2:
@@ -77,6 +79,32 @@ class HistoryManager:
             if path:
                 self.main.dense_manager._display_events_for_item(path)
 
+    @staticmethod
+    def _affected_paths(cmd):
+        """Clips whose annotation status a command can change."""
+        for key in ('path', 'video_path'):
+            if key in cmd: return [cmd[key]]
+        paths = []
+        for key in ('batch_changes', 'affected_data', 'loc_affected_events'):
+            paths.extend(cmd.get(key) or {})
+        if cmd['type'] == CmdType.BATCH_SMART_ANNOTATION_RUN:
+            paths.extend(set(cmd.get('old_data') or {}) | set(cmd.get('new_data') or {}))
+        return paths
+
+    def _refresh_clip_status(self, cmd):
+        # [NEW] The tree caches each clip's status; drop it for the clips this command touched
+        for path in self._affected_paths(cmd):
+            self.main.tree_model.refresh_path(path)
+
+    @staticmethod
+    def _insert_label(lst, lbl, index=None):
+        """Re-insert a label at its recorded position (older commands have none: append + sort)."""
+        if lbl in lst: return
+        if index is None or index > len(lst):
+            lst.append(lbl); lst.sort()
+        else:
+            lst.insert(index, lbl)
+
     def _apply_state_change(self, cmd, is_undo):
         ctype = cmd['type']
         
@@ -84,7 +112,7 @@ class HistoryManager:
         if ctype == CmdType.ANNOTATION_CONFIRM:
             path = cmd['path']
             data = cmd['old_data'] if is_undo else cmd['new_data']
-            if data is None:
+            if not data:
                 if path in self.model.manual_annotations: del self.model.manual_annotations[path]
             else: self.model.manual_annotations[path] = copy.deepcopy(data)
             self.main.refresh_ui_after_undo_redo(path)
@@ -141,8 +169,10 @@ class HistoryManager:
             
         elif ctype == CmdType.UI_CHANGE:
             path = cmd['path']
+            val = cmd['old_val'] if is_undo else cmd['new_val']
+            # [FIX] Keep the model's last-UI-value map in step with the stack
+            self.model.ui_values[(path, cmd['head'])] = val
             if self.main.get_current_action_path() == path:
-                val = cmd['old_val'] if is_undo else cmd['new_val']
                 grp = self.main.classification_panel.label_groups.get(cmd['head'])
                 if grp:
                     if isinstance(grp, DynamicSingleLabelGroup): grp.set_checked_label(val)
@@ -219,15 +249,7 @@ class HistoryManager:
                 target_entry["captions"] = copy.deepcopy(data_to_apply)
                 
                 # 2. Update the tree icon status (Empty vs Done)
-                has_text = False
-                if data_to_apply and len(data_to_apply) > 0:
-                    text_val = data_to_apply[0].get("text", "")
-                    if text_val and text_val.strip():
-                        has_text = True
-                
-                tree_item = self.model.action_item_map.get(path)
-                if tree_item:
-                    tree_item.setIcon(self.main.done_icon if has_text else self.main.empty_icon)
+                self.main.tree_model.refresh_path(path)
 
             self._refresh_active_view()
 
@@ -247,6 +269,8 @@ class HistoryManager:
                 events.append(evt)
             
             self.model.dense_description_events[path] = events
+            # [FIX] The dense editor's time index is stale whichever tab is shown
+            self.main.dense_manager.event_index.invalidate()
             self._refresh_active_view()
 
         elif ctype == CmdType.DENSE_EVENT_DEL:
@@ -263,6 +287,7 @@ class HistoryManager:
                 # Redo Del -> Remove
                 if evt in events: events.remove(evt)
                 
+            self.main.dense_manager.event_index.invalidate()
             self._refresh_active_view()
 
         elif ctype == CmdType.DENSE_EVENT_MOD:
@@ -283,6 +308,7 @@ class HistoryManager:
                 # Should not happen if logic is correct
                 pass 
                 
+            self.main.dense_manager.event_index.invalidate()
             self._refresh_active_view()
 
         # =========================================================
@@ -294,13 +320,13 @@ class HistoryManager:
                 if head in self.model.label_definitions:
                     del self.model.label_definitions[head]
             else:
-                self.model.label_definitions[head] = cmd['definition']
+                self.model.label_definitions[head] = copy.deepcopy(cmd['definition'])
             self._refresh_active_view()
             
         elif ctype == CmdType.SCHEMA_DEL_CAT:
             head = cmd['head']
             if is_undo:
-                self.model.label_definitions[head] = cmd['definition']
+                self.model.label_definitions[head] = copy.deepcopy(cmd['definition'])
                 
                 if 'affected_data' in cmd:
                     for k, v in cmd['affected_data'].items():
@@ -319,6 +345,8 @@ class HistoryManager:
                     for k in cmd['affected_data']:
                         if head in self.model.manual_annotations.get(k, {}): 
                             del self.model.manual_annotations[k][head]
+                            # Same as the forward delete: drop entries left without any head
+                            if not self.model.manual_annotations[k]: del self.model.manual_annotations[k]
                             
                 if 'loc_affected_events' in cmd:
                     for vid in self.model.localization_events:
@@ -343,10 +371,12 @@ class HistoryManager:
                 if src in anno:
                     anno[dst] = anno.pop(src)
             
+            # [FIX] Replace renamed events instead of mutating them: other commands on the
+            # stack keep references to these dicts and must still match their old values
             for events in self.model.localization_events.values():
-                for evt in events:
+                for i, evt in enumerate(events):
                     if evt.get('head') == src:
-                        evt['head'] = dst
+                        events[i] = dict(evt, head=dst)
             
             self._refresh_active_view()
             
@@ -357,7 +387,7 @@ class HistoryManager:
                 if is_undo:
                     if lbl in lst: lst.remove(lbl)
                 else:
-                    if lbl not in lst: lst.append(lbl); lst.sort()
+                    self._insert_label(lst, lbl, cmd.get('index'))
             
             self._refresh_active_view()
             
@@ -367,16 +397,13 @@ class HistoryManager:
                 lst = self.model.label_definitions[head]['labels']
                 
                 if is_undo:
-                    if lbl not in lst: lst.append(lbl); lst.sort()
+                    self._insert_label(lst, lbl, cmd.get('index'))
                     if 'affected_data' in cmd:
+                        # [FIX] affected_data holds the label (single) or the full list (multi)
+                        # as it was before the delete, so restoring it keeps the original order
                         for k, v in cmd['affected_data'].items():
                             if k not in self.model.manual_annotations: self.model.manual_annotations[k] = {}
-                            if self.model.label_definitions[head]['type'] == 'single_label':
-                                self.model.manual_annotations[k][head] = v
-                            else:
-                                cur = self.model.manual_annotations[k].get(head, [])
-                                if lbl not in cur: cur.append(lbl)
-                                self.model.manual_annotations[k][head] = cur
+                            self.model.manual_annotations[k][head] = copy.deepcopy(v)
                                 
                     if 'loc_affected_events' in cmd:
                         for vid, events_list in cmd['loc_affected_events'].items():
@@ -391,7 +418,7 @@ class HistoryManager:
                             if self.model.label_definitions[head]['type'] == 'single_label':
                                 if anno.get(head) == lbl: anno[head] = None
                             else:
-                                if lbl in anno.get(head, []): anno[head].remove(lbl)
+                                if lbl in (anno.get(head) or []): anno[head] = [v for v in anno[head] if v != lbl]
                     
                     if 'loc_affected_events' in cmd:
                         for vid in self.model.localization_events:
@@ -421,11 +448,11 @@ class HistoryManager:
                 if isinstance(val, str) and val == src:
                     anno[head] = dst
                 elif isinstance(val, list) and src in val:
-                    val[val.index(src)] = dst
+                    anno[head] = [dst if v == src else v for v in val]
                     
             for events in self.model.localization_events.values():
-                for evt in events:
+                for i, evt in enumerate(events):
                     if evt.get('head') == head and evt.get('label') == src:
-                        evt['label'] = dst
+                        events[i] = dict(evt, label=dst)
                         
             self._refresh_active_view()
@@ -4,8 +4,6 @@ import json
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 from PyQt6.QtCore import QUrl
 
-from utils import natural_sort_key
-
 
 class LocFileManager:
     def __init__(self, main_window):
@@ -159,8 +157,9 @@ class LocFileManager:
                         missing_files.append(f"{aid}: {filename}")
 
             # Register clip in the model
+            # [CHANGED] Keep the input's fps: saved again until the clip has been probed
             self.model.action_item_data.append(
-                {"name": aid, "path": final_path, "source_files": [final_path]}
+                {"name": aid, "path": final_path, "source_files": [final_path], "fps": inputs[0].get("fps")}
             )
             self.model.action_path_to_name[final_path] = aid
 
@@ -251,9 +250,7 @@ class LocFileManager:
         }
 
         base_dir = os.path.dirname(path)
-        sorted_items = sorted(
-            self.model.action_item_data, key=lambda d: natural_sort_key(d.get("name", ""))
-        )
+        sorted_items = self.model.sorted_action_items()
 
         for data in sorted_items:
             abs_path = data["path"]
@@ -276,14 +273,14 @@ class LocFileManager:
                     }
                 )
 
+            video_input = {"type": "video", "path": rel_path}
+            # [FIX] A clip not probed yet (and loaded without fps) is saved without the key;
+            # the next save after its background probe writes the real value
+            fps = self.model.clip_fps(data)
+            if fps:
+                video_input["fps"] = fps
             entry = {
-                "inputs": [
-                    {
-                        "type": "video",
-                        "path": rel_path,
-                        "fps": 25.0,
-                    }
-                ],
+                "inputs": [video_input],
                 "events": export_events,
             }
             output["data"].append(entry)
@@ -291,6 +288,7 @@ class LocFileManager:
         try:
             with open(path, "w", encoding="utf-8") as f:
                 json.dump(output, f, indent=4, ensure_ascii=False)
+            self.model.save_history(path)
 
             self.model.is_data_dirty = False
             self.main.statusBar().showMessage(f"Saved — {os.path.basename(path)}", 1500)
@@ -5,6 +5,8 @@ import yaml
 import glob
 from PyQt6.QtCore import QObject, QThread, pyqtSignal
 
+from models import DEFAULT_FPS
+
 class LocInferenceWorker(QThread):
     """
     Background worker for running OpenSportsLib Localization inference.
@@ -13,12 +15,13 @@ class LocInferenceWorker(QThread):
     finished_signal = pyqtSignal(list)
     error_signal = pyqtSignal(str)
 
-    def __init__(self, video_path, start_ms, end_ms, config_path):
+    def __init__(self, video_path, start_ms, end_ms, config_path, fps=DEFAULT_FPS):
         super().__init__()
         self.video_path = os.path.abspath(video_path)
         self.start_ms = start_ms
         self.end_ms = end_ms
         self.config_path = config_path
+        self.fps = fps
 
     def run(self):
         try:
@@ -64,7 +67,7 @@ class LocInferenceWorker(QThread):
                     "labels": {"ball_action": {"type": "single_label", "labels": classes}},
                     "data": [{
                         "id": "inf_vid",
-                        "inputs": [{"path": self.video_path, "type": "video", "fps": 25.0}],
+                        "inputs": [{"path": self.video_path, "type": "video", "fps": self.fps}],
                         # Must include a dummy event to bypass the DataLoader
                         "events": [{"head": "ball_action", "label": classes[0] if classes else "Unknown", "position_ms": 0}]
                     }]
@@ -147,7 +150,9 @@ class LocalizationInferenceManager(QObject):
     def start_inference(self, video_path: str, start_ms: int, end_ms: int):
         if self.worker and self.worker.isRunning(): return
         config_path = os.path.join(os.getcwd(), "loc_config.yaml")
-        self.worker = LocInferenceWorker(video_path, start_ms, end_ms, config_path)
+        # [CHANGED] Probed frame rate instead of a fixed 25 fps
+        fps = self.main.model.media_fps(video_path)
+        self.worker = LocInferenceWorker(video_path, start_ms, end_ms, config_path, fps)
         self.worker.finished_signal.connect(self._on_finished)
         self.worker.error_signal.connect(self._on_error)
         self.worker.start()
@@ -1,12 +1,10 @@
 import os
 import copy
 from PyQt6.QtWidgets import QMessageBox, QInputDialog, QMenu, QFileDialog
-from PyQt6.QtCore import Qt, QUrl, QModelIndex, QTimer
-from PyQt6.QtGui import QColor
+from PyQt6.QtCore import Qt, QUrl, QTimer
 from PyQt6.QtMultimedia import QMediaPlayer
 
-from utils import natural_sort_key
-from models import CmdType 
+from models import CmdType, ClipStatus, HeadEventIndex
 # [NEW] Import the unified MediaController
 from controllers.media_controller import MediaController
 from .loc_inference import LocalizationInferenceManager
@@ -14,7 +12,7 @@ from .loc_inference import LocalizationInferenceManager
 class LocalizationManager:
     """
     Manages logic for the UI2 Localization Interface.
-    Refactored to support QTreeView + QStandardItemModel (MV Architecture).
+    Refactored to support QTreeView + ProjectTreeModel (MV Architecture).
     """
     def __init__(self, main_window, media_controller: MediaController):
         self.main = main_window
@@ -61,8 +59,8 @@ class LocalizationManager:
             # Tab switch to toggle timeline markers
             self.right_panel.tabs.currentChanged.connect(self._on_tab_switched)
         
-        # [NEW] Keep local position sync for LOC labeling UI
-        self.center_panel.media_preview.positionChanged.connect(self._on_media_position_changed)
+        # [CHANGED] Time display of the LOC labeling UI, coalesced and only while LOC is shown
+        self.main.playback_ui.subscribe(self._on_media_position_changed, when=self.main._is_loc_mode)
 
 
         tabs = self.right_panel.annot_mgmt.tabs
@@ -85,7 +83,7 @@ class LocalizationManager:
         table.updateTimeForSelectedRequested.connect(self._on_update_time_for_selected)
 
     def _on_media_position_changed(self, ms):
-        self.center_panel.timeline.set_position(ms)
+        # The timeline itself is updated by the main window's scheduler subscription
         time_str = self._fmt_ms_full(ms)
         self.right_panel.annot_mgmt.tabs.update_current_time(time_str)
 
@@ -147,13 +145,13 @@ class LocalizationManager:
                 continue
             
             name = os.path.basename(file_path)
-            self.model.action_item_data.append({'name': name, 'path': file_path, 'source_files': [file_path]})
+            entry = {'name': name, 'path': file_path, 'source_files': [file_path]}
+            self.model.action_item_data.append(entry)
             self.model.action_path_to_name[file_path] = name
-            item = self.tree_model.add_entry(name=name, path=file_path, source_files=[file_path])
-            self.model.action_item_map[file_path] = item
+            new_idx = self.main.tree_proxy.mapFromSource(self.tree_model.append_entry(entry))
             
             if added_count == 0:
-                first_new_item_idx = item.index()
+                first_new_item_idx = new_idx
             added_count += 1
 
         if added_count > 0:
@@ -191,9 +189,10 @@ class LocalizationManager:
             self.main.show_temp_msg("Error", "Name already exists!", icon=QMessageBox.Icon.Warning); return
         self.model.push_undo(CmdType.SCHEMA_REN_CAT, old_name=old_name, new_name=new_name)
         self.model.label_definitions[new_name] = self.model.label_definitions.pop(old_name)
+        # Replace (not mutate) renamed events so undo commands holding them still match
         for vid_path, events in self.model.localization_events.items():
-            for evt in events:
-                if evt.get('head') == old_name: evt['head'] = new_name
+            for i, evt in enumerate(events):
+                if evt.get('head') == old_name: events[i] = dict(evt, head=new_name)
         self.model.is_data_dirty = True
         self._refresh_schema_ui()
         self.right_panel.annot_mgmt.tabs.set_current_head(new_name)
@@ -217,6 +216,7 @@ class LocalizationManager:
             
         for vid_path in self.model.localization_events:
             self.model.localization_events[vid_path] = [e for e in self.model.localization_events[vid_path] if e.get('head') != head_name]
+        for vid_path in loc_affected: self.main.update_action_item_status(vid_path)
         self.model.is_data_dirty = True
         self._refresh_schema_ui()
         self._refresh_current_clip_events()
@@ -239,7 +239,7 @@ class LocalizationManager:
             self.main.show_temp_msg("Error", "Label exists!", icon=QMessageBox.Icon.Warning)
             if was_playing: player.play()
             return
-        self.model.push_undo(CmdType.SCHEMA_ADD_LBL, head=head, label=label_name)
+        self.model.push_undo(CmdType.SCHEMA_ADD_LBL, head=head, label=label_name, index=len(labels_list))
         labels_list.append(label_name)
         self.model.is_data_dirty = True
         if self.current_video_path:
@@ -251,7 +251,7 @@ class LocalizationManager:
         self.right_panel.annot_mgmt.tabs.set_current_head(head)
         if self.current_video_path: 
             self._display_events_for_item(self.current_video_path)
-            self.refresh_tree_icons()
+            self.main.update_action_item_status(self.current_video_path)
         self.main.show_temp_msg("Added", f"{head}: {label_name}")
         self.main.update_save_export_button_state()
         if was_playing: player.play()
@@ -267,8 +267,8 @@ class LocalizationManager:
         index = labels_list.index(old_label)
         labels_list[index] = new_label
         for vid_path, events in self.model.localization_events.items():
-            for evt in events:
-                if evt.get('head') == head and evt.get('label') == old_label: evt['label'] = new_label
+            for i, evt in enumerate(events):
+                if evt.get('head') == head and evt.get('label') == old_label: events[i] = dict(evt, label=new_label)
         self.model.is_data_dirty = True
         self._refresh_schema_ui()
         self.right_panel.annot_mgmt.tabs.set_current_head(head)
@@ -282,12 +282,14 @@ class LocalizationManager:
         for vid_path, events in self.model.localization_events.items():
             aff = [copy.deepcopy(e) for e in events if e.get('head') == head and e.get('label') == label]
             if aff: loc_affected[vid_path] = aff
-        self.model.push_undo(CmdType.SCHEMA_DEL_LBL, head=head, label=label, loc_affected_events=loc_affected)
         labels_list = self.model.label_definitions[head].get('labels', [])
+        index = labels_list.index(label) if label in labels_list else None
+        self.model.push_undo(CmdType.SCHEMA_DEL_LBL, head=head, label=label, index=index, loc_affected_events=loc_affected)
         if label in labels_list: labels_list.remove(label)
         for vid_path in self.model.localization_events:
             events = self.model.localization_events[vid_path]
             self.model.localization_events[vid_path] = [e for e in events if not (e.get('head') == head and e.get('label') == label)]
+        for vid_path in loc_affected: self.main.update_action_item_status(vid_path)
         self.model.is_data_dirty = True
         self._refresh_schema_ui()
         self.right_panel.annot_mgmt.tabs.set_current_head(head)
@@ -304,7 +306,7 @@ class LocalizationManager:
         self.model.localization_events[self.current_video_path].append(new_event)
         self.model.is_data_dirty = True
         self._display_events_for_item(self.current_video_path)
-        self.refresh_tree_icons() 
+        self.main.update_action_item_status(self.current_video_path)
         self.main.show_temp_msg("Event Created", f"{head}: {label}")
         self.main.update_save_export_button_state() 
 
@@ -333,7 +335,7 @@ class LocalizationManager:
             self._refresh_schema_ui()
             self.right_panel.annot_mgmt.tabs.set_current_head(new_head)
         self._display_events_for_item(self.current_video_path)
-        self.refresh_tree_icons()
+        self.main.update_action_item_status(self.current_video_path)
         self.main.show_temp_msg("Event Updated", "Modified")
         self.main.update_save_export_button_state() 
 
@@ -348,7 +350,7 @@ class LocalizationManager:
         events.remove(item_data)
         self.model.is_data_dirty = True
         self._display_events_for_item(self.current_video_path)
-        self.refresh_tree_icons()
+        self.main.update_action_item_status(self.current_video_path)
         self.main.update_save_export_button_state() 
 
     # --- Helper Refresh Methods ---
@@ -401,7 +403,7 @@ class LocalizationManager:
         if action == remove_action: self._remove_single_video(path, index)
 
     def _remove_single_video(self, path, index):
-        self.model.action_item_data = [d for d in self.model.action_item_data if d['path'] != path]
+        self.model.action_item_data.remove_path(path)
         if path in self.model.action_path_to_name: del self.model.action_path_to_name[path]
         if path in self.model.localization_events: del self.model.localization_events[path]
         self.model.is_data_dirty = True
@@ -414,24 +416,16 @@ class LocalizationManager:
             
             self.right_panel.table.set_data([])
             self.center_panel.timeline.set_markers([])
-        if index.isValid(): self.tree_model.removeRow(index.row(), index.parent())
+        self.tree_model.remove_path(path)
         self.main.show_temp_msg("Removed", "Video removed from list.")
         self.main.update_save_export_button_state() 
 
     def populate_tree(self):
         self.left_panel.tree.blockSignals(True) 
-        self.tree_model.clear()
-        self.model.action_item_map.clear()
-        sorted_list = sorted(self.model.action_item_data, key=lambda d: natural_sort_key(d.get('name', '')))
-        first_idx = None
-        for i, data in enumerate(sorted_list):
-            name = data['name']
-            path = data['path']
-            item = self.tree_model.add_entry(name, path, data.get('source_files'))
-            self.model.action_item_map[path] = item
-            events = self.model.localization_events.get(path, [])
-            item.setIcon(self.main.done_icon if events else self.main.empty_icon)
-            if i == 0: first_idx = item.index()
+        sorted_list = self.model.sorted_action_items()
+        # [NEW] Virtual model: rows and icons are served straight from the entry dicts
+        self.tree_model.set_entries(sorted_list)
+        first_idx = self.main.tree_proxy.index(0, 0)
         self._refresh_schema_ui()
         if self.current_head: self.right_panel.annot_mgmt.tabs.set_current_head(self.current_head)
         self._apply_clip_filter(self.left_panel.filter_combo.currentIndex())
@@ -440,22 +434,12 @@ class LocalizationManager:
             self.on_clip_selected(first_idx, None)
         self.left_panel.tree.blockSignals(False)
 
-    def refresh_tree_icons(self):
-        for path, item in self.model.action_item_map.items():
-            events = self.model.localization_events.get(path, [])
-            item.setIcon(self.main.done_icon if events else self.main.empty_icon)
-
     def _apply_clip_filter(self, combo_index):
-        root = self.tree_model.invisibleRootItem()
-        for i in range(root.rowCount()):
-            item = root.child(i)
-            path = item.data(Qt.ItemDataRole.UserRole)
-            events = self.model.localization_events.get(path, [])
-            has_anno = len(events) > 0
-            should_hide = False
-            if combo_index == 1 and not has_anno: should_hide = True 
-            elif combo_index == 2 and has_anno: should_hide = True   
-            self.left_panel.tree.setRowHidden(i, QModelIndex(), should_hide)
+        # [NEW] 1 = has events, 2 = no events; evaluated by the proxy on the cached status
+        proxy = self.main.tree_proxy
+        if combo_index == 1: proxy.set_status_filter(require=ClipStatus.HAND)
+        elif combo_index == 2: proxy.set_status_filter(exclude=ClipStatus.HAND)
+        else: proxy.set_status_filter()
     
     def _display_events_for_item(self, path):
         events = self.model.localization_events.get(path, [])
@@ -465,8 +449,11 @@ class LocalizationManager:
             d = e.copy(); d['clip'] = clip_name; display_data.append(e) 
         display_data.sort(key=lambda x: x.get('position_ms', 0))
         self.right_panel.table.set_data(display_data)
-        markers = [{'start_ms': e.get('position_ms', 0), 'color': QColor("#00BFFF")} for e in events]
-        self.center_panel.timeline.set_markers(markers)
+        # [CHANGED] One timeline lane per head (schema order, then heads only found in events)
+        index = HeadEventIndex(events)
+        heads = list(self.model.label_definitions)
+        heads += [h for h in index.heads() if h not in self.model.label_definitions]
+        self.center_panel.timeline.set_lanes(index, heads)
 
     def _navigate_clip(self, step):
         tree = self.left_panel.tree
@@ -493,39 +480,27 @@ class LocalizationManager:
             self._select_row_by_time(target_time)
 
     def _select_row_by_time(self, time_ms):
+        # [CHANGED] Indexed lookup instead of a row scan
         model = self.right_panel.table.model
-        for row in range(model.rowCount()):
-            item = model.get_annotation_at(row)
-            if item and abs(item.get('position_ms', 0) - time_ms) < 10:
-                idx = model.index(row, 0)
-                self.right_panel.table.table.selectRow(row)
-                self.right_panel.table.table.scrollTo(idx)
-                break
+        row = model.row_at_time(time_ms, 9)
+        if row >= 0:
+            self.right_panel.table.table.selectRow(row)
+            self.right_panel.table.table.scrollTo(model.index(row, 0))
 
     def _reselect_event(self, target_event):
         model = self.right_panel.table.model
         table_view = self.right_panel.table.table
         
+        # [CHANGED] O(1) lookup of the event's row (the table holds the same dicts)
+        row = model.row_of(target_event)
+        if row < 0:
+            return
+
         table_view.selectionModel().blockSignals(True)
-        
-        for row in range(model.rowCount()):
-            item = model.get_annotation_at(row)
-            if not item: continue
-            
-            if (item.get('position_ms') == target_event.get('position_ms') and 
-                item.get('head') == target_event.get('head') and 
-                item.get('label') == target_event.get('label')):
-                
-                idx = model.index(row, 0)
-                
-                table_view.selectRow(row)
-                table_view.scrollTo(idx)
-                
-                if hasattr(self.right_panel.table, 'btn_set_time'):
-                    self.right_panel.table.btn_set_time.setEnabled(True)
-                
-                break 
-                
+        table_view.selectRow(row)
+        table_view.scrollTo(model.index(row, 0))
+        if hasattr(self.right_panel.table, 'btn_set_time'):
+            self.right_panel.table.btn_set_time.setEnabled(True)
         table_view.selectionModel().blockSignals(False)
 
     def _fmt_ms_full(self, ms):
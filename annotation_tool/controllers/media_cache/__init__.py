@@ -0,0 +1,3 @@
+# controllers/media_cache/__init__.py
+# Background media jobs (thumbnails, ...) and their on-disk cache.
+# Kept free of Qt imports: worker processes import the job modules of this package.
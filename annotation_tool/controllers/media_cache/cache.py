@@ -0,0 +1,40 @@
+import os
+import hashlib
+
+# Shared with the inference/training temp files
+WORKSPACE_DIR = os.path.join(os.path.expanduser("~"), ".soccernet_workspace")
+# Bytes hashed at each end of a file for its fingerprint
+_FINGERPRINT_CHUNK = 64 * 1024
+
+
+def cache_dir(kind):
+    """~/.soccernet_workspace/cache/<kind>, created on demand."""
+    path = os.path.join(WORKSPACE_DIR, "cache", kind)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_fingerprint(path):
+    """
+    Content-based key of a media file: its size plus a hash of its first and
+    last 64 KB. Survives renames/moves; changes when the file is rewritten.
+    """
+    size = os.path.getsize(path)
+    h = hashlib.sha1(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        h.update(f.read(_FINGERPRINT_CHUNK))
+        if size > 2 * _FINGERPRINT_CHUNK:
+            f.seek(-_FINGERPRINT_CHUNK, os.SEEK_END)
+            h.update(f.read(_FINGERPRINT_CHUNK))
+    return h.hexdigest()
+
+
+def atomic_write(path, write):
+    """Call write(tmp_path) and move the result into place (readers never see partial files)."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,343 @@
+"""
+Frame decoding for the background media jobs.
+
+Runs in worker processes: keep this module free of Qt imports. The first
+available backend is used: PyAV, then OpenCV, then the ffmpeg command line.
+"""
+import json
+import shutil
+import subprocess
+from fractions import Fraction
+
+import numpy as np
+
+
+def decoder_backend():
+    """Name of the decoder used for background jobs ("av", "cv2", "ffmpeg") or None."""
+    try:
+        import av  # noqa: F401
+        return "av"
+    except ImportError:
+        pass
+    try:
+        import cv2  # noqa: F401
+        return "cv2"
+    except ImportError:
+        pass
+    if shutil.which("ffmpeg"):
+        return "ffmpeg"
+    return None
+
+
+def sample_times(duration_s, interval_s, max_frames):
+    """Sampling instants (seconds): every interval_s, spread out further for long clips."""
+    if duration_s <= 0:
+        return [0.0]
+    step = max(interval_s, duration_s / max_frames)
+    return [float(t) for t in np.arange(0.0, duration_s, step)]
+
+
+def extract_frames(path, interval_s, height, max_frames):
+    """
+    Decode one frame every interval_s seconds (at most max_frames), scaled to `height`.
+    Returns (times_ms, frames) with frames an (N, height, width, 3) uint8 RGB array.
+    """
+    backend = decoder_backend()
+    if backend == "av":
+        return _extract_av(path, interval_s, height, max_frames)
+    if backend == "cv2":
+        return _extract_cv2(path, interval_s, height, max_frames)
+    if backend == "ffmpeg":
+        return _extract_ffmpeg(path, interval_s, height, max_frames)
+    raise RuntimeError("No video decoder available (install PyAV, OpenCV or ffmpeg).")
+
+
+# Packets read to estimate the keyframe interval (GOP length)
+_KEYFRAME_SCAN_PACKETS = 600
+
+
+def probe_media(path):
+    """
+    Stream facts of a video file:
+    {"duration_ms", "fps", "width", "height", "codec", "keyframe_interval"}.
+    keyframe_interval is in frames, or None when it cannot be measured.
+    """
+    backend = decoder_backend()
+    if backend == "av":
+        return _probe_av(path)
+    if backend == "cv2":
+        return _probe_cv2(path)
+    if backend == "ffmpeg" and shutil.which("ffprobe"):
+        return _probe_ffprobe(path)
+    raise RuntimeError("No media probe available (install PyAV, OpenCV or ffmpeg).")
+
+
+def _media_info(duration_s, fps, width, height, codec, keyframe_interval=None):
+    return {
+        "duration_ms": int(round(max(0.0, duration_s) * 1000)),
+        "fps": round(float(fps), 3) if fps and fps > 0 else None,
+        "width": int(width or 0),
+        "height": int(height or 0),
+        "codec": codec or "",
+        "keyframe_interval": keyframe_interval,
+    }
+
+
+def _median_gap(keyframe_indices):
+    gaps = sorted(b - a for a, b in zip(keyframe_indices, keyframe_indices[1:]))
+    return gaps[len(gaps) // 2] if gaps else None
+
+
+def _probe_av(path):
+    import av
+
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        if container.duration:
+            duration_s = container.duration / av.time_base
+        else:
+            duration_s = float(stream.duration * stream.time_base) if stream.duration else 0.0
+        rate = stream.average_rate or stream.guessed_rate
+        ctx = stream.codec_context
+        # Demuxing only (no decoding): cheap even for 4K sources
+        keyframes = []
+        for i, packet in enumerate(container.demux(stream)):
+            if i >= _KEYFRAME_SCAN_PACKETS:
+                break
+            if packet.is_keyframe:
+                keyframes.append(i)
+        return _media_info(duration_s, float(rate) if rate else 0.0, ctx.width, ctx.height, ctx.name,
+                           _median_gap(keyframes))
+
+
+def _probe_cv2(path):
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open {path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        count = cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0.0
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC) or 0)
+        codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\0 ").lower()
+        return _media_info(count / fps if fps > 0 else 0.0, fps,
+                           cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT), codec)
+    finally:
+        cap.release()
+
+
+def _probe_ffprobe(path):
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries",
+         "stream=codec_name,width,height,avg_frame_rate,r_frame_rate:format=duration", "-of", "json", path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    data = json.loads(out or "{}")
+    streams = data.get("streams") or [{}]
+    stream = streams[0]
+    fps = 0.0
+    for key in ("avg_frame_rate", "r_frame_rate"):
+        try:
+            fps = float(Fraction(stream.get(key) or "0/1"))
+        except (ValueError, ZeroDivisionError):
+            fps = 0.0
+        if fps > 0:
+            break
+    try:
+        duration_s = float((data.get("format") or {}).get("duration") or 0.0)
+    except ValueError:
+        duration_s = 0.0
+
+    flags = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0", "-read_intervals", f"%+#{_KEYFRAME_SCAN_PACKETS}",
+         "-show_entries", "packet=flags", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=False,
+    ).stdout.split()
+    keyframes = [i for i, f in enumerate(flags) if "K" in f]
+    return _media_info(duration_s, fps, stream.get("width"), stream.get("height"), stream.get("codec_name"),
+                       _median_gap(keyframes))
+
+
+def _scaled_width(width, height, target_height):
+    if not width or not height:
+        return target_height * 16 // 9
+    return max(2, int(round(width * target_height / height / 2)) * 2)
+
+
+def _extract_av(path, interval_s, height, max_frames):
+    import av
+
+    times_ms, frames = [], []
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        if container.duration:
+            duration_s = container.duration / av.time_base
+        else:
+            duration_s = float(stream.duration * stream.time_base) if stream.duration else 0.0
+        width = _scaled_width(stream.codec_context.width, stream.codec_context.height, height)
+
+        last_pts = None
+        for t in sample_times(duration_s, interval_s, max_frames):
+            # Nearest keyframe at or before t: fast, and close enough for a thumbnail
+            container.seek(int(t / stream.time_base), stream=stream, backward=True)
+            frame = next(container.decode(stream), None)
+            if frame is None or frame.pts == last_pts:
+                continue
+            last_pts = frame.pts
+            times_ms.append(int(round((frame.time if frame.time is not None else t) * 1000)))
+            frames.append(frame.to_ndarray(width=width, height=height, format="rgb24"))
+    return times_ms, _stack(frames, height)
+
+
+def _extract_cv2(path, interval_s, height, max_frames):
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open {path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        count = cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0.0
+        duration_s = count / fps if fps > 0 else 0.0
+        width = _scaled_width(cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT), height)
+
+        times_ms, frames = [], []
+        for t in sample_times(duration_s, interval_s, max_frames):
+            cap.set(cv2.CAP_PROP_POS_MSEC, t * 1000.0)
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            times_ms.append(int(round(t * 1000)))
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    finally:
+        cap.release()
+    return times_ms, _stack(frames, height)
+
+
+def probe_duration_ffmpeg(path):
+    """Duration in seconds read with ffprobe (0.0 when unavailable)."""
+    if not shutil.which("ffprobe"):
+        return 0.0
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=False,
+    ).stdout.strip()
+    try:
+        return float(out)
+    except ValueError:
+        return 0.0
+
+
+def _extract_ffmpeg(path, interval_s, height, max_frames):
+    # Fixed 16:9 output (letterboxed) so frames can be split from the raw stream
+    width = height * 16 // 9
+    times = sample_times(probe_duration_ffmpeg(path), interval_s, max_frames)
+    step = times[1] - times[0] if len(times) > 1 else interval_s
+    vf = (
+        f"fps=1/{step:.6f},"
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
+    )
+    cmd = [
+        "ffmpeg", "-v", "error", "-skip_frame", "nokey", "-i", path,
+        "-vf", vf, "-frames:v", str(max_frames),
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-",
+    ]
+    raw = subprocess.run(cmd, capture_output=True, check=True).stdout
+    frame_size = width * height * 3
+    n = len(raw) // frame_size
+    frames = np.frombuffer(raw[:n * frame_size], dtype=np.uint8).reshape(n, height, width, 3)
+    return [int(round(i * step * 1000)) for i in range(n)], frames
+
+
+# ---------------------------------------------------------------------------
+# Audio envelope
+# ---------------------------------------------------------------------------
+def audio_backend():
+    """Name of the audio decoder ("av", "ffmpeg") or None (OpenCV has no audio)."""
+    backend = decoder_backend()
+    if backend == "av":
+        return "av"
+    return "ffmpeg" if shutil.which("ffmpeg") else None
+
+
+class _EnvelopeAccumulator:
+    """RMS per bin of a mono sample stream, without keeping the samples."""
+
+    def __init__(self, bin_samples):
+        self.bin_samples = bin_samples
+        self._rest = np.zeros(0, dtype=np.float32)
+        self._bins = []
+
+    def feed(self, samples):
+        buf = np.concatenate((self._rest, np.asarray(samples, dtype=np.float32).reshape(-1)))
+        full = len(buf) // self.bin_samples * self.bin_samples
+        if full:
+            blocks = buf[:full].reshape(-1, self.bin_samples)
+            self._bins.append(np.sqrt(np.mean(blocks * blocks, axis=1)))
+        self._rest = buf[full:]
+
+    def finish(self):
+        if len(self._rest):
+            self._bins.append(np.sqrt(np.mean(self._rest * self._rest, keepdims=True)))
+            self._rest = np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._bins) if self._bins else np.zeros(0, dtype=np.float32)
+
+
+def extract_audio_rms(path, bin_ms, rate):
+    """
+    RMS of the first audio track (downmixed to mono at `rate` Hz) per bin of
+    bin_ms milliseconds. Returns a float32 array (empty without audio).
+    """
+    bin_samples = max(1, int(rate * bin_ms / 1000))
+    acc = _EnvelopeAccumulator(bin_samples)
+    backend = audio_backend()
+    if backend == "av":
+        _decode_audio_av(path, rate, acc)
+    elif backend == "ffmpeg":
+        _decode_audio_ffmpeg(path, rate, acc)
+    else:
+        raise RuntimeError("No audio decoder available (install PyAV or ffmpeg).")
+    return acc.finish()
+
+
+def _decode_audio_av(path, rate, acc):
+    import av
+
+    with av.open(path) as container:
+        if not container.streams.audio:
+            return
+        stream = container.streams.audio[0]
+        stream.thread_type = "AUTO"
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=rate)
+        for frame in container.decode(stream):
+            frame.pts = None  # the resampler only needs the samples
+            for out in resampler.resample(frame):
+                acc.feed(out.to_ndarray())
+        for out in resampler.resample(None):
+            acc.feed(out.to_ndarray())
+
+
+def _decode_audio_ffmpeg(path, rate, acc):
+    cmd = ["ffmpeg", "-v", "error", "-nostdin", "-i", path, "-map", "0:a:0?", "-vn",
+           "-ac", "1", "-ar", str(rate), "-f", "f32le", "-"]
+    chunk = 4 * rate  # one second of float32 samples
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+        rest = b""
+        while True:
+            data = proc.stdout.read(chunk)
+            if not data:
+                break
+            data = rest + data
+            usable = len(data) // 4 * 4
+            acc.feed(np.frombuffer(data[:usable], dtype="<f4"))
+            rest = data[usable:]
+
+
+def _stack(frames, height):
+    if not frames:
+        return np.zeros((0, height, height * 16 // 9, 3), dtype=np.uint8)
+    return np.stack(frames)
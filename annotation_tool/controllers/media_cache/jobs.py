@@ -0,0 +1,98 @@
+"""
+Entry points of the background media jobs (run in worker processes).
+Keep this module free of Qt imports.
+"""
+import json
+import os
+import subprocess
+
+import numpy as np
+
+from .cache import atomic_write, file_fingerprint
+from .decoders import extract_frames, extract_audio_rms, probe_media
+
+
+def build_thumbnail_strip(path, out_path, interval_s, height, max_frames):
+    """Decode the thumbnails of one clip into an .npz file (times_ms, frames)."""
+    times_ms, frames = extract_frames(path, interval_s, height, max_frames)
+    if not len(frames):
+        raise RuntimeError(f"No frame could be decoded from {path}")
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            np.savez(f, times_ms=np.asarray(times_ms, dtype=np.int64), frames=frames)
+
+    atomic_write(out_path, write)
+    return out_path
+
+
+def build_audio_envelope(path, out_path, bin_ms, rate, floor_db):
+    """
+    Audio loudness envelope of one clip as an .npz (bin_ms, levels): one
+    value in [0, 1] per bin, on a dB scale from floor_db to 0 dBFS. A clip
+    without audio gets an empty array (cached too, so it is not retried).
+    """
+    rms = extract_audio_rms(path, bin_ms, rate)
+    db = 20.0 * np.log10(np.maximum(rms, 1e-9))
+    levels = np.clip((db - floor_db) / -floor_db, 0.0, 1.0).astype(np.float16)
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            np.savez(f, bin_ms=np.int32(bin_ms), levels=levels)
+
+    atomic_write(out_path, write)
+    return out_path
+
+
+def build_proxy(path, out_path, height, gop):
+    """
+    Transcode a clip to a small H.264 proxy (MP4) with the ffmpeg CLI.
+    A keyframe every `gop` frames (1 = all-intra) keeps seeks cheap; the
+    clip length and start are unchanged so proxy positions match the source.
+    """
+    def write(tmp_path):
+        cmd = [
+            "ffmpeg", "-v", "error", "-nostdin", "-y", "-i", path,
+            "-map", "0:v:0", "-map", "0:a:0?",
+            "-vf", f"scale=-2:'min({height},ih)'",
+            "-c:v", "libx264", "-preset", "veryfast", "-tune", "fastdecode", "-crf", "23",
+            "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-b:a", "128k",
+            "-movflags", "+faststart", "-f", "mp4", tmp_path,
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "ffmpeg failed")
+
+    atomic_write(out_path, write)
+    return out_path
+
+
+def probe_batch(paths, cache_root, version):
+    """
+    Probe several clips (see decoders.probe_media), reading and filling the
+    per-fingerprint JSON cache in cache_root. Returns {path: info or None}.
+    """
+    results = {}
+    for path in paths:
+        if not os.path.isfile(path):
+            results[path] = None
+            continue
+        try:
+            cache_file = os.path.join(cache_root, f"{file_fingerprint(path)}_v{version}.json")
+            if os.path.exists(cache_file):
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    results[path] = json.load(f)
+                continue
+            info = probe_media(path)
+
+            def write(tmp_path, info=info):
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(info, f)
+
+            atomic_write(cache_file, write)
+            results[path] = info
+        except Exception as e:
+            print(f"[Probe] {path}: {e}")
+            results[path] = None
+    return results
@@ -0,0 +1,87 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .cache import cache_dir
+from .decoders import decoder_backend
+from .jobs import probe_batch
+
+PROBE_BATCH = 32     # clips per worker task (amortizes the process round trip)
+PROBE_VERSION = 1    # bump when the probe result format changes
+_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+class ProbeService(QObject):
+    """
+    Parallel media probe (duration, fps, resolution, codec, keyframe interval).
+
+    probe(paths) queues every clip not probed yet, in batches of PROBE_BATCH
+    per worker process. Results are cached on disk by file fingerprint under
+    ~/.soccernet_workspace/cache/probes, so reopening a project only reads
+    small JSON files. probed({path: info}) is emitted per finished batch;
+    failed clips map to None. Without PyAV / OpenCV / ffprobe the service
+    stays idle.
+    """
+    probed = pyqtSignal(dict)
+    # (results, error message) emitted from the executor thread, handled in the GUI thread
+    _batchFinished = pyqtSignal(object, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.enabled = decoder_backend() is not None
+        self._executor = None
+        self._pending = set()
+        self._done = set()
+        self._batchFinished.connect(self._on_batch_finished)
+
+    def probe(self, paths):
+        """Queue the clips that were neither probed nor queued yet (order is kept)."""
+        if not self.enabled:
+            return
+        todo = []
+        for path in paths:
+            if path and path not in self._done and path not in self._pending:
+                self._pending.add(path)
+                todo.append(path)
+        if not todo:
+            return
+        if self._executor is None:
+            # spawn, as in CacheJobService: never fork the GUI process
+            self._executor = ProcessPoolExecutor(max_workers=_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        root = cache_dir("probes")
+        for i in range(0, len(todo), PROBE_BATCH):
+            batch = todo[i:i + PROBE_BATCH]
+            future = self._executor.submit(probe_batch, batch, root, PROBE_VERSION)
+            future.add_done_callback(lambda f, batch=batch: self._batchFinished.emit(*self._batch_result(f, batch)))
+
+    def forget(self):
+        """Drop the record of probed clips (results stay cached on disk)."""
+        self._done.clear()
+
+    def shutdown(self):
+        """Cancel queued batches (called on exit)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _batch_result(future, batch):
+        if future.cancelled():
+            return {p: None for p in batch}, "cancelled"
+        error = future.exception()
+        if error is not None:
+            return {p: None for p in batch}, str(error) or type(error).__name__
+        return future.result(), ""
+
+    def _on_batch_finished(self, results, error):
+        if error == "cancelled":
+            return
+        if error:
+            print(f"[Probe] batch failed: {error}")
+        self._pending.difference_update(results)
+        self._done.update(results)
+        self.probed.emit(results)
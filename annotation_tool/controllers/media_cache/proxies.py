@@ -0,0 +1,59 @@
+import os
+import shutil
+
+from PyQt6.QtCore import pyqtSignal
+
+from .jobs import build_proxy
+from .service import CacheJobService
+
+PROXY_HEIGHT = 540   # proxies are never upscaled
+PROXY_GOP = 12       # keyframe interval in frames (1 = all-intra, largest files)
+_WORKERS = 1         # ffmpeg already uses several threads per job
+
+
+class ProxyService(CacheJobService):
+    """
+    Low-resolution playback proxies (opt-in).
+
+    request(path) transcodes a clip to a PROXY_HEIGHT, short-GOP H.264 MP4 in
+    a worker process (ffmpeg CLI), stored under
+    ~/.soccernet_workspace/cache/proxies and keyed by the file fingerprint.
+    proxy_path(path) is the file to *play* for a clip (the proxy when it is
+    built, else the clip itself). Annotations, export and inference keep
+    using the original path: the proxy has the same length and start time.
+    """
+    proxyReady = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__("proxies", _WORKERS, parent)
+        self.available = shutil.which("ffmpeg") is not None
+        # Off until the user turns proxies on
+        self.enabled = False
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = bool(enabled) and self.available
+        if not self.enabled:
+            self.shutdown()
+
+    def cache_name(self, fingerprint):
+        return f"{fingerprint}_{PROXY_HEIGHT}p_g{PROXY_GOP}.mp4"
+
+    def proxy_path(self, path):
+        """File to play for `path`: its proxy if enabled and built, else `path`."""
+        if not self.enabled or not path:
+            return path
+        out_path = self._cache_path(path)
+        return out_path if out_path is not None and os.path.exists(out_path) else path
+
+    def request(self, path):
+        """Transcode `path` in the background unless its proxy exists or is queued."""
+        out_path = self._cache_path(path)
+        if not self._can_submit(out_path):
+            return
+        if os.path.exists(out_path):
+            return
+        self._submit(path, out_path, build_proxy, PROXY_HEIGHT, PROXY_GOP)
+
+    # ------------------------------------------------------------------
+    def _job_ready(self, path):
+        self.proxyReady.emit(path)
@@ -0,0 +1,94 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .cache import cache_dir, file_fingerprint
+
+
+class CacheJobService(QObject):
+    """
+    Base of the background media services: one result file per source clip,
+    built by a job in a ProcessPoolExecutor and stored in cache_dir(kind)
+    under the clip's fingerprint.
+
+    Subclasses define cache_name(fingerprint) and _job_ready(path), and call
+    _submit(path, out_path, job, *args) to queue a build. Workers are spawned,
+    so job must be a module-level function (see jobs.py).
+    """
+    # (cache file, error message) emitted from the executor thread, handled in the GUI thread
+    _jobFinished = pyqtSignal(str, str)
+
+    def __init__(self, kind, workers, parent=None):
+        super().__init__(parent)
+        self.kind = kind
+        self.workers = workers
+        self.enabled = True
+        self._executor = None
+        self._pending = {}          # out_path -> source path
+        self._cache_paths = {}      # source path -> (mtime_ns, out_path)
+        self._failed = set()
+        self._jobFinished.connect(self._on_job_finished)
+
+    def cache_name(self, fingerprint):
+        raise NotImplementedError
+
+    def _job_ready(self, path):
+        raise NotImplementedError
+
+    def is_pending(self, path):
+        out_path = self._cache_path(path)
+        return out_path is not None and out_path in self._pending
+
+    def shutdown(self):
+        """Cancel queued jobs (called on exit)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+    # ------------------------------------------------------------------
+    def _can_submit(self, out_path):
+        return self.enabled and out_path is not None and out_path not in self._pending and out_path not in self._failed
+
+    def _submit(self, path, out_path, job, *args):
+        if self._executor is None:
+            # spawn: a forked copy of the GUI process (Qt threads) is not safe; jobs live in .jobs
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._pending[out_path] = path
+        future = self._executor.submit(job, path, out_path, *args)
+        # Runs in an executor thread; the queued signal brings it back to the GUI thread
+        future.add_done_callback(lambda f, key=out_path: self._jobFinished.emit(key, self._job_error(f)))
+
+    @staticmethod
+    def _job_error(future):
+        if future.cancelled():
+            return "cancelled"
+        error = future.exception()
+        return "" if error is None else str(error) or type(error).__name__
+
+    def _on_job_finished(self, out_path, error):
+        path = self._pending.pop(out_path, None)
+        if path is None:
+            return
+        if error:
+            print(f"[{self.kind.capitalize()}] {path}: {error}")
+            self._failed.add(out_path)
+            return
+        self._job_ready(path)
+
+    def _cache_path(self, path):
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._cache_paths.get(path)
+        if cached is None or cached[0] != mtime_ns:
+            try:
+                fingerprint = file_fingerprint(path)
+            except OSError:
+                return None
+            cached = (mtime_ns, os.path.join(cache_dir(self.kind), self.cache_name(fingerprint)))
+            self._cache_paths[path] = cached
+        return cached[1]
@@ -0,0 +1,103 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtGui import QImage
+
+from .decoders import decoder_backend
+from .jobs import build_thumbnail_strip
+from .service import CacheJobService
+
+THUMB_INTERVAL_S = 5.0   # one thumbnail every N seconds
+THUMB_HEIGHT = 90        # stored height; the timeline scales it down
+THUMB_MAX_FRAMES = 400   # long clips are sampled more sparsely
+MEMORY_CLIPS = 16        # decoded filmstrips kept in memory (hover previews)
+_WORKERS = 2
+
+
+class Filmstrip:
+    """Thumbnails of one clip: sorted times (ms) and matching QImages."""
+
+    def __init__(self, times_ms, images):
+        self.times_ms = times_ms
+        self.images = images
+
+    def __len__(self):
+        return len(self.images)
+
+    def image_at(self, ms):
+        """Thumbnail closest to (at or before) ms."""
+        if not self.images:
+            return None
+        i = int(np.searchsorted(self.times_ms, ms, side="right")) - 1
+        return self.images[max(0, i)]
+
+
+class ThumbnailService(CacheJobService):
+    """
+    Background filmstrip cache for the timeline.
+
+    request(path) decodes one frame every THUMB_INTERVAL_S seconds in a worker
+    process and stores the strip under ~/.soccernet_workspace/cache/thumbnails,
+    keyed by the file fingerprint. filmstrip(path) returns the decoded strip
+    from memory (LRU of MEMORY_CLIPS clips) or from the disk cache, or None if
+    it is not built yet; thumbnailsReady(path) is emitted once it is.
+    Without a decoder (PyAV / OpenCV / ffmpeg) the service stays idle.
+    """
+    thumbnailsReady = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__("thumbnails", _WORKERS, parent)
+        self.enabled = decoder_backend() is not None
+        self._memory = OrderedDict()  # out_path -> Filmstrip
+
+    def cache_name(self, fingerprint):
+        return f"{fingerprint}_{int(THUMB_INTERVAL_S * 1000)}_{THUMB_HEIGHT}.npz"
+
+    def filmstrip(self, path):
+        """Cached strip of `path` (memory first, then disk), or None."""
+        out_path = self._cache_path(path)
+        if out_path is None:
+            return None
+        strip = self._memory.get(out_path)
+        if strip is not None:
+            self._memory.move_to_end(out_path)
+            return strip
+        if not os.path.exists(out_path):
+            return None
+        try:
+            strip = self._load(out_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        self._memory[out_path] = strip
+        while len(self._memory) > MEMORY_CLIPS:
+            self._memory.popitem(last=False)
+        return strip
+
+    def request(self, path):
+        """Build the strip of `path` in the background unless cached or already queued."""
+        out_path = self._cache_path(path)
+        if not self._can_submit(out_path):
+            return
+        if out_path in self._memory or os.path.exists(out_path):
+            self.thumbnailsReady.emit(path)
+            return
+        self._submit(path, out_path, build_thumbnail_strip, THUMB_INTERVAL_S, THUMB_HEIGHT, THUMB_MAX_FRAMES)
+
+    # ------------------------------------------------------------------
+    def _job_ready(self, path):
+        self.thumbnailsReady.emit(path)
+
+    @staticmethod
+    def _load(out_path):
+        with np.load(out_path) as data:
+            times_ms = data["times_ms"]
+            frames = data["frames"]
+        images = []
+        for frame in frames:
+            h, w, _ = frame.shape
+            buf = np.ascontiguousarray(frame)
+            # copy() detaches the QImage from the numpy buffer
+            images.append(QImage(buf.data, w, h, 3 * w, QImage.Format.Format_RGB888).copy())
+        return Filmstrip(times_ms, images)
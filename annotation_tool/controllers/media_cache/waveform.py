@@ -0,0 +1,98 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+from PyQt6.QtCore import pyqtSignal
+
+from .decoders import audio_backend
+from .jobs import build_audio_envelope
+from .service import CacheJobService
+
+ENVELOPE_BIN_MS = 50     # one level per 50 ms (~110k values for a 90 min match)
+ENVELOPE_RATE = 16000    # audio is downmixed to mono at this rate before the RMS
+ENVELOPE_FLOOR_DB = -60  # levels below this are drawn as silence
+MEMORY_CLIPS = 16
+_WORKERS = 2
+
+
+class AudioEnvelope:
+    """Loudness levels (0..1) of one clip, one per bin_ms."""
+
+    def __init__(self, bin_ms, levels):
+        self.bin_ms = int(bin_ms)
+        self.levels = levels
+
+    def __len__(self):
+        return len(self.levels)
+
+    def peaks(self, start_ms, ms_per_px, count):
+        """
+        Max level under each of `count` pixel columns, the first one starting
+        at start_ms. Columns outside the clip are 0.
+        """
+        n = len(self.levels)
+        if not n or count <= 0 or ms_per_px <= 0:
+            return np.zeros(max(0, count), dtype=np.float32)
+        raw = (start_ms + ms_per_px * np.arange(count + 1)) / self.bin_ms
+        edges = np.clip(raw.astype(np.int64), 0, n)
+        # Trailing 0: columns past the end read it; a column narrower than a bin reads its own bin
+        levels = np.append(self.levels, np.float32(0))
+        out = np.maximum.reduceat(levels, edges)[:-1]
+        out[raw[1:] <= 0] = 0.0  # columns before the start
+        return out
+
+
+class AudioEnvelopeService(CacheJobService):
+    """
+    Background audio envelope cache for the timeline.
+
+    request(path) decodes the clip's first audio track once in a worker process
+    (PyAV or ffmpeg), reduces it to one RMS level per ENVELOPE_BIN_MS, and
+    stores it under ~/.soccernet_workspace/cache/audio keyed by the file
+    fingerprint. envelope(path) returns the cached AudioEnvelope (or None);
+    envelopeReady(path) is emitted once it is built.
+    """
+    envelopeReady = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__("audio", _WORKERS, parent)
+        self.enabled = audio_backend() is not None
+        self._memory = OrderedDict()  # out_path -> AudioEnvelope
+
+    def cache_name(self, fingerprint):
+        return f"{fingerprint}_{ENVELOPE_BIN_MS}ms.npz"
+
+    def envelope(self, path):
+        """Cached envelope of `path` (memory first, then disk), or None."""
+        out_path = self._cache_path(path)
+        if out_path is None:
+            return None
+        env = self._memory.get(out_path)
+        if env is not None:
+            self._memory.move_to_end(out_path)
+            return env
+        if not os.path.exists(out_path):
+            return None
+        try:
+            with np.load(out_path) as data:
+                env = AudioEnvelope(int(data["bin_ms"]), data["levels"].astype(np.float32))
+        except (OSError, ValueError, KeyError):
+            return None
+        self._memory[out_path] = env
+        while len(self._memory) > MEMORY_CLIPS:
+            self._memory.popitem(last=False)
+        return env
+
+    def request(self, path):
+        """Build the envelope of `path` in the background unless cached or already queued."""
+        out_path = self._cache_path(path)
+        if not self._can_submit(out_path):
+            return
+        if out_path in self._memory or os.path.exists(out_path):
+            self.envelopeReady.emit(path)
+            return
+        self._submit(path, out_path, build_audio_envelope, ENVELOPE_BIN_MS, ENVELOPE_RATE, ENVELOPE_FLOOR_DB)
+
+    # ------------------------------------------------------------------
+    def _job_ready(self, path):
+        self.envelopeReady.emit(path)
@@ -1,17 +1,61 @@
-from PyQt6.QtCore import QUrl, QTimer, QObject
+from PyQt6.QtCore import QUrl, QTimer, QObject, pyqtSignal
 from PyQt6.QtMultimedia import QMediaPlayer
 from PyQt6.QtWidgets import QWidget
 
+from controllers.player_pool import PlayerPool, media_key
+from controllers.multiview_sync import MultiViewSync
+from controllers.playback_stats import PlaybackStats
+
+# [NEW] Clip prefetch defaults
+PREFETCH_DEPTH = 1          # clips pre-opened on each side of the selection
+PREFETCH_DELAY_MS = 400     # let the selected clip start before opening its neighbours
+
 class MediaController(QObject):
     """
     A unified controller for managing video playback logic across all modes.
     Now includes a 'Watchdog' mechanism to catch silent hardware decoder failures 
     (e.g., AV1 video fails, but Audio keeps playing causing a zombie black screen).
+
+    [NEW] Prefetch: after a clip starts, the next/previous visible clips (as given
+    by the neighbour provider) are opened in standby players of the PlayerPool.
+    Selecting one of them swaps its player into the preview instead of
+    reloading, and the clip left behind goes back to the pool.
+
+    [NEW] Multi-view: show_views() plays every view of an action in the
+    preview grid with pooled players, which are returned to the pool (still
+    open) when another clip is shown.
+    Both require a preview exposing set_player() / show_grid() (MediaPreviewWidget).
+    [NEW] The views share one clock (MultiViewSync): play, pause, seek and rate
+    changes apply to all of them, and their drift is corrected and reported.
+
+    [NEW] sourceChanged(path) is emitted when the main player gets a new clip
+    ("" once stopped), e.g. to build the timeline filmstrip.
+
+    [NEW] Playback proxies: set_source_resolver(fn) maps a clip to the file
+    actually played (a low-res proxy). Everything outside the player (signals,
+    prefetch keys, annotations) keeps using the original path.
+
+    [NEW] stats (PlaybackStats) records per-clip time to first frame, seek
+    latency, frame jitter and dropped frames of the main player, from the
+    frames reaching the video sink.
     """
-    def __init__(self, player: QMediaPlayer, video_widget: QWidget = None):
+    sourceChanged = pyqtSignal(str)
+
+    def __init__(self, player: QMediaPlayer, video_widget: QWidget = None, preview: QWidget = None):
         super().__init__()
         self.player = player
         self.video_widget = video_widget
+        self.preview = preview if hasattr(preview, "set_player") else None
+
+        # [NEW] Pool of opened players (prefetched clips, multi-view views)
+        self.pool = PlayerPool(self)
+        self.view_players = []
+        self.view_sync = MultiViewSync(self)
+        self.stats = PlaybackStats(self)
+        self._current_key = None
+        self._neighbour_provider = None
+        self._source_resolver = None
+        self.prefetch_depth = PREFETCH_DEPTH
         
         # 1. Initialize all member variables and timers FIRST
         self._frame_received = False
@@ -27,10 +71,15 @@ class MediaController(QObject):
         self.watchdog_timer.setSingleShot(True)
         self.watchdog_timer.setInterval(1500) # Check 1.5 seconds after play starts
         self.watchdog_timer.timeout.connect(self._check_for_black_screen)
+
+        # [NEW] Prefetch Timer
+        self.prefetch_timer = QTimer()
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self._prefetch_neighbours)
         
         # 3. Connect external player and video signals
-        self.player.errorOccurred.connect(self._handle_media_error)
-        self.player.mediaStatusChanged.connect(self._handle_media_status) # [NEW] Added status check
+        self._attach_player(self.player)
         
         if self.video_widget and hasattr(self.video_widget, 'videoSink'):
             sink = self.video_widget.videoSink()
@@ -38,9 +87,11 @@ class MediaController(QObject):
                 # Every time a pixel frame is actually rendered, this triggers
                 sink.videoFrameChanged.connect(self._on_frame_rendered)
 
-    def _on_frame_rendered(self, *args):
+    def _on_frame_rendered(self, frame=None):
         """Marks that the GPU successfully decoded and drew at least one frame."""
         self._frame_received = True
+        # [NEW] Telemetry (frames of the multi-view grid do not reach this sink)
+        self.stats.on_frame(frame, self.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState)
 
     def _trigger_error_dialog(self, error_details: str):
         """Stops playback immediately and blocks the UI with an error dialog."""
@@ -84,15 +135,26 @@ class MediaController(QObject):
             self._trigger_error_dialog(f"Player Error Code {error}: {error_string}")
 
     def load_and_play(self, file_path: str, auto_play: bool = True):
+        self.release_views()
+        play_path = self.playback_path(file_path)
+        if file_path and self.preview and play_path in self.pool:
+            # [NEW] Already opened in the background: swap it in instead of reloading
+            self._swap_in(self.pool.acquire(play_path), file_path, auto_play)
+            return
+
         self.stop() 
 
         if not file_path:
             return
 
-        self.player.setSource(QUrl.fromLocalFile(file_path))
+        self.stats.begin_clip(file_path, play_path)
+        self.player.setSource(QUrl.fromLocalFile(play_path))
+        self._current_key = media_key(file_path)
+        self.sourceChanged.emit(file_path)
 
         if auto_play:
             self.play_timer.start()
+        self._schedule_prefetch()
 
     def _execute_play(self):
         """Starts playback and launches the Watchdog."""
@@ -101,6 +163,9 @@ class MediaController(QObject):
         self.watchdog_timer.start()  # Unleash the watchdog
 
     def toggle_play_pause(self):
+        if self.view_players:
+            self._toggle_views()
+            return
         if self.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self.player.pause()
         else:
@@ -114,19 +179,158 @@ class MediaController(QObject):
             self.play_timer.stop()
         if self.watchdog_timer.isActive():
             self.watchdog_timer.stop()
+        self.prefetch_timer.stop()
+        self.release_views()
             
+        self.stats.end_clip()
         self.player.stop()
         self.player.setSource(QUrl())
+        if self._current_key is not None:
+            self._current_key = None
+            self.sourceChanged.emit("")
         
         if self.video_widget:
             self.video_widget.update()
             self.video_widget.repaint()
 
     def set_looping(self, enable: bool):
-        if enable:
-            self.player.setLoops(QMediaPlayer.Loops.Infinite)
-        else:
-            self.player.setLoops(QMediaPlayer.Loops.Once)
+        loops = QMediaPlayer.Loops.Infinite if enable else QMediaPlayer.Loops.Once
+        for player in [self.player] + self.view_players:
+            player.setLoops(loops)
 
     def set_position(self, position):
-        self.player.setPosition(position)
\ No newline at end of file
+        if self.view_players:
+            self.view_sync.seek(position)
+            return
+        self.stats.mark_seek()
+        self.player.setPosition(position)
+
+    def seek_relative(self, delta_ms: int):
+        """Move the playhead by delta_ms (clamped to the clip)."""
+        if self.view_players:
+            self.view_sync.seek_relative(delta_ms)
+            return
+        self.stats.mark_seek()
+        position = max(0, self.player.position() + int(delta_ms))
+        duration = self.player.duration()
+        self.player.setPosition(min(position, duration) if duration > 0 else position)
+
+    def set_playback_rate(self, rate: float):
+        """Playback speed of the clip, or of all views together."""
+        self.player.setPlaybackRate(rate)
+        self.view_sync.set_rate(rate)
+
+    # ------------------------------------------------------------------
+    # [NEW] Playback proxies
+    # ------------------------------------------------------------------
+    def set_source_resolver(self, resolver):
+        """resolver(path) -> file to play for path (e.g. its proxy); None plays files as given."""
+        self._source_resolver = resolver
+
+    def playback_path(self, file_path):
+        if not file_path or self._source_resolver is None:
+            return file_path
+        return self._source_resolver(file_path) or file_path
+
+    # ------------------------------------------------------------------
+    # [NEW] Clip prefetch
+    # ------------------------------------------------------------------
+    def set_neighbour_provider(self, provider):
+        """
+        provider(depth) -> list of media files to pre-open, nearest first
+        (usually the clips around the navigator selection).
+        """
+        self._neighbour_provider = provider
+
+    def set_prefetch(self, depth: int = None, memory_mb: int = None):
+        """Configure how many clips are pre-opened per side and the pool's memory budget (0 disables)."""
+        if depth is not None:
+            self.prefetch_depth = max(0, int(depth))
+        if memory_mb is not None:
+            self.pool.set_limits(memory_mb=memory_mb)
+
+    def release_standby(self):
+        """Close every pooled player (e.g. when the project is closed)."""
+        self.prefetch_timer.stop()
+        self.release_views()
+        self.pool.clear()
+
+    def _schedule_prefetch(self):
+        if self.preview and self._neighbour_provider and self.prefetch_depth and self.pool.memory_mb:
+            self.prefetch_timer.start()
+
+    def _prefetch_neighbours(self):
+        if not self._neighbour_provider or self._current_key is None or self.view_players:
+            return
+        paths = [p for p in self._neighbour_provider(self.prefetch_depth) if media_key(p) != self._current_key]
+        # Farthest first, so the nearest clips are the most recently used
+        for path in reversed(paths):
+            self.pool.preload(self.playback_path(path))
+
+    def _swap_in(self, player, file_path, auto_play):
+        if self.play_timer.isActive():
+            self.play_timer.stop()
+        if self.watchdog_timer.isActive():
+            self.watchdog_timer.stop()
+
+        self.stats.begin_clip(file_path, self.playback_path(file_path))
+        old = self.player
+        self._detach_player(old)
+        player.setLoops(old.loops())
+        player.setPlaybackRate(old.playbackRate())
+        self.preview.set_player(player)
+        self.player = player
+        self._attach_player(player)
+        self._current_key = media_key(file_path)
+        self.sourceChanged.emit(file_path)
+
+        # The clip we leave stays open as the neighbour on the other side
+        old.stop()
+        self.pool.release(old)
+
+        if self.video_widget:
+            self.video_widget.update()
+        if auto_play:
+            player.setPosition(0)
+            if player.mediaStatus() in (QMediaPlayer.MediaStatus.LoadedMedia, QMediaPlayer.MediaStatus.BufferedMedia):
+                self._execute_play()
+            else:
+                self.play_timer.start()
+        self._schedule_prefetch()
+
+    def _attach_player(self, player):
+        player.errorOccurred.connect(self._handle_media_error)
+        player.mediaStatusChanged.connect(self._handle_media_status) # [NEW] Added status check
+
+    def _detach_player(self, player):
+        player.errorOccurred.disconnect(self._handle_media_error)
+        player.mediaStatusChanged.disconnect(self._handle_media_status)
+
+    # ------------------------------------------------------------------
+    # [NEW] Multi-view playback (pooled players)
+    # ------------------------------------------------------------------
+    def show_views(self, paths, auto_play: bool = True):
+        """Play all views of an action side by side. The first view keeps the audio."""
+        if not self.preview or not paths:
+            return
+        self.stop()
+        self.view_players = [self.pool.acquire(self.playback_path(p)) for p in paths]
+        self.preview.show_grid(self.view_players)
+        for i, player in enumerate(self.view_players):
+            self.pool.set_muted(player, i > 0)
+            player.setLoops(self.player.loops())
+        # The first view (with sound) is the master clock
+        self.view_sync.start(self.view_players, auto_play)
+
+    def release_views(self):
+        """Leave the multi-view grid; its players go back to the pool, still open."""
+        if not self.view_players:
+            return
+        self.view_sync.stop()
+        players, self.view_players = self.view_players, []
+        self.preview.show_single()
+        for player in players:
+            self.pool.release(player)
+
+    def _toggle_views(self):
+        self.view_sync.toggle()
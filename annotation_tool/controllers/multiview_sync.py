@@ -0,0 +1,184 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtMultimedia import QMediaPlayer
+
+# Drift check period while the views play
+SYNC_INTERVAL_MS = 200
+# Below this the views count as aligned (about one frame at 25 fps)
+SOFT_DRIFT_MS = 45
+# Beyond this a follower is re-seeked instead of nudged
+HARD_DRIFT_MS = 250
+# Largest relative rate change used to catch up smoothly
+RATE_NUDGE = 0.05
+
+_READY = (
+    QMediaPlayer.MediaStatus.LoadedMedia,
+    QMediaPlayer.MediaStatus.BufferedMedia,
+    QMediaPlayer.MediaStatus.BufferingMedia,
+    QMediaPlayer.MediaStatus.EndOfMedia,
+)
+
+
+class MultiViewSync(QObject):
+    """
+    Shared-clock playback of the views of a multi-view action.
+
+    The first player (the one with sound) is the master clock. Play starts
+    only once every view is loaded. Seek, pause and rate changes go to all
+    views, and pausing snaps the followers onto the master's position so the
+    still frames line up. While playing, each follower's drift from the
+    master is measured every SYNC_INTERVAL_MS:
+    * under SOFT_DRIFT_MS nothing is done;
+    * up to HARD_DRIFT_MS the follower's rate is nudged (at most RATE_NUDGE);
+    * beyond that the follower is re-seeked.
+    Playback ends (followers paused, no more checks) when the master reaches
+    the end of its media.
+    driftMeasured(ms) reports the worst drift of each check, and -1 once the
+    views are released.
+    """
+    driftMeasured = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.players = []
+        self.rate = 1.0
+        self.max_drift_ms = 0    # worst drift of the last check
+        self.peak_drift_ms = 0   # worst drift since start()
+        self.hard_syncs = 0      # followers re-seeked since start()
+        self._want_play = False
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(SYNC_INTERVAL_MS)
+        self.timer.timeout.connect(self._correct_drift)
+
+    @property
+    def master(self):
+        return self.players[0] if self.players else None
+
+    def start(self, players, auto_play: bool = True, position: int = 0):
+        """Take over `players` (master first), aligned at `position`."""
+        self.stop()
+        self.players = list(players)
+        self.max_drift_ms = self.peak_drift_ms = self.hard_syncs = 0
+        for player in self.players:
+            player.mediaStatusChanged.connect(self._on_status)
+            player.setPlaybackRate(self.rate)
+            player.setPosition(position)
+        self._want_play = auto_play
+        self._start_when_ready()
+
+    def stop(self):
+        """Release the players (they are left as they are)."""
+        if not self.players:
+            return
+        self.timer.stop()
+        for player in self.players:
+            player.mediaStatusChanged.disconnect(self._on_status)
+            player.setPlaybackRate(self.rate)
+        self.players = []
+        self._want_play = False
+        self.driftMeasured.emit(-1)
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+    def is_playing(self):
+        return self._want_play
+
+    def play(self):
+        if not self.players:
+            return
+        if self.master.mediaStatus() == QMediaPlayer.MediaStatus.EndOfMedia:
+            self.seek(0)
+        self._want_play = True
+        self._start_when_ready()
+
+    def pause(self):
+        self._want_play = False
+        self.timer.stop()
+        for player in self.players:
+            player.pause()
+        # Paused views show the same instant
+        if self.players:
+            self._align_followers(self.master.position())
+
+    def toggle(self):
+        if self._want_play:
+            self.pause()
+        else:
+            self.play()
+
+    def seek(self, position: int):
+        for player in self.players:
+            player.setPlaybackRate(self.rate)
+            player.setPosition(self._clamped(player, position))
+
+    def seek_relative(self, delta_ms: int):
+        if self.players:
+            self.seek(max(0, self.master.position() + int(delta_ms)))
+
+    def set_rate(self, rate: float):
+        self.rate = rate
+        for player in self.players:
+            player.setPlaybackRate(rate)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _clamped(player, position):
+        duration = player.duration()
+        return min(position, duration) if duration > 0 else position
+
+    def _align_followers(self, position):
+        for player in self.players[1:]:
+            player.setPosition(self._clamped(player, position))
+
+    def _start_when_ready(self):
+        if not self._want_play or self.timer.isActive():
+            return
+        if not all(p.mediaStatus() in _READY for p in self.players):
+            return  # _on_status retries as the views finish loading
+        self._align_followers(self.master.position())
+        for player in self.players:
+            player.play()
+        self.timer.start()
+
+    def _on_status(self, status):
+        if status == QMediaPlayer.MediaStatus.EndOfMedia and self.master.mediaStatus() == status:
+            # [FIX] The master clock ran out: playback is over, stop correcting (and re-seeking) the followers
+            self._want_play = False
+            self.timer.stop()
+            for player in self.players[1:]:
+                player.pause()
+                player.setPlaybackRate(self.rate)
+            return
+        if status in _READY:
+            self._start_when_ready()
+
+    def _correct_drift(self):
+        master = self.master
+        if master is None or master.playbackState() != QMediaPlayer.PlaybackState.PlayingState:
+            return
+        clock = master.position()
+        worst = 0
+        for player in self.players[1:]:
+            target = self._clamped(player, clock)
+            if player.duration() > 0 and target >= player.duration():
+                continue  # shorter view already finished
+            if player.playbackState() != QMediaPlayer.PlaybackState.PlayingState:
+                player.setPosition(target)
+                player.play()
+                continue
+            drift = player.position() - target
+            worst = max(worst, abs(drift))
+            if abs(drift) > HARD_DRIFT_MS:
+                player.setPlaybackRate(self.rate)
+                player.setPosition(target)
+                self.hard_syncs += 1
+            elif abs(drift) > SOFT_DRIFT_MS:
+                # Ahead -> slower, behind -> faster; aims to close the gap in about a second
+                nudge = max(-RATE_NUDGE, min(RATE_NUDGE, -drift / 1000.0))
+                player.setPlaybackRate(self.rate * (1.0 + nudge))
+            elif player.playbackRate() != self.rate:
+                player.setPlaybackRate(self.rate)
+        self.max_drift_ms = worst
+        self.peak_drift_ms = max(self.peak_drift_ms, worst)
+        self.driftMeasured.emit(worst)
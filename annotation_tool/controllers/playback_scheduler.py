@@ -0,0 +1,89 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, Qt
+from PyQt6.QtGui import QGuiApplication
+
+# Used when the screen does not report its refresh rate
+DEFAULT_REFRESH_HZ = 60.0
+
+
+class _Subscriber:
+    __slots__ = ("callback", "interval_ms", "when", "last_ms", "last_time")
+
+    def __init__(self, callback, interval_ms, when):
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.when = when
+        self.last_ms = None
+        self.last_time = 0.0
+
+
+class PlaybackUiScheduler(QObject):
+    """
+    Coalesces the player's position updates for the playback UI.
+
+    on_position(ms) only records the latest position; a timer running at the
+    display refresh rate (and only while there is something new) hands it to
+    the subscribers. A subscriber is called only when the position changed
+    since its last call, only while its `when()` predicate holds (e.g. its
+    mode is active), and at most once per `interval_ms` if given (the last
+    position is always delivered eventually).
+
+    received / delivered count the incoming updates and the callbacks made.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._subscribers = []
+        self._position = None
+        self.received = 0
+        self.delivered = 0
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._flush)
+        self.set_refresh_rate(self._screen_refresh_rate())
+
+    @staticmethod
+    def _screen_refresh_rate():
+        screen = QGuiApplication.primaryScreen()
+        hz = screen.refreshRate() if screen is not None else 0.0
+        return hz if hz and hz > 1 else DEFAULT_REFRESH_HZ
+
+    def set_refresh_rate(self, hz: float):
+        self.timer.setInterval(max(1, round(1000.0 / hz)))
+
+    def subscribe(self, callback, interval_ms: int = 0, when=None):
+        """callback(ms) is called with the coalesced position (see class doc)."""
+        self._subscribers.append(_Subscriber(callback, interval_ms, when))
+
+    def on_position(self, ms: int):
+        self.received += 1
+        self._position = ms
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def refresh(self):
+        """Re-deliver the current position to every active subscriber (e.g. after a mode switch)."""
+        for sub in self._subscribers:
+            sub.last_ms = None
+        if self._position is not None:
+            self._flush()
+
+    def _flush(self):
+        ms = self._position
+        now = time.monotonic() * 1000.0
+        waiting = False
+        for sub in self._subscribers:
+            if sub.last_ms == ms or (sub.when is not None and not sub.when()):
+                continue
+            if sub.interval_ms and now - sub.last_time < sub.interval_ms:
+                waiting = True
+                continue
+            sub.last_ms = ms
+            sub.last_time = now
+            self.delivered += 1
+            sub.callback(ms)
+        # Idle until the next position update
+        if not waiting:
+            self.timer.stop()
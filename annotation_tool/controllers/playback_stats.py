@@ -0,0 +1,228 @@
+import json
+import os
+import platform
+import time
+from collections import deque
+from datetime import datetime
+
+from PyQt6.QtCore import QObject, pyqtSignal, QT_VERSION_STR
+
+from controllers.media_cache.cache import WORKSPACE_DIR
+
+# Structured log: one JSON object per played clip
+PLAYBACK_LOG = os.path.join(WORKSPACE_DIR, "logs", "playback.jsonl")
+LOG_MAX_BYTES = 2 * 1024 * 1024   # rotated to playback.jsonl.1 above this size
+HISTORY_CLIPS = 50                # finished clips kept for the stats panel
+INTERVAL_SAMPLES = 2000           # frame intervals kept per clip for percentiles
+SEEK_TIMEOUT_MS = 5000            # a seek without a frame within this time is not counted
+DROP_FACTOR = 1.5                 # a presentation gap above 1.5 frames counts as dropped frames
+UPDATE_INTERVAL_S = 1.0           # statsChanged rate while frames are arriving
+
+
+def _now_ms():
+    return time.perf_counter() * 1000.0
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def machine_info():
+    """Host description stored with every log record."""
+    return {
+        "os": f"{platform.system()} {platform.release()}",
+        "arch": platform.machine(),
+        "cpu": platform.processor() or "",
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+    }
+
+
+class ClipStats:
+    """Playback measurements of one clip, from its load until the next clip (or stop)."""
+
+    def __init__(self, path, play_path, info=None):
+        info = info or {}
+        self.path = path
+        self.proxy = bool(play_path) and play_path != path
+        self.codec = info.get("codec", "")
+        self.width = info.get("width", 0)
+        self.height = info.get("height", 0)
+        self.fps = info.get("fps")
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.load_ms = _now_ms()
+
+        self.ttff_ms = None
+        self.seek_ms = []
+        self.frames = 0
+        self.intervals = deque(maxlen=INTERVAL_SAMPLES)
+        self.dropped = 0
+        # Running sums of the wall-clock frame intervals (mean / jitter)
+        self._n = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._last_wall = None
+        self._last_pts = None
+        self._pending_seek = None
+
+    # --- Measurements -------------------------------------------------
+    def mark_seek(self):
+        self._pending_seek = _now_ms()
+        self._last_wall = None
+        self._last_pts = None
+
+    def on_frame(self, now, pts_us, playing):
+        """Record a rendered frame; True when it was the first one or ended a seek."""
+        self.frames += 1
+        notable = self.ttff_ms is None or self._pending_seek is not None
+        if self.ttff_ms is None:
+            self.ttff_ms = now - self.load_ms
+        if self._pending_seek is not None:
+            latency = now - self._pending_seek
+            if latency <= SEEK_TIMEOUT_MS:
+                self.seek_ms.append(latency)
+            self._pending_seek = None
+
+        if not playing:
+            # Paused frames (seeks) do not belong to the playback cadence
+            self._last_wall = None
+            self._last_pts = None
+            return notable
+        if self._last_wall is not None:
+            interval = now - self._last_wall
+            self.intervals.append(interval)
+            self._n += 1
+            self._sum += interval
+            self._sumsq += interval * interval
+        self._last_wall = now
+
+        if pts_us is not None and pts_us >= 0:
+            if self._last_pts is not None and self.fps:
+                step = pts_us - self._last_pts
+                frame_us = 1e6 / self.fps
+                # Backward steps are loops; their gap is not a drop
+                if step > DROP_FACTOR * frame_us:
+                    self.dropped += int(round(step / frame_us)) - 1
+            self._last_pts = pts_us
+        return notable
+
+    # --- Summary ------------------------------------------------------
+    def interval_mean(self):
+        return self._sum / self._n if self._n else None
+
+    def jitter(self):
+        """Standard deviation of the wall-clock frame intervals (ms)."""
+        if self._n < 2:
+            return None
+        mean = self._sum / self._n
+        return max(0.0, self._sumsq / self._n - mean * mean) ** 0.5
+
+    def to_dict(self):
+        def r(value):
+            return round(value, 1) if value is not None else None
+
+        return {
+            "started": self.started,
+            "path": self.path,
+            "proxy": self.proxy,
+            "codec": self.codec,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "ttff_ms": r(self.ttff_ms),
+            "seeks": len(self.seek_ms),
+            "seek_ms_median": r(_percentile(self.seek_ms, 0.5)),
+            "seek_ms_p95": r(_percentile(self.seek_ms, 0.95)),
+            "frames": self.frames,
+            "frame_interval_ms": r(self.interval_mean()),
+            "frame_interval_ms_p95": r(_percentile(self.intervals, 0.95)),
+            "jitter_ms": r(self.jitter()),
+            "dropped_frames": self.dropped if self.fps else None,
+        }
+
+
+class PlaybackStats(QObject):
+    """
+    Playback telemetry of the main player, fed by MediaController.
+
+    Per clip: time to first frame (load request -> first frame on the video
+    sink), seek latency (seek request -> next frame), frame-interval mean and
+    jitter while playing, and dropped frames (gaps in the frame presentation
+    times, given the probed fps). A clip's record is closed when the next clip
+    is loaded or playback stops; it is kept in `history` and appended to the
+    JSON-lines log PLAYBACK_LOG together with machine_info().
+
+    statsChanged() is emitted when a clip starts or ends, on its first frame,
+    after each seek, and at most every UPDATE_INTERVAL_S while playing.
+    """
+    statsChanged = pyqtSignal()
+
+    def __init__(self, parent=None, log_path: str = PLAYBACK_LOG):
+        super().__init__(parent)
+        self.log_path = log_path
+        self.machine = machine_info()
+        self.current = None
+        self.history = deque(maxlen=HISTORY_CLIPS)
+        self._info_provider = None
+        self._last_update = 0.0
+
+    def set_info_provider(self, provider):
+        """provider(path) -> probed media info dict (codec, size, fps) or None."""
+        self._info_provider = provider
+
+    # ------------------------------------------------------------------
+    def begin_clip(self, path, play_path=None):
+        self.end_clip()
+        if not path:
+            return
+        info = self._info_provider(path) if self._info_provider else None
+        self.current = ClipStats(path, play_path, info)
+        self.statsChanged.emit()
+
+    def end_clip(self):
+        clip, self.current = self.current, None
+        if clip is None:
+            return
+        self.history.appendleft(clip)
+        self._write(clip)
+        self.statsChanged.emit()
+
+    def mark_seek(self):
+        if self.current is not None:
+            self.current.mark_seek()
+
+    def on_frame(self, frame, playing: bool):
+        clip = self.current
+        if clip is None:
+            return
+        now = _now_ms()
+        pts = frame.startTime() if frame is not None and hasattr(frame, "startTime") else None
+        if clip.on_frame(now, pts, playing) or now - self._last_update >= UPDATE_INTERVAL_S * 1000:
+            self._last_update = now
+            self.statsChanged.emit()
+
+    def clips(self):
+        """Current clip first, then the finished ones (newest first)."""
+        return ([self.current] if self.current is not None else []) + list(self.history)
+
+    def clear(self):
+        self.history.clear()
+        self.statsChanged.emit()
+
+    # ------------------------------------------------------------------
+    def _write(self, clip):
+        if not self.log_path:
+            return
+        record = {"event": "clip", **clip.to_dict(), "machine": self.machine}
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > LOG_MAX_BYTES:
+                os.replace(self.log_path, self.log_path + ".1")
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"[PlaybackStats] Could not write {self.log_path}: {e}")
@@ -0,0 +1,171 @@
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QUrl
+from PyQt6.QtMultimedia import QMediaPlayer, QMediaMetaData, QVideoSink, QAudioOutput
+
+# Idle players kept open (prefetched neighbours, views of recent multi-view actions)
+POOL_MAX_IDLE = 8
+# Estimated decoder memory allowed for idle players
+POOL_MEMORY_MB = 256
+# Rough decoder footprint: a few YUV 4:2:0 surfaces at the clip resolution
+_DECODER_SURFACES = 8
+_DEFAULT_RESOLUTION = (1920, 1080)
+
+
+def media_key(path):
+    """Normalized file path used to match pooled players."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+class PlayerPool(QObject):
+    """
+    Bounded LRU of QMediaPlayer / QVideoSink pairs owned by MediaController.
+
+    A released player keeps its source, paused on its private sink and with
+    its own (muted) QAudioOutput, so asking for the same file again reuses
+    the opened demuxer and decoder. Prefetched clips and the views of a
+    multi-view action are both served from here. Idle players beyond
+    max_idle or the memory budget are closed, least recently used first.
+    """
+
+    def __init__(self, parent=None, max_idle: int = POOL_MAX_IDLE, memory_mb: int = POOL_MEMORY_MB):
+        super().__init__(parent)
+        self.max_idle = max_idle
+        self.memory_mb = memory_mb
+        self._idle = OrderedDict()  # media_key -> player, least recently used first
+
+    def __contains__(self, path):
+        return media_key(path) in self._idle
+
+    def __len__(self):
+        return len(self._idle)
+
+    def set_limits(self, max_idle: int = None, memory_mb: int = None):
+        if max_idle is not None:
+            self.max_idle = max(0, int(max_idle))
+        if memory_mb is not None:
+            self.memory_mb = max(0, int(memory_mb))
+        self._evict()
+
+    # ------------------------------------------------------------------
+    def acquire(self, path):
+        """
+        A player with `path` as source, taken out of the pool.
+        Reuses the idle player already holding that file when there is one;
+        otherwise the least recently used idle player is recycled, or a new
+        one is created while the pool is below max_idle.
+        """
+        player = self._idle.pop(media_key(path), None)
+        if player is not None:
+            player.mediaStatusChanged.disconnect(self._on_idle_status)
+            if player.mediaStatus() != QMediaPlayer.MediaStatus.InvalidMedia:
+                return player
+            self.discard(player)
+
+        if self._idle and len(self._idle) >= self.max_idle:
+            _, player = self._idle.popitem(last=False)
+            player.mediaStatusChanged.disconnect(self._on_idle_status)
+        else:
+            player = self._new_player()
+        player.setSource(QUrl.fromLocalFile(path))
+        return player
+
+    def preload(self, path):
+        """Open `path` in an idle player (no-op when already pooled); marks it recently used."""
+        if not self.max_idle or not self.memory_mb:
+            return
+        key = media_key(path)
+        if key in self._idle:
+            self._idle.move_to_end(key)
+            return
+        self.release(self.acquire(path))
+
+    def release(self, player):
+        """Return a player: it is parked (paused, private sink, muted) and kept with its source."""
+        source = player.source()
+        if source.isEmpty() or not source.isLocalFile():
+            self.discard(player)
+            return
+        key = media_key(source.toLocalFile())
+        previous = self._idle.pop(key, None)
+        if previous is not None and previous is not player:
+            self.discard(previous)
+
+        player.setParent(self)
+        self._park(player)
+        if player.mediaStatus() in (QMediaPlayer.MediaStatus.LoadedMedia, QMediaPlayer.MediaStatus.BufferedMedia,
+                                    QMediaPlayer.MediaStatus.EndOfMedia):
+            player.pause()
+        player.mediaStatusChanged.connect(self._on_idle_status)
+        self._idle[key] = player
+        self._evict()
+
+    def set_muted(self, player, muted: bool):
+        """Mute/unmute a checked-out player's own audio output."""
+        audio = player.findChild(QAudioOutput)
+        if audio is not None:
+            audio.setMuted(muted)
+            player.setAudioOutput(audio)
+
+    def discard(self, player):
+        player.stop()
+        player.setSource(QUrl())
+        player.deleteLater()
+
+    def clear(self):
+        while self._idle:
+            _, player = self._idle.popitem()
+            self.discard(player)
+
+    # ------------------------------------------------------------------
+    def _new_player(self):
+        player = QMediaPlayer(self)
+        QVideoSink(player)
+        audio = QAudioOutput(player)
+        audio.setVolume(1.0)
+        return player
+
+    def _park(self, player):
+        sink = player.findChild(QVideoSink) or QVideoSink(player)
+        audio = player.findChild(QAudioOutput)
+        if audio is None:
+            audio = QAudioOutput(player)
+            audio.setVolume(1.0)
+        audio.setMuted(True)
+        player.setVideoOutput(sink)
+        player.setAudioOutput(audio)
+
+    def _on_idle_status(self, status):
+        player = self.sender()
+        if player is None:
+            return
+        if status == QMediaPlayer.MediaStatus.LoadedMedia:
+            # Paused at 0: the decoder is started and the first frame is ready
+            player.pause()
+            self._evict()
+        elif status == QMediaPlayer.MediaStatus.InvalidMedia:
+            # Left to the regular load path, which reports the error
+            for key, idle in list(self._idle.items()):
+                if idle is player:
+                    self.discard(self._idle.pop(key))
+
+    @staticmethod
+    def _estimated_bytes(player):
+        size = player.metaData().value(QMediaMetaData.Key.Resolution)
+        if size is not None and not size.isEmpty():
+            w, h = size.width(), size.height()
+        else:
+            w, h = _DEFAULT_RESOLUTION
+        return w * h * 3 // 2 * _DECODER_SURFACES
+
+    def _evict(self):
+        while len(self._idle) > self.max_idle:
+            _, player = self._idle.popitem(last=False)
+            self.discard(player)
+        budget = self.memory_mb * 1024 * 1024
+        used = sum(self._estimated_bytes(p) for p in self._idle.values())
+        while self._idle and used > budget:
+            _, player = self._idle.popitem(last=False)
+            used -= self._estimated_bytes(player)
+            self.discard(player)
@@ -70,23 +70,32 @@ class AppRouter:
         if json_type == "classification":
             if self.class_fm.load_project(data, file_path):
                 self.main.show_classification_view()
+                self._restore_history(file_path)
             
         elif json_type == "localization":
             if self.loc_fm.load_project(data, file_path):
                 self.main.show_localization_view()
+                self._restore_history(file_path)
 
         elif json_type == "description":
             # [FIXED] Check return value to ensure validation passed before switching view
             if self.desc_fm.load_project(data, file_path):
                 self.main.show_description_view()
+                self._restore_history(file_path)
             
         elif json_type == "dense_description":
             if self.dense_fm.load_project(data, file_path):
                 self.main.show_dense_description_view()
+                self._restore_history(file_path)
             
         else:
             QMessageBox.critical(self.main, "Error", "Unknown JSON format or Task Type.")
 
+    def _restore_history(self, file_path):
+        """Reattach the undo/redo history saved next to the project JSON, if any."""
+        if self.main.model.load_history(file_path):
+            self.main.update_save_export_button_state()
+
     def close_project(self):
         """Handles closing the current project."""
         if not self.main.check_and_close_current_project():
@@ -1,10 +1,11 @@
 import os
 
 from PyQt6.QtCore import Qt, QTimer, QModelIndex, QUrl
-from PyQt6.QtGui import QColor, QIcon, QKeySequence, QShortcut, QStandardItem
+from PyQt6.QtGui import QColor, QIcon, QKeySequence, QShortcut
 from PyQt6.QtMultimedia import QMediaPlayer
 from PyQt6.QtWidgets import (
-    QMainWindow, QMessageBox, QSizePolicy, QStackedWidget, QDockWidget, QTabWidget, QWidget, QVBoxLayout
+    QMainWindow, QMessageBox, QSizePolicy, QStackedWidget, QDockWidget, QTabWidget, QWidget, QVBoxLayout,
+    QHeaderView, QLabel
 )
 
 from controllers.classification.class_annotation_manager import AnnotationManager
@@ -17,6 +18,11 @@ from controllers.description.desc_annotation_manager import DescAnnotationManage
 from controllers.dense_description.dense_manager import DenseManager
 from controllers.history_manager import HistoryManager
 from controllers.media_controller import MediaController
+from controllers.playback_scheduler import PlaybackUiScheduler
+from controllers.media_cache.thumbnails import ThumbnailService
+from controllers.media_cache.proxies import ProxyService
+from controllers.media_cache.probe import ProbeService
+from controllers.media_cache.waveform import AudioEnvelopeService
 
 from controllers.router import AppRouter
 from models import AppStateModel
@@ -24,14 +30,15 @@ from models import AppStateModel
 # [NEW] Direct UI Imports
 from ui.common.welcome_widget import WelcomeWidget
 from ui.common.project_navigator_panel import ProjectNavigatorPanel
+from ui.common.dialogs import PlaybackStatsDialog
 from ui.common.media_player import MediaCenterPanel
 from ui.classification.event_editor import ClassificationAnnotationPanel
 from ui.localization.event_editor import LocalizationAnnotationPanel
 from ui.description.event_editor import DescriptionAnnotationPanel
 from ui.dense_description.event_editor import DenseAnnotationPanel
 
-from models.project_tree import ProjectTreeModel
-from utils import create_checkmark_icon, natural_sort_key, resource_path
+from models.project_tree import ProjectTreeModel, ClipFilterProxyModel, ClipStatus
+from utils import create_checkmark_icon, resource_path
 
 class VideoAnnotationWindow(QMainWindow):
     """
@@ -52,6 +59,9 @@ class VideoAnnotationWindow(QMainWindow):
         # --- Model wiring ---
         self.model = AppStateModel()
         self.tree_model = ProjectTreeModel(self)
+        # [NEW] The navigator shows the tree through a status filter proxy
+        self.tree_proxy = ClipFilterProxyModel(self)
+        self.tree_proxy.setSourceModel(self.tree_model)
 
         # --- 1. Center Area: Stacked Widget (Welcome vs Media Player) ---
         self.center_stack = QStackedWidget()
@@ -71,7 +81,7 @@ class VideoAnnotationWindow(QMainWindow):
             clear_text="Clear All",
             enable_context_menu=True
         )
-        self.left_panel.tree.setModel(self.tree_model)
+        self.left_panel.tree.setModel(self.tree_proxy)
         
         self.data_dock = QDockWidget("Project Navigator", self)
         self.data_dock.setObjectName("DataNavigatorDock")
@@ -106,7 +116,29 @@ class VideoAnnotationWindow(QMainWindow):
         
         # [CENTRALIZED] Create the ONE and ONLY Media Controller here
         preview_panel = self.center_panel.media_preview
-        self.media_controller = MediaController(preview_panel.player, preview_panel.video_widget)
+        self.media_controller = MediaController(preview_panel.player, preview_panel.video_widget, preview_panel)
+        self.media_controller.set_neighbour_provider(self._neighbour_media_paths)
+        # [NEW] Playback telemetry: codec / size / fps of each clip come from the probe
+        self.media_controller.stats.set_info_provider(self.model.media_info_for)
+        self.playback_stats_dialog = None
+        # [NEW] Position updates reach the playback UI at most once per display frame
+        self.playback_ui = PlaybackUiScheduler(self)
+        preview_panel.positionChanged.connect(self.playback_ui.on_position)
+
+        # [NEW] Background filmstrip cache for the timeline
+        self.thumbnail_service = ThumbnailService(self)
+        # [NEW] Background audio envelope cache for the timeline
+        self.envelope_service = AudioEnvelopeService(self)
+        # [NEW] Optional low-res playback proxies (annotations keep the original path)
+        self.proxy_service = ProxyService(self)
+        self.media_controller.set_source_resolver(self.proxy_service.proxy_path)
+        self._current_media_path = ""
+        # [NEW] Parallel probe of the project's media (duration, fps, resolution, codec)
+        self.probe_service = ProbeService(self)
+        self.probe_timer = QTimer(self)
+        self.probe_timer.setSingleShot(True)
+        self.probe_timer.timeout.connect(self._probe_project_media)
+        self._probe_owner = {}  # media path -> tree path of the clip showing it
         
         self.annot_manager = AnnotationManager(self)
         self.nav_manager = NavigationManager(self, self.media_controller)
@@ -125,6 +157,14 @@ class VideoAnnotationWindow(QMainWindow):
         bright_blue = QColor("#00BFFF")
         self.done_icon = create_checkmark_icon(bright_blue)
         self.empty_icon = QIcon()
+        # [NEW] The tree computes its icons on demand instead of storing one per item
+        self.tree_model.set_status_icons(self.done_icon, self.empty_icon)
+        self.tree_model.set_status_provider(self._clip_status)
+        self.tree_model.set_info_provider(self.model.media_info_for)
+        self.tree_model.modelReset.connect(self.probe_timer.start)
+        self.tree_model.rowsInserted.connect(
+            lambda parent, first, last: parent.isValid() or self._probe_project_media(first, last)
+        )
 
         # --- Setup ---
         self.connect_signals()
@@ -173,6 +213,123 @@ class VideoAnnotationWindow(QMainWindow):
         """ Stops the single unified player and clears sources. """
         self.media_controller.stop()
 
+    def _on_media_source_changed(self, path: str):
+        """[NEW] Show the cached filmstrip and audio envelope of the new clip (or build them), and queue proxies."""
+        self._current_media_path = path
+        self._request_proxies()
+        timeline = self.center_panel.timeline
+        info = self.model.media_info_for(path) if path else None
+        if info and info.get("duration_ms"):
+            # Known before the player has even opened the file
+            timeline.set_duration(info["duration_ms"])
+        timeline.set_frame_rate(info.get("fps") if info else None)
+
+        strip = self.thumbnail_service.filmstrip(path) if path else None
+        if strip:
+            timeline.set_filmstrip(strip)
+        else:
+            timeline.clear_filmstrip()
+            if path: self.thumbnail_service.request(path)
+
+        envelope = self.envelope_service.envelope(path) if path else None
+        if envelope:
+            timeline.set_audio_envelope(envelope)
+        else:
+            timeline.clear_audio_envelope()
+            if path: self.envelope_service.request(path)
+
+    def _on_thumbnails_ready(self, path: str):
+        if path == self._current_media_path:
+            self.center_panel.timeline.set_filmstrip(self.thumbnail_service.filmstrip(path))
+
+    def _on_envelope_ready(self, path: str):
+        if path == self._current_media_path:
+            self.center_panel.timeline.set_audio_envelope(self.envelope_service.envelope(path))
+
+    def _request_proxies(self):
+        """[NEW] Transcode the current clip first, then its neighbours in the navigator."""
+        if not self.proxy_service.enabled or not self._current_media_path:
+            return
+        self.proxy_service.request(self._current_media_path)
+        for path in self._neighbour_media_paths(max(1, self.media_controller.prefetch_depth)):
+            self.proxy_service.request(path)
+
+    def _on_proxy_ready(self, path: str):
+        if path == self._current_media_path:
+            self.show_temp_msg("Proxy", "Low-res proxy ready; it is used the next time this clip is opened.", 3000)
+
+    def _toggle_proxies(self, enabled: bool):
+        self.proxy_service.set_enabled(enabled)
+        self._request_proxies()
+
+    def _probe_project_media(self, first: int = 0, last: int = None):
+        """[NEW] Queue the media files of the clips (all by default) that have not been probed yet."""
+        owner = self._probe_owner
+        todo = []
+        if last is None: last = self.tree_model.rowCount() - 1
+        for row in range(first, last + 1):
+            entry = self.tree_model.entry_at(row)
+            for src in entry.get("source_files") or [entry.get("path")]:
+                media_path = self.model.media_path(src)
+                if media_path and media_path not in self.model.media_info:
+                    owner[media_path] = entry.get("path")
+                    todo.append(media_path)
+        self.probe_service.probe(todo)
+
+    def _on_media_probed(self, results: dict):
+        found = {path: info for path, info in results.items() if info}
+        self.model.media_info.update(found)
+        self.tree_model.refresh_info([self._probe_owner.get(path) for path in found])
+        info = found.get(self._current_media_path)
+        if info and info.get("duration_ms") and self.center_panel.timeline.duration <= 0:
+            self.center_panel.timeline.set_duration(info["duration_ms"])
+        if info:
+            self.center_panel.timeline.set_frame_rate(info.get("fps"))
+
+    def _show_playback_stats(self):
+        """[NEW] Non-modal panel of per-clip playback telemetry."""
+        if self.playback_stats_dialog is None:
+            self.playback_stats_dialog = PlaybackStatsDialog(self.media_controller.stats, self)
+        self.playback_stats_dialog.show()
+        self.playback_stats_dialog.raise_()
+
+    def _on_view_drift(self, drift_ms: int):
+        """[NEW] Show the measured multi-view drift (-1: no views playing)."""
+        if drift_ms < 0:
+            self.sync_label.setVisible(False)
+            return
+        sync = self.media_controller.view_sync
+        self.sync_label.setText(
+            f"Views sync: {drift_ms} ms (peak {sync.peak_drift_ms} ms, {sync.hard_syncs} resyncs)"
+        )
+        self.sync_label.setVisible(True)
+
+    def _frame_step_ms(self) -> int:
+        """[NEW] One frame of the current clip (probed fps, 25 fps until known)."""
+        return max(1, round(1000 / self.model.media_fps(self._current_media_path)))
+
+    def _toggle_info_columns(self, visible: bool):
+        self.tree_model.set_info_columns_visible(visible)
+        tree = self.left_panel.tree
+        tree.setHeaderHidden(not visible)
+        if visible:
+            header = tree.header()
+            header.setStretchLastSection(False)
+            header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+            for col in range(1, self.tree_model.columnCount()):
+                header.setSectionResizeMode(col, QHeaderView.ResizeMode.Interactive)
+                header.resizeSection(col, 72)
+
+    def _shutdown_media_services(self):
+        """Cancel queued background media jobs and stop the inference server (on exit)."""
+        # Log the clip still playing
+        self.media_controller.stats.end_clip()
+        self.thumbnail_service.shutdown()
+        self.envelope_service.shutdown()
+        self.proxy_service.shutdown()
+        self.probe_service.shutdown()
+        self.inference_manager.shutdown_server()
+
     def reset_all_managers(self):
         """ Clears all mode-specific UIs and returns to Welcome screen. """
         self.annot_manager.reset_ui()
@@ -180,9 +337,12 @@ class VideoAnnotationWindow(QMainWindow):
         self.desc_nav_manager.reset_ui()
         self.dense_manager.reset_ui()
         
+        # Close players pre-opened for the old project
+        self.media_controller.release_standby()
+
         # Also clear the tree model
+        self.left_panel.clear_search()
         self.tree_model.clear()
-        self.model.action_item_map.clear()
         self.main_window_title = "Action Classifier"
         self.setWindowTitle("Action Classifier")
 
@@ -221,12 +381,17 @@ class VideoAnnotationWindow(QMainWindow):
         left_panel.request_remove_item.connect(self._on_remove_item_requested)
         left_panel.tree.selectionModel().currentChanged.connect(self._on_tree_selection_changed)
         left_panel.filter_combo.currentIndexChanged.connect(self._dispatch_filter_change)
+        self.right_tabs.currentChanged.connect(self._on_mode_changed)
+        # [NEW] Navigator search; re-applied when the clip list changes
+        left_panel.searchChanged.connect(self._on_search_changed)
+        self.tree_model.modelReset.connect(self._reapply_search)
+        self.tree_model.rowsInserted.connect(self._reapply_search)
 
         # --- Center panel (Unified Playback) ---
         center_panel.playback.playPauseRequested.connect(self._dispatch_play_pause)
         center_panel.playback.seekRelativeRequested.connect(self._dispatch_seek)
         center_panel.playback.stopRequested.connect(self.stop_all_players)
-        center_panel.playback.playbackRateRequested.connect(center_panel.media_preview.set_playback_rate)
+        center_panel.playback.playbackRateRequested.connect(self.media_controller.set_playback_rate)
         
         # Navigation signals from the unified bar
         center_panel.playback.nextPrevClipRequested.connect(self._dispatch_next_prev_clip)
@@ -234,8 +399,20 @@ class VideoAnnotationWindow(QMainWindow):
         
         # --- Timeline ---
         center_panel.media_preview.durationChanged.connect(center_panel.timeline.set_duration)
-        center_panel.media_preview.positionChanged.connect(center_panel.timeline.set_position)
-        center_panel.timeline.seekRequested.connect(center_panel.media_preview.set_position)
+        self.playback_ui.subscribe(center_panel.timeline.set_position)
+        # [CHANGED] Through the controller, so a multi-view seek moves every view
+        center_panel.timeline.seekRequested.connect(self.media_controller.set_position)
+        self.media_controller.sourceChanged.connect(self._on_media_source_changed)
+        self.thumbnail_service.thumbnailsReady.connect(self._on_thumbnails_ready)
+        self.envelope_service.envelopeReady.connect(self._on_envelope_ready)
+        self.proxy_service.proxyReady.connect(self._on_proxy_ready)
+        self.probe_service.probed.connect(self._on_media_probed)
+
+        # [NEW] Multi-view sync report (status bar, shown while views play together)
+        self.sync_label = QLabel()
+        self.sync_label.setVisible(False)
+        self.statusBar().addPermanentWidget(self.sync_label)
+        self.media_controller.view_sync.driftMeasured.connect(self._on_view_drift)
         
         # --- Classification Editor ---
         self.classification_panel.annotation_saved.connect(lambda data: self.annot_manager.save_manual_annotation())
@@ -297,6 +474,28 @@ class VideoAnnotationWindow(QMainWindow):
         self.action_redo.triggered.connect(self.history_manager.perform_redo)
         edit_menu.addAction(self.action_redo)
 
+        # [NEW] Playback options
+        playback_menu = menu_bar.addMenu("&Playback")
+        self.action_use_proxies = QAction("Use Low-Res Proxies", self)
+        self.action_use_proxies.setCheckable(True)
+        self.action_use_proxies.setEnabled(self.proxy_service.available)
+        self.action_use_proxies.setToolTip(
+            "Transcode clips in the background to small H.264 proxies for smooth playback and scrubbing"
+            if self.proxy_service.available else "Requires ffmpeg on the PATH"
+        )
+        self.action_use_proxies.toggled.connect(self._toggle_proxies)
+        playback_menu.addAction(self.action_use_proxies)
+        playback_menu.addSeparator()
+        self.action_playback_stats = QAction("Playback Stats...", self)
+        self.action_playback_stats.triggered.connect(self._show_playback_stats)
+        playback_menu.addAction(self.action_playback_stats)
+
+        view_menu = menu_bar.addMenu("&View")
+        self.action_info_columns = QAction("Show Media Info Columns", self)
+        self.action_info_columns.setCheckable(True)
+        self.action_info_columns.toggled.connect(self._toggle_info_columns)
+        view_menu.addAction(self.action_info_columns)
+
     def _setup_shortcuts(self) -> None:
         """Register common keyboard shortcuts."""
         QShortcut(QKeySequence("Ctrl+O"), self).activated.connect(self._safe_import_annotations)
@@ -315,8 +514,9 @@ class VideoAnnotationWindow(QMainWindow):
         QShortcut(QKeySequence.StandardKey.Redo, self).activated.connect(self.history_manager.perform_redo)
 
         QShortcut(QKeySequence(Qt.Key.Key_Space), self).activated.connect(self._dispatch_play_pause)
-        QShortcut(QKeySequence(Qt.Key.Key_Left), self).activated.connect(lambda: self._dispatch_seek(-40))
-        QShortcut(QKeySequence(Qt.Key.Key_Right), self).activated.connect(lambda: self._dispatch_seek(40))
+        # [CHANGED] One frame at the clip's probed frame rate
+        QShortcut(QKeySequence(Qt.Key.Key_Left), self).activated.connect(lambda: self._dispatch_seek(-self._frame_step_ms()))
+        QShortcut(QKeySequence(Qt.Key.Key_Right), self).activated.connect(lambda: self._dispatch_seek(self._frame_step_ms()))
         QShortcut(QKeySequence("Ctrl+Left"), self).activated.connect(lambda: self._dispatch_seek(-1000))
         QShortcut(QKeySequence("Ctrl+Right"), self).activated.connect(lambda: self._dispatch_seek(1000))
         QShortcut(QKeySequence("Ctrl+Shift+Left"), self).activated.connect(lambda: self._dispatch_seek(-5000))
@@ -356,7 +556,30 @@ class VideoAnnotationWindow(QMainWindow):
         elif self._is_dense_mode(): self.dense_manager._apply_clip_filter(index)
         else: self.nav_manager.apply_action_filter()
 
+    def _on_search_changed(self, text):
+        self.tree_proxy.set_search_hits(self.tree_model.search(text))
+
+    def _reapply_search(self, parent=None, *args):
+        # Children exposed by fetchMore() do not change the top-level matches
+        if parent is not None and parent.isValid(): return
+        text = self.left_panel.search_text()
+        if text.strip(): self._on_search_changed(text)
+
+    def _on_mode_changed(self, index):
+        # [NEW] Clip status is mode-specific: drop the cached values and re-apply the filter
+        self.tree_model.refresh_all()
+        self._dispatch_filter_change(self.left_panel.filter_combo.currentIndex())
+        # Mode-specific time displays were skipped while their mode was hidden
+        self.playback_ui.refresh()
+        # [NEW] Head lanes belong to the localization mode
+        if self._is_loc_mode():
+            self.loc_manager._on_tab_switched(self.loc_manager.right_panel.tabs.currentIndex())
+        else:
+            self.center_panel.timeline.clear_lanes()
+
     def _on_tree_selection_changed(self, current: QModelIndex, previous: QModelIndex):
+        # Keep the selected clip visible under the active filter while it is being edited
+        self.tree_proxy.set_pinned_path(self.get_current_action_path())
         if current.isValid():
             # [CENTRALIZED] Enable all editors now that a clip is selected
             self.classification_panel.manual_box.setEnabled(True)
@@ -366,8 +589,13 @@ class VideoAnnotationWindow(QMainWindow):
             
             # 1. Handle Branch (Parent) vs Leaf (Video)
             # If the user clicks a parent (e.g. Action Name), auto-select its first child (the video)
-            if self.tree_model.rowCount(current) > 0:
-                first_child = self.tree_model.index(0, 0, current)
+            if self.tree_proxy.hasChildren(current):
+                self.tree_proxy.fetchMore(current)
+                # [NEW] Classification plays every view of a multi-view action together
+                if self._is_cls_mode():
+                    self.nav_manager.on_action_selected(current)
+                    return
+                first_child = self.tree_proxy.index(0, 0, current)
                 if first_child.isValid():
                     # This will trigger selectionChanged again for the child
                     self.left_panel.tree.setCurrentIndex(first_child)
@@ -502,6 +730,7 @@ class VideoAnnotationWindow(QMainWindow):
     def closeEvent(self, event) -> None:
         if not self.model.is_data_dirty or not self.model.json_loaded:
             self.stop_all_players()
+            self._shutdown_media_services()
             event.accept()
             return
         msg = QMessageBox(self)
@@ -514,9 +743,11 @@ class VideoAnnotationWindow(QMainWindow):
         if msg.clickedButton() == save_btn:
             self._dispatch_save()
             self.stop_all_players()
+            self._shutdown_media_services()
             event.accept()
         elif msg.clickedButton() == discard_btn:
             self.stop_all_players()
+            self._shutdown_media_services()
             event.accept()
         else: event.ignore()
 
@@ -543,39 +774,62 @@ class VideoAnnotationWindow(QMainWindow):
     def sync_batch_inference_dropdowns(self) -> None:
         ed = self.classification_panel
         if not hasattr(ed, 'update_action_list'): return
-        sorted_list = sorted(self.model.action_item_data, key=lambda d: natural_sort_key(d.get("name", "")))
+        sorted_list = self.model.sorted_action_items()
         action_names = [d["name"] for d in sorted_list]
         ed.update_action_list(action_names)
 
     def populate_action_tree(self) -> None:
-        self.tree_model.clear()
-        self.model.action_item_map.clear()
-        sorted_list = sorted(self.model.action_item_data, key=lambda d: natural_sort_key(d.get("name", "")))
+        sorted_list = self.model.sorted_action_items()
         self.sync_batch_inference_dropdowns()
-        for data in sorted_list:
-            item = self.tree_model.add_entry(name=data["name"], path=data["path"], source_files=data.get("source_files"))
-            self.model.action_item_map[data["path"]] = item
-            self.update_action_item_status(data["path"])
+        self.tree_model.set_entries(sorted_list)
         self._dispatch_filter_change(self.left_panel.filter_combo.currentIndex())
         tree = self.left_panel.tree
-        if self.tree_model.rowCount() > 0:
-            first_index = self.tree_model.index(0, 0)
+        if self.tree_proxy.rowCount() > 0:
+            first_index = self.tree_proxy.index(0, 0)
             if first_index.isValid(): tree.setCurrentIndex(first_index)
 
+    def _neighbour_media_paths(self, depth: int) -> list:
+        """[NEW] Media files of the visible clips around the selection, nearest first (for prefetch)."""
+        action_path = self.get_current_action_path()
+        idx = self.tree_proxy.index_for_path(action_path) if action_path else QModelIndex()
+        if not idx.isValid(): return []
+        row, row_count = idx.row(), self.tree_proxy.rowCount()
+        paths = []
+        for dist in range(1, depth + 1):
+            for r in (row + dist, row - dist):
+                if not 0 <= r < row_count: continue
+                entry = self.tree_model.entry_for_path(self.tree_proxy.index(r, 0).data(ProjectTreeModel.FilePathRole))
+                media_path = self._entry_media_path(entry) if entry else None
+                if media_path: paths.append(media_path)
+        return paths
+
+    def _entry_media_path(self, entry):
+        """The file the mode's navigation manager plays for a clip entry."""
+        path = entry.get("path")
+        source_files = entry.get("source_files") or []
+        # Description mode plays the first view of a multi-view item
+        if self._is_desc_mode() and len(source_files) > 1: path = source_files[0]
+        cwd = self.model.current_working_directory
+        if path and cwd and not os.path.isabs(path): path = os.path.normpath(os.path.join(cwd, path))
+        return path if path and os.path.isfile(path) else None
+
     def update_action_item_status(self, action_path: str) -> None:
-        item: QStandardItem = self.model.action_item_map.get(action_path)
-        if not item: return
-        is_done = False # Mode-specific logic here...
-        if self._is_loc_mode(): is_done = action_path in self.model.localization_events
-        elif self._is_desc_mode(): 
-            # Check captions
-            for d in self.model.action_item_data:
-                if d.get("path") == action_path:
-                    if any(c.get("text", "").strip() for c in d.get("captions", [])): is_done = True
-                    break
-        elif self._is_dense_mode(): is_done = action_path in self.model.dense_description_events
-        else: is_done = action_path in self.model.manual_annotations
-        item.setIcon(self.done_icon if is_done else self.empty_icon)
+        self.tree_model.refresh_path(action_path)
+
+    def _clip_status(self, entry) -> ClipStatus:
+        """[NEW] Status provider for the tree model (mode-specific). Cached by the model."""
+        action_path = entry.get("path")
+        status = ClipStatus.NONE
+        if self._is_loc_mode(): has_hand = bool(self.model.localization_events.get(action_path))
+        elif self._is_desc_mode():
+            has_hand = any((c.get("text") or "").strip() for c in entry.get("captions", []))
+        elif self._is_dense_mode(): has_hand = bool(self.model.dense_description_events.get(action_path))
+        else:
+            has_hand = bool(self.model.manual_annotations.get(action_path))
+            if self.model.smart_annotations.get(action_path, {}).get("_confirmed", False):
+                status |= ClipStatus.SMART
+        if has_hand: status |= ClipStatus.HAND
+        return status
 
     def setup_dynamic_ui(self) -> None:
         ed = self.classification_panel
@@ -599,12 +853,11 @@ class VideoAnnotationWindow(QMainWindow):
             return
         self.update_action_item_status(action_path)
         self._dispatch_filter_change(self.left_panel.filter_combo.currentIndex())
-        item = self.model.action_item_map.get(action_path)
-        if item:
-            idx = item.index()
+        idx = self.tree_proxy.index_for_path(action_path)
+        if idx.isValid():
             self.left_panel.tree.setCurrentIndex(idx)
         if self._is_loc_mode(): self.loc_manager._display_events_for_item(action_path)
-        elif self._is_desc_mode(): self.desc_nav_manager.on_item_selected(item.index(), None)
+        elif self._is_desc_mode(): self.desc_nav_manager.on_item_selected(idx, None)
         elif self._is_dense_mode(): self.dense_manager._display_events_for_item(action_path)
         else: self.annot_manager.display_manual_annotation(action_path)
         self.update_save_export_button_state()
\ No newline at end of file
@@ -1,2 +1,4 @@
-from .app_state import AppStateModel, CmdType
-from .project_tree import ProjectTreeModel
\ No newline at end of file
+from .app_state import AppStateModel, CmdType, DEFAULT_FPS
+from .action_index import ActionItemList, action_base_id
+from .event_index import EventTimeIndex, HeadEventIndex
+from .project_tree import ProjectTreeModel, ClipFilterProxyModel, ClipStatus
\ No newline at end of file
@@ -0,0 +1,191 @@
+import re
+from bisect import bisect_left, insort
+
+from utils import natural_sort_key
+
+
+_VIEW_SUFFIX = re.compile(r"_view\d+")
+# Pending additions above this size are merged with a full sort
+_BULK_MIN = 64
+
+
+def action_base_id(name):
+    """Action id shared by all views of a multi-view clip ("12_view0" -> "12")."""
+    return _VIEW_SUFFIX.sub("", name) if isinstance(name, str) else name
+
+
+class ActionItemList(list):
+    """
+    List of clip entries (AppStateModel.action_item_data) that keeps its
+    natural-sort order and its base-id -> views grouping up to date.
+
+    Controllers keep using it as a plain list (append / remove / reassign).
+    The sort key and base id of each entry are computed once when it is
+    added, so sorted_items() and base_ids() cost no regex or sort per call.
+    Ties keep insertion order, like sorted() over the list would.
+    """
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self._reindex()
+
+    # --- Cached views -------------------------------------------------
+    def sorted_items(self):
+        """Entries in natural order of their name (a new list)."""
+        self._flush()
+        return list(self._sorted)
+
+    def base_ids(self):
+        """Base ids of the actions, in natural order of their first view."""
+        self._flush()
+        return [base for _, base in self._group_order]
+
+    def views(self, base_id):
+        """Entries sharing base_id, in natural order (a new list)."""
+        self._flush()
+        group = self._groups.get(base_id)
+        return list(group[1]) if group else []
+
+    # --- list mutators ------------------------------------------------
+    def append(self, item):
+        super().append(item)
+        self._add(item)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def remove(self, item):
+        self.pop(self.index(item))
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._discard(item)
+        return item
+
+    def clear(self):
+        super().clear()
+        self._reindex()
+
+    def remove_path(self, path):
+        """Remove every entry whose 'path' is path (no re-sort)."""
+        for i in range(len(self) - 1, -1, -1):
+            if list.__getitem__(self, i).get("path") == path:
+                self.pop(i)
+
+    # Positional edits are rare: re-index from scratch
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._reindex()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._reindex()
+
+    def reverse(self):
+        super().reverse()
+        self._reindex()
+
+    # ------------------------------------------------------------------
+    def _reindex(self):
+        self._seq = 0
+        self._meta = {}          # id(entry) -> (rank, base_id), rank = (sort key, seq)
+        self._pending = []       # entries added since the last flush
+        self._ranks = []         # sorted ranks, parallel to _sorted
+        self._sorted = []
+        self._groups = {}        # base_id -> ([ranks], [entries])
+        self._group_order = []   # sorted (rank of first view, base_id)
+        for item in list.__iter__(self):
+            self._add(item)
+
+    def _add(self, item):
+        if id(item) in self._meta:
+            return
+        name = item.get("name", "")
+        self._meta[id(item)] = ((natural_sort_key(name), self._seq), action_base_id(name))
+        self._seq += 1
+        self._pending.append(item)
+
+    def _flush(self):
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+        # A project load appends every clip: one sort beats n insertions
+        if len(pending) > _BULK_MIN and len(pending) * 4 > len(self._sorted):
+            self._rebuild()
+            return
+        for item in pending:
+            self._insert(item)
+
+    def _rebuild(self):
+        meta = self._meta
+        entries = list(list.__iter__(self))
+        ranks = [meta[id(item)][0] for item in entries]
+        order = sorted(range(len(entries)), key=ranks.__getitem__)
+        self._ranks = [ranks[i] for i in order]
+        self._sorted = [entries[i] for i in order]
+        groups = self._groups = {}
+        for i in order:
+            item = entries[i]
+            base = meta[id(item)][1]
+            group = groups.get(base)
+            if group is None:
+                group = groups[base] = ([], [])
+            group[0].append(ranks[i])
+            group[1].append(item)
+        # Dicts keep insertion order, i.e. the order of each action's first view
+        self._group_order = [(group_ranks[0], base) for base, (group_ranks, _) in groups.items()]
+
+    def _insert(self, item):
+        rank, base = self._meta[id(item)]
+        pos = bisect_left(self._ranks, rank)
+        self._ranks.insert(pos, rank)
+        self._sorted.insert(pos, item)
+
+        ranks, items = self._groups.setdefault(base, ([], []))
+        pos = bisect_left(ranks, rank)
+        if pos == 0:
+            if ranks:
+                self._drop_group_head(ranks[0], base)
+            insort(self._group_order, (rank, base))
+        ranks.insert(pos, rank)
+        items.insert(pos, item)
+
+    def _discard(self, item):
+        meta = self._meta.pop(id(item), None)
+        if meta is None:
+            return
+        if self._pending and any(p is item for p in self._pending):
+            self._pending = [p for p in self._pending if p is not item]
+            return
+        rank, base = meta
+        pos = bisect_left(self._ranks, rank)
+        del self._ranks[pos]
+        del self._sorted[pos]
+
+        ranks, items = self._groups[base]
+        pos = bisect_left(ranks, rank)
+        del ranks[pos]
+        del items[pos]
+        if pos == 0:
+            self._drop_group_head(rank, base)
+            if ranks:
+                insort(self._group_order, (ranks[0], base))
+            else:
+                del self._groups[base]
+
+    def _drop_group_head(self, rank, base):
+        del self._group_order[bisect_left(self._group_order, (rank, base))]
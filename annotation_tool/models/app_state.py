@@ -2,6 +2,15 @@ import os
 import copy
 from enum import Enum, auto
 
+from .action_index import ActionItemList
+from .history_store import (
+    HistoryStore, PagedStack, json_fingerprint, sidecar_path, write_history
+)
+
+
+# Frame rate assumed for clips that have not been probed (or cannot be)
+DEFAULT_FPS = 25.0
+
 
 class CmdType(Enum):
     """Command types recorded in the undo/redo history."""
@@ -82,18 +91,27 @@ class AppStateModel:
 
         # --- Common clip list ---
         # Each item: { "name": "...", "path": "...", "source_files": [...] }
-        # This is the shared source of truth for the Project Tree
+        # This is the shared source of truth for the Project Tree.
+        # [NEW] Assigning a plain list wraps it in an ActionItemList, which keeps
+        # the natural-sort order and the multi-view groups cached.
         self.action_item_data = []
-        self.action_item_map = {}      # path -> QStandardItem (populated by UI layer)
         self.action_path_to_name = {}  # path -> name
 
         # --- Dense Description data ---
         # Format: { video_path: [ { "position_ms": ..., "lang": "en", "text": "..." }, ... ] }
         self.dense_description_events = {}
 
+        # --- [NEW] Probed media facts ---
+        # { abs media path: {"duration_ms", "fps", "width", "height", "codec", "keyframe_interval"} }
+        # Filled by the ProbeService; kept across project resets (facts about files, not annotations).
+        self.media_info = {}
+
         # --- Undo/redo stacks ---
-        self.undo_stack = []
-        self.redo_stack = []
+        # PagedStack behaves like a list; older entries may still be on disk
+        self.undo_stack = PagedStack()
+        self.redo_stack = PagedStack()
+        # [NEW] (path, head) -> value of the latest UI_CHANGE still applied (see last_ui_value)
+        self.ui_values = {}
 
     def reset(self, full_reset: bool = False):
         """Reset runtime state. If full_reset is True, also clears schema and project metadata."""
@@ -113,12 +131,12 @@ class AppStateModel:
         self.imported_action_metadata = {}
 
         self.action_item_data = []
-        self.action_item_map = {}
         self.action_path_to_name = {}
         self.dense_description_events = {}
 
-        self.undo_stack = []
-        self.redo_stack = []
+        self.undo_stack = PagedStack()
+        self.redo_stack = PagedStack()
+        self.ui_values = {}
 
         if full_reset:
             self.label_definitions = {}
@@ -126,12 +144,107 @@ class AppStateModel:
             self.current_task_name = "Untitled Task"
             self.project_description = ""
 
+    @property
+    def action_item_data(self):
+        return self._action_item_data
+
+    @action_item_data.setter
+    def action_item_data(self, items):
+        self._action_item_data = items if isinstance(items, ActionItemList) else ActionItemList(items)
+
+    def sorted_action_items(self):
+        """Clip entries in natural order of their name (cached, no re-sort)."""
+        return self._action_item_data.sorted_items()
+
+    def action_base_ids(self):
+        """Base ids of the (multi-view) actions, in natural order (cached)."""
+        return self._action_item_data.base_ids()
+
+    def action_views(self, base_id):
+        """Clip entries of one action ("<id>_view<n>" entries share a base id)."""
+        return self._action_item_data.views(base_id)
+
+    def media_path(self, path):
+        """Absolute file path of a clip path (relative paths are resolved against the project folder)."""
+        if not path:
+            return path
+        if not os.path.isabs(path) and self.current_working_directory:
+            path = os.path.join(self.current_working_directory, path)
+        return os.path.normpath(path)
+
+    def media_info_for(self, path):
+        """Probe result of a clip, or None while unknown."""
+        return self.media_info.get(self.media_path(path)) if path else None
+
+    def media_fps(self, path, default: float = DEFAULT_FPS):
+        """Frame rate of a clip (probed), falling back to `default`."""
+        info = self.media_info_for(path)
+        fps = info.get("fps") if info else None
+        return fps if fps else default
+
+    def clip_fps(self, entry: dict):
+        """Frame rate to save for a clip entry: probed, else the one loaded with the project, else None."""
+        return self.media_fps(entry.get("path"), entry.get("fps") or None)
+
     def push_undo(self, cmd_type: CmdType, **kwargs):
         """Push a command onto the undo stack and clear the redo stack."""
         command = {"type": cmd_type, **kwargs}
         self.undo_stack.append(command)
         self.redo_stack.clear()
         self.is_data_dirty = True
+        if cmd_type == CmdType.UI_CHANGE:
+            self.ui_values[(kwargs['path'], kwargs['head'])] = kwargs['new_val']
+
+    def last_ui_value(self, path, head):
+        """
+        [NEW] Value a label group of `path` was last set to through the history
+        (pushed, undone or redone UI_CHANGE), else its saved hand annotation.
+        O(1): the undo stack, which may be paged out to disk, is never scanned.
+        """
+        key = (path, head)
+        if key in self.ui_values:
+            return self.ui_values[key]
+        return self.manual_annotations.get(path, {}).get(head)
+
+    # ------------------------------------------------------------
+    # Persistent history (sidecar next to the project JSON)
+    # ------------------------------------------------------------
+    def save_history(self, json_path):
+        """
+        Write the undo/redo stacks to '<json_path>.history'.
+        Must be called right after the JSON itself was written, since the
+        sidecar is stamped with the JSON's size and mtime.
+        Returns True on success; history is best-effort and never blocks a save.
+        """
+        try:
+            write_history(
+                sidecar_path(json_path), self.undo_stack, self.redo_stack,
+                json_fingerprint(json_path)
+            )
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Warning: Could not save undo history: {e}")
+            return False
+
+    def load_history(self, json_path):
+        """
+        Attach the sidecar history of a freshly loaded project.
+        Only the footer is read here; commands are decoded when undo reaches them.
+        A sidecar whose fingerprint does not match the JSON (edited elsewhere) is ignored.
+        """
+        store = HistoryStore.open(sidecar_path(json_path))
+        if store is None:
+            return False
+        try:
+            if store.fingerprint != json_fingerprint(json_path):
+                return False
+        except OSError:
+            return False
+
+        self.undo_stack = PagedStack(store, store.undo_offsets)
+        self.redo_stack = PagedStack(store, store.redo_offsets)
+        self.ui_values = {}
+        return True
 
     # ------------------------------------------------------------
     # Validation: Classification (Action Classification)
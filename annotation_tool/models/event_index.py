@@ -0,0 +1,104 @@
+from bisect import bisect_left
+
+import numpy as np
+
+
+class EventTimeIndex:
+    """
+    Sorted position index over one clip's event list (dicts with 'position_ms'),
+    e.g. AppStateModel.dense_description_events[path].
+
+    The list itself is not copied or reordered: the index keeps the events'
+    positions in sorted order with their list index, so nearest() is a bisect.
+    The owner must rebuild() or invalidate() it after every edit of the list,
+    including undo/redo. As a safety net, nearest() rebuilds when the list
+    object or its length changed, or when one of the two candidates it looks
+    at is no longer the indexed event at the indexed position. An event moved
+    into range from elsewhere without a rebuild is not detected.
+    """
+
+    def __init__(self, events=None):
+        self.rebuild(events if events is not None else [])
+
+    def rebuild(self, events):
+        self._events = events
+        self._length = len(events)
+        order = sorted(range(len(events)), key=lambda i: events[i].get('position_ms', 0))
+        self._positions = [events[i].get('position_ms', 0) for i in order]
+        self._items = [events[i] for i in order]
+        self._order = order
+
+    def invalidate(self):
+        """Mark the index stale; the next nearest() rebuilds it."""
+        self._events = None
+
+    def nearest(self, events, time_ms, tolerance_ms):
+        """
+        (list index, event) of the event of `events` closest to time_ms, within
+        tolerance_ms, or (-1, None). Ties go to the earlier position.
+        """
+        if events is not self._events or len(events) != self._length:
+            self.rebuild(events)
+        pos = bisect_left(self._positions, time_ms)
+        if not self._candidates_valid(events, pos):
+            # An event was replaced or moved without a rebuild
+            self.rebuild(events)
+            pos = bisect_left(self._positions, time_ms)
+        hit = self._lookup(pos, time_ms, tolerance_ms)
+        if hit < 0:
+            return -1, None
+        i = self._order[hit]
+        return i, events[i]
+
+    def _candidates_valid(self, events, pos):
+        for j in (pos - 1, pos):
+            if 0 <= j < len(self._positions):
+                event = events[self._order[j]]
+                if event is not self._items[j] or event.get('position_ms', 0) != self._positions[j]:
+                    return False
+        return True
+
+    def _lookup(self, pos, time_ms, tolerance_ms):
+        positions = self._positions
+        best, best_gap = -1, tolerance_ms + 1
+        # Only the neighbours on each side of the insertion point can be nearest
+        for j in (pos - 1, pos):
+            if 0 <= j < len(positions):
+                gap = abs(positions[j] - time_ms)
+                if gap < best_gap:
+                    best, best_gap = j, gap
+        return best
+
+
+class HeadEventIndex:
+    """
+    Read-only store of one clip's localization events (dicts with 'head' and
+    'position_ms'), e.g. AppStateModel.localization_events[path], split by head.
+
+    Each head keeps its positions as a sorted numpy array, so a time-range
+    query is two searchsorted() calls and returns a view, whatever the number
+    of events. Built once per display of the clip; edits build a new index.
+    """
+
+    def __init__(self, events=None):
+        groups = {}
+        for e in events or []:
+            groups.setdefault(e.get('head', ''), []).append(e.get('position_ms', 0))
+        self._positions = {head: np.sort(np.asarray(ms, dtype=np.int64)) for head, ms in groups.items()}
+
+    def heads(self):
+        """Heads that have at least one event, in first-seen order."""
+        return list(self._positions)
+
+    def positions(self, head):
+        """Sorted positions (ms) of all events of `head`."""
+        return self._positions.get(head, np.empty(0, dtype=np.int64))
+
+    def range(self, head, start_ms, end_ms):
+        """Sorted positions of `head` within [start_ms, end_ms]."""
+        ms = self.positions(head)
+        return ms[ms.searchsorted(start_ms, side="left"):ms.searchsorted(end_ms, side="right")]
+
+    def count(self, head, start_ms, end_ms):
+        ms = self.positions(head)
+        return int(ms.searchsorted(end_ms, side="right") - ms.searchsorted(start_ms, side="left"))
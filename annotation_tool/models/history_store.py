@@ -0,0 +1,217 @@
+import os
+import json
+import zlib
+import struct
+from array import array
+from enum import Enum
+
+
+# Sidecar layout (little endian):
+#   MAGIC
+#   record*  -> <I payload_len> + zlib(JSON command)
+#   footer   -> <Q json_size> <q json_mtime_ns> <Q n_undo> <Q n_redo>
+#               + n_undo * <Q offset> + n_redo * <Q offset>
+#   tail     -> <Q footer_len> + MAGIC
+# Only the footer is read when a project is opened; records are decoded on demand.
+MAGIC = b"OSLHIST1"
+SIDECAR_SUFFIX = ".history"
+PAGE_SIZE = 256
+
+_REC = struct.Struct("<I")
+_HEAD = struct.Struct("<QqQQ")
+_TAIL = struct.Struct("<Q8s")
+
+
+def sidecar_path(json_path):
+    """Location of the history sidecar for a project JSON."""
+    return json_path + SIDECAR_SUFFIX
+
+
+def json_fingerprint(json_path):
+    """(size, mtime_ns) of the project JSON, used to detect stale sidecars."""
+    st = os.stat(json_path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _json_default(obj):
+    # Commands may carry numpy scalars (confidences) or tuples/sets
+    if isinstance(obj, Enum):
+        return obj.name
+    if hasattr(obj, "item"):
+        return obj.item()
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def encode_command(cmd):
+    payload = dict(cmd)
+    payload["type"] = cmd["type"].name
+    raw = json.dumps(payload, separators=(",", ":"), default=_json_default)
+    return zlib.compress(raw.encode("utf-8"))
+
+
+def decode_command(blob):
+    from .app_state import CmdType
+
+    cmd = json.loads(zlib.decompress(blob).decode("utf-8"))
+    cmd["type"] = CmdType[cmd["type"]]
+    return cmd
+
+
+class HistoryStore:
+    """
+    Read-only handle on one history sidecar.
+    Holds only the record offsets; files are opened per read so the
+    sidecar can be replaced atomically while a store still points at it.
+    """
+
+    def __init__(self, path, undo_offsets, redo_offsets, fingerprint):
+        self.path = path
+        self.undo_offsets = undo_offsets
+        self.redo_offsets = redo_offsets
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def open(cls, path):
+        """Parse the footer of a sidecar. Returns None if missing or corrupt."""
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                f.seek(-_TAIL.size, os.SEEK_END)
+                footer_len, magic = _TAIL.unpack(f.read(_TAIL.size))
+                if magic != MAGIC:
+                    return None
+                f.seek(-(_TAIL.size + footer_len), os.SEEK_END)
+                footer = f.read(footer_len)
+        except (OSError, struct.error, ValueError):
+            return None
+
+        if len(footer) < _HEAD.size:
+            return None
+        size, mtime_ns, n_undo, n_redo = _HEAD.unpack_from(footer)
+        offsets = array("Q")
+        offsets.frombytes(footer[_HEAD.size:])
+        if len(offsets) != n_undo + n_redo:
+            return None
+        return cls(path, offsets[:n_undo], offsets[n_undo:], (size, mtime_ns))
+
+    def read_raw(self, offsets):
+        """Return the compressed payloads at the given offsets, in order."""
+        blobs = []
+        with open(self.path, "rb") as f:
+            for off in offsets:
+                f.seek(off)
+                (length,) = _REC.unpack(f.read(_REC.size))
+                blobs.append(f.read(length))
+        return blobs
+
+    def read(self, offsets):
+        return [decode_command(b) for b in self.read_raw(offsets)]
+
+
+class PagedStack:
+    """
+    List-like LIFO used for the undo/redo stacks.
+    The bottom of the stack may still live in a HistoryStore; those entries
+    are decoded in pages of PAGE_SIZE only when pop() reaches them.
+    """
+
+    def __init__(self, store=None, offsets=None, page_size=PAGE_SIZE):
+        self._store = store
+        self._disk = array("Q", offsets or [])
+        self._mem = []
+        self.page_size = page_size
+
+    def __len__(self):
+        return len(self._disk) + len(self._mem)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def append(self, cmd):
+        self._mem.append(cmd)
+
+    def pop(self):
+        if not self._mem:
+            self._page_in()
+        return self._mem.pop()
+
+    def peek(self):
+        """Top entry without removing it (pages it in if needed)."""
+        if not self._mem:
+            self._page_in()
+        return self._mem[-1]
+
+    def clear(self):
+        self._store = None
+        self._disk = array("Q")
+        self._mem = []
+
+    def __iter__(self):
+        """Oldest to newest. Disk entries are decoded but not retained."""
+        for start in range(0, len(self._disk), self.page_size):
+            yield from self._store.read(self._disk[start:start + self.page_size])
+        yield from list(self._mem)
+
+    def __reversed__(self):
+        """Newest to oldest. Disk entries are decoded but not retained."""
+        yield from reversed(list(self._mem))
+        end = len(self._disk)
+        while end > 0:
+            start = max(0, end - self.page_size)
+            yield from reversed(self._store.read(self._disk[start:end]))
+            end = start
+
+    @property
+    def in_memory(self):
+        return len(self._mem)
+
+    def _page_in(self):
+        if not self._disk:
+            raise IndexError("pop from empty stack")
+        start = max(0, len(self._disk) - self.page_size)
+        self._mem[:0] = self._store.read(self._disk[start:])
+        del self._disk[start:]
+
+    def _records(self):
+        """Yield compressed payloads oldest first (disk entries are copied raw)."""
+        for start in range(0, len(self._disk), self.page_size):
+            yield from self._store.read_raw(self._disk[start:start + self.page_size])
+        for cmd in self._mem:
+            yield encode_command(cmd)
+
+    def _rebind(self, store, offsets):
+        # After a save, the entries still on disk now live in the new sidecar
+        self._store = store
+        self._disk = offsets[:len(self._disk)]
+
+
+def write_history(path, undo_stack, redo_stack, fingerprint):
+    """
+    Atomically write both stacks to a sidecar and rebind them to it.
+    Entries that were never paged in are copied without being decoded.
+    """
+    tmp_path = path + ".tmp"
+    offsets = {}
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        for name, stack in (("undo", undo_stack), ("redo", redo_stack)):
+            offs = array("Q")
+            for blob in stack._records():
+                offs.append(f.tell())
+                f.write(_REC.pack(len(blob)))
+                f.write(blob)
+            offsets[name] = offs
+
+        footer = _HEAD.pack(fingerprint[0], fingerprint[1], len(offsets["undo"]), len(offsets["redo"]))
+        footer += offsets["undo"].tobytes() + offsets["redo"].tobytes()
+        f.write(footer)
+        f.write(_TAIL.pack(len(footer), MAGIC))
+    os.replace(tmp_path, path)
+
+    store = HistoryStore(path, offsets["undo"], offsets["redo"], tuple(fingerprint))
+    undo_stack._rebind(store, offsets["undo"])
+    redo_stack._rebind(store, offsets["redo"])
+    return store
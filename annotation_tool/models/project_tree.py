@@ -1,40 +1,485 @@
-from PyQt6.QtGui import QStandardItemModel, QStandardItem
-from PyQt6.QtCore import Qt
+import os
+from enum import IntFlag
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, QSortFilterProxyModel
 
-class ProjectTreeModel(QStandardItemModel):
+from .search_index import ClipSearchIndex
+
+
+class ClipStatus(IntFlag):
+    """Per-clip annotation state, as reported by the mode's status provider."""
+    NONE = 0
+    HAND = 1    # manual annotation / events / caption present (drives the done icon)
+    SMART = 2   # confirmed smart annotation (Classification)
+
+
+class ProjectTreeModel(QAbstractItemModel):
     """
     A standalone Model component compliant with Qt's Model/View architecture.
     It manages the hierarchical data for clips and sequences.
+
+    [NEW] Virtual model: rows are the entry dicts of AppStateModel.action_item_data
+    (no per-row QStandardItem). Multi-view children are exposed lazily through
+    fetchMore(), and the done/empty icon is computed on demand through roles.
+
+    [NEW] Optional media info columns (INFO_COLUMNS) and a tooltip on the clip
+    name, read on demand from the info provider (probed duration, fps, ...).
     """
-    
+
     # Define custom role for storing file paths
     FilePathRole = Qt.ItemDataRole.UserRole
+    # [NEW] ClipStatus of the clip (mode-specific, see set_status_provider)
+    StatusRole = Qt.ItemDataRole.UserRole + 1
+
+    # [NEW] Extra columns shown by set_info_columns_visible(True)
+    INFO_COLUMNS = ("Duration", "FPS", "Resolution", "Codec")
+
+    # QTreeView queries flags()/hasChildren() for every row on reset, keep them cheap
+    _ITEM_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []        # entry dicts, in display order
+        self._paths = []       # row -> path (hot path for the filter proxy)
+        self._row_of = {}      # path -> row
+        self._uid_of = {}      # path -> stable id used as internalId of its children
+        self._path_of_uid = {}
+        self._next_uid = 1
+        self._fetched = {}     # path -> number of children exposed so far
+        self._status = {}      # path -> cached ClipStatus, dropped by refresh_path()
+        self._status_provider = None
+        # [NEW] Navigator search; built on the first query, then kept in sync
+        self._search_index = ClipSearchIndex()
+        self._search_ready = False
+        self._done_icon = None
+        self._empty_icon = None
+        self._info_provider = None
+        self._show_info = False
+
+    # ---------------------------------------------------------------------
+    # Configuration
+    # ---------------------------------------------------------------------
+    def set_status_provider(self, provider):
+        """
+        provider(entry) -> ClipStatus. Results are cached per path until
+        refresh_path()/refresh_all() is called for that clip.
+        """
+        self._status_provider = provider
+        self._status = {}
+
+    def set_info_provider(self, provider):
+        """provider(path) -> media info dict (see AppStateModel.media_info_for) or None."""
+        self._info_provider = provider
+
+    def set_info_columns_visible(self, visible: bool):
+        visible = bool(visible)
+        if visible == self._show_info:
+            return
+        last = len(self.INFO_COLUMNS)
+        if visible:
+            self.beginInsertColumns(QModelIndex(), 1, last)
+            self._show_info = True
+            self.endInsertColumns()
+        else:
+            self.beginRemoveColumns(QModelIndex(), 1, last)
+            self._show_info = False
+            self.endRemoveColumns()
+
+    def info_columns_visible(self) -> bool:
+        return self._show_info
+
+    def set_status_icons(self, done_icon, empty_icon):
+        self._done_icon = done_icon
+        self._empty_icon = empty_icon
+
+    # ---------------------------------------------------------------------
+    # Population
+    # ---------------------------------------------------------------------
+    def set_entries(self, entries):
+        """Replace all rows with the given entry dicts (kept by reference)."""
+        self.beginResetModel()
+        self._rows = list(entries)
+        # Updated in place: the filter proxy keeps a reference to this list
+        self._paths[:] = [e.get("path") for e in self._rows]
+        self._row_of = {}
+        self._uid_of = {}
+        self._path_of_uid = {}
+        self._fetched = {}
+        self._status = {}
+        self._search_index.clear()
+        self._search_ready = False
+        for row, entry in enumerate(self._rows):
+            self._register(entry, row)
+        self.endResetModel()
+
+    def clear(self):
+        self.set_entries([])
+
+    def append_entry(self, entry) -> QModelIndex:
+        """
+        Appends one entry dict (usually the one just added to action_item_data).
+        Returns the QModelIndex of the new row.
+        """
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(entry)
+        self._paths.append(entry.get("path"))
+        self._register(entry, row)
+        if self._search_ready:
+            self._search_index.add(entry.get("path"), self._search_terms(entry))
+        self.endInsertRows()
+        return self.index(row, 0)
+
+    def remove_path(self, path) -> bool:
+        row = self._row_of.get(path)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self._paths[row]
+        del self._row_of[path]
+        self._path_of_uid.pop(self._uid_of.pop(path), None)
+        self._fetched.pop(path, None)
+        self._status.pop(path, None)
+        self._search_index.remove(path)
+        for r in range(row, len(self._paths)):
+            self._row_of[self._paths[r]] = r
+        self.endRemoveRows()
+        return True
+
+    def _register(self, entry, row):
+        path = entry.get("path")
+        self._row_of[path] = row
+        uid = self._next_uid
+        self._next_uid += 1
+        self._uid_of[path] = uid
+        self._path_of_uid[uid] = path
+
+    # ---------------------------------------------------------------------
+    # Lookups
+    # ---------------------------------------------------------------------
+    def index_for_path(self, path) -> QModelIndex:
+        row = self._row_of.get(path)
+        if row is None:
+            return QModelIndex()
+        return self.index(row, 0)
+
+    def path_at(self, row):
+        return self._paths[row]
+
+    @property
+    def paths(self):
+        """Paths in row order (live list, do not modify)."""
+        return self._paths
+
+    def entry_at(self, row):
+        return self._rows[row]
+
+    def entry_for_path(self, path):
+        row = self._row_of.get(path)
+        return None if row is None else self._rows[row]
+
+    def status_at(self, row) -> int:
+        """ClipStatus bits of a top-level row (kept as a plain int for fast filtering)."""
+        entry = self._rows[row]
+        path = entry.get("path")
+        status = self._status.get(path)
+        if status is None:
+            status = int(self._status_provider(entry)) if self._status_provider else 0
+            self._status[path] = status
+        return status
+
+    def status_for_path(self, path) -> int:
+        row = self._row_of.get(path)
+        return 0 if row is None else self.status_at(row)
+
+    def search(self, query):
+        """
+        [NEW] Paths of the clips whose name, id or file names match the query
+        (see ClipSearchIndex). Returns None when the query is empty.
+        """
+        if not query.strip():
+            return None
+        if not self._search_ready:
+            self._search_index.build((e.get("path"), self._search_terms(e)) for e in self._rows)
+            self._search_ready = True
+        return self._search_index.search(query)
+
+    @staticmethod
+    def _search_terms(entry):
+        terms = [entry.get("name"), entry.get("id")]
+        path = entry.get("path")
+        if path:
+            terms.append(os.path.basename(path))
+        terms.extend(os.path.basename(src) for src in entry.get("source_files") or [])
+        return [str(t) for t in terms if t]
+
+    # ---------------------------------------------------------------------
+    # Change notification
+    # ---------------------------------------------------------------------
+    def refresh_path(self, path):
+        """Recompute the status of one clip after its annotations changed."""
+        self._status.pop(path, None)
+        idx = self.index_for_path(path)
+        if idx.isValid():
+            self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DecorationRole, self.StatusRole])
+
+    def refresh_info(self, paths):
+        """Repaint the info columns of the given clips (new probe results)."""
+        if not self._show_info:
+            return
+        rows = [r for r in (self._row_of.get(p) for p in paths) if r is not None]
+        if not rows:
+            return
+        # One range for the whole batch: far fewer signals than one per row
+        last = len(self.INFO_COLUMNS)
+        self.dataChanged.emit(self.index(min(rows), 1), self.index(max(rows), last), [Qt.ItemDataRole.DisplayRole])
+
+    def refresh_all(self):
+        """
+        Drop every cached status (e.g. after a mode switch).
+        Signalled as a layout change: a full-range dataChanged would make the
+        filter proxy re-check rows one by one and emit one removal per gap.
+        """
+        self.layoutAboutToBeChanged.emit()
+        self._status = {}
+        self.layoutChanged.emit()
+
+    # ---------------------------------------------------------------------
+    # QAbstractItemModel interface
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def _children(entry):
+        sources = entry.get("source_files") or []
+        # Single-source entries are leaves (same as the previous item-based tree)
+        return sources if len(sources) > 1 else []
+
+    def _parent_path(self, index):
+        # Top-level rows have internalId 0; children carry their parent's uid
+        return self._path_of_uid.get(index.internalId())
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if row < 0 or not 0 <= column < self.columnCount():
+            return QModelIndex()
+        if not parent.isValid():
+            if row >= len(self._rows):
+                return QModelIndex()
+            return self.createIndex(row, column, 0)
+        if parent.internalId() != 0:
+            return QModelIndex()
+        path = self._rows[parent.row()].get("path")
+        if row >= self._fetched.get(path, 0):
+            return QModelIndex()
+        return self.createIndex(row, column, self._uid_of[path])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        row = self._row_of.get(self._parent_path(index))
+        if row is None:
+            return QModelIndex()
+        return self.createIndex(row, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._rows)
+        if parent.internalId() != 0:
+            return 0
+        return self._fetched.get(self._rows[parent.row()].get("path"), 0)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1 + len(self.INFO_COLUMNS) if self._show_info else 1
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if section == 0:
+            return "Clip"
+        if self._show_info and section <= len(self.INFO_COLUMNS):
+            return self.INFO_COLUMNS[section - 1]
+        return None
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self._rows)
+        if parent.internalId() != 0:
+            return False
+        sources = self._rows[parent.row()].get("source_files")
+        return bool(sources) and len(sources) > 1
+
+    def canFetchMore(self, parent):
+        if not parent.isValid() or parent.internalId() != 0:
+            return False
+        entry = self._rows[parent.row()]
+        return self._fetched.get(entry.get("path"), 0) < len(self._children(entry))
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        entry = self._rows[parent.row()]
+        path = entry.get("path")
+        have = self._fetched.get(path, 0)
+        total = len(self._children(entry))
+        self.beginInsertRows(parent, have, total - 1)
+        self._fetched[path] = total
+        self.endInsertRows()
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return self._ITEM_FLAGS
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if index.internalId() != 0:
+            parent_entry = self.entry_for_path(self._parent_path(index))
+            if parent_entry is None:
+                return None
+            src = self._children(parent_entry)[index.row()]
+            if index.column() > 0:
+                return self._info_text(src, index.column()) if role == Qt.ItemDataRole.DisplayRole else None
+            if role == Qt.ItemDataRole.DisplayRole:
+                return os.path.basename(src)
+            if role == self.FilePathRole:
+                return src
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return self._info_tooltip(src)
+            return None
+
+        entry = self._rows[index.row()]
+        if index.column() > 0:
+            if role != Qt.ItemDataRole.DisplayRole:
+                return None
+            return self._info_text(self._media_of(entry), index.column())
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._info_tooltip(self._media_of(entry))
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.get("name")
+        if role == self.FilePathRole:
+            return entry.get("path")
+        if role == self.StatusRole:
+            return self.status_at(index.row())
+        if role == Qt.ItemDataRole.DecorationRole:
+            if self._status_provider is None:
+                return None
+            return self._done_icon if self.status_at(index.row()) & ClipStatus.HAND else self._empty_icon
+        return None
+
+
+    # [NEW] Media info (columns / tooltip)
+    @staticmethod
+    def _media_of(entry):
+        # Multi-view entries: the first view stands for the action
+        sources = entry.get("source_files") or []
+        return sources[0] if len(sources) > 1 else entry.get("path")
+
+    def _info(self, path):
+        return self._info_provider(path) if self._info_provider and path else None
+
+    def _info_text(self, path, column):
+        info = self._info(path)
+        if not info:
+            return ""
+        name = self.INFO_COLUMNS[column - 1]
+        if name == "Duration":
+            return _format_duration(info.get("duration_ms") or 0)
+        if name == "FPS":
+            fps = info.get("fps")
+            return f"{fps:g}" if fps else ""
+        if name == "Resolution":
+            return f"{info['width']}x{info['height']}" if info.get("width") else ""
+        return info.get("codec") or ""
+
+    def _info_tooltip(self, path):
+        info = self._info(path)
+        if not info:
+            return None
+        parts = [_format_duration(info.get("duration_ms") or 0)]
+        if info.get("fps"):
+            parts.append(f"{info['fps']:g} fps")
+        if info.get("width"):
+            parts.append(f"{info['width']}x{info['height']}")
+        if info.get("codec"):
+            parts.append(info["codec"])
+        if info.get("keyframe_interval"):
+            parts.append(f"keyframe every {info['keyframe_interval']} frames")
+        return " · ".join(parts)
+
+
+def _format_duration(ms):
+    s = int(ms) // 1000
+    return f"{s // 3600}:{s // 60 % 60:02}:{s % 60:02}" if s >= 3600 else f"{s // 60:02}:{s % 60:02}"
+
+
+class ClipFilterProxyModel(QSortFilterProxyModel):
+    """
+    [NEW] Filters the top-level rows of a ProjectTreeModel by their cached ClipStatus.
+    A row is shown when it has every bit of `require` and none of `exclude`.
+
+    Status changes reach the proxy through dataChanged(StatusRole), so only the
+    edited row is re-evaluated. The pinned (currently selected) clip is always
+    accepted, so editing it never makes it vanish from under the user; it is
+    re-evaluated once the selection moves on.
+
+    An active navigator search (set_search_hits) is applied first and is not
+    affected by pinning.
+    """
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setColumnCount(1)
-    
-    def add_entry(self, name: str, path: str, source_files: list = None, icon=None) -> QStandardItem:
-        """
-        Creates and appends a new row to the model.
-        Returns the created QStandardItem for external reference.
-        """
-        item = QStandardItem(name)
-        item.setEditable(False)
-        item.setData(path, self.FilePathRole)
-        
-        if icon:
-            item.setIcon(icon)
-        
-        # Handle child items (e.g., multi-view inputs)
-        if source_files and len(source_files) > 1:
-            for src in source_files:
-                import os
-                child_name = os.path.basename(src)
-                child = QStandardItem(child_name)
-                child.setEditable(False)
-                child.setData(src, self.FilePathRole)
-                item.appendRow(child)
-        
-        self.appendRow(item)
-        return item
\ No newline at end of file
+        self._require = 0
+        self._exclude = 0
+        self._pinned_path = None
+        self._search_hits = None  # set of paths, or None when no search is active
+        self.setFilterRole(ProjectTreeModel.StatusRole)
+        self.setDynamicSortFilter(True)
+
+    def set_status_filter(self, require=ClipStatus.NONE, exclude=ClipStatus.NONE):
+        """Re-filters only when the criteria actually change."""
+        require, exclude = int(require), int(exclude)
+        if (require, exclude) == (self._require, self._exclude):
+            return
+        self._require = require
+        self._exclude = exclude
+        # A layout change (rather than per-range row removals) keeps the
+        # selection and is much cheaper when the visible rows are interleaved
+        self.invalidate()
+
+    def set_search_hits(self, paths):
+        """[NEW] Restrict the rows to these paths (None shows everything)."""
+        if paths is None and self._search_hits is None:
+            return
+        self._search_hits = paths
+        # Called once per row during the pass, so skip the sourceModel() round-trip
+        self._source_paths = self.sourceModel().paths
+        self.invalidate()
+
+    def set_pinned_path(self, path):
+        old = self._pinned_path
+        if old == path:
+            return
+        self._pinned_path = path
+        if old is not None and self.sourceModel() is not None:
+            # Let the previously selected clip drop out if it no longer matches
+            self.sourceModel().refresh_path(old)
+
+    def index_for_path(self, path) -> QModelIndex:
+        source = self.sourceModel()
+        if source is None:
+            return QModelIndex()
+        return self.mapFromSource(source.index_for_path(path))
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if source_parent.isValid():
+            return True
+        hits = self._search_hits
+        if hits is not None and self._source_paths[source_row] not in hits:
+            return False
+        if not self._require and not self._exclude:
+            return True
+        source = self.sourceModel()
+        if self._pinned_path is not None and source.path_at(source_row) == self._pinned_path:
+            return True
+        status = source.status_at(source_row)
+        return (status & self._require) == self._require and not (status & self._exclude)
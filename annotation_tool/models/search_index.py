@@ -0,0 +1,163 @@
+import re
+from array import array
+from bisect import bisect_right
+
+
+# Separates the terms of one clip / ends a clip record inside the packed text
+_TERM_SEP = "\x1f"
+_REC_SEP = "\n"
+# Below this many candidates, later query tokens are checked clip by clip
+_VERIFY_LIMIT = 4096
+# Typo matching is skipped when the exact halves of the token are too common
+_FUZZY_MIN_LEN = 5
+_FUZZY_LIMIT = 20000
+
+
+class ClipSearchIndex:
+    """
+    Search index over the searchable strings of each clip (name, id, file names),
+    used by the navigator search box.
+
+    All clip texts are packed, lowercased, into one string with an offset
+    table, so a query token is a single C-level regex scan over the packed
+    text and each hit maps back to its clip with a bisect:
+    - tokens shorter than 3 characters match word prefixes ("v2" finds "game_v2.mp4"),
+    - longer tokens match anywhere in a name,
+    - a long token that matches nothing falls back to one-typo matching.
+    Every whitespace-separated token must match (AND).
+
+    Clips are numbered in insertion order, so add() is an append. remove()
+    leaves a tombstone; the index is compacted once tombstones outnumber
+    live entries.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._keys = []            # doc id -> key (None once removed)
+        self._doc_of = {}          # key -> doc id
+        self._records = []         # doc id -> packed record (text + _REC_SEP)
+        self._starts = array("Q")  # doc id -> offset of its record in the packed text
+        self._end = 0
+        self._packed = ""
+        self._packed_docs = 0      # number of records already joined into _packed
+        self._removed = 0
+
+    def __len__(self):
+        return len(self._doc_of)
+
+    def build(self, items):
+        """Index (key, terms) pairs from scratch."""
+        self.clear()
+        for key, terms in items:
+            self._add_doc(key, terms)
+
+    def add(self, key, terms):
+        if key in self._doc_of:
+            self.remove(key)
+        self._add_doc(key, terms)
+
+    def remove(self, key):
+        doc = self._doc_of.pop(key, None)
+        if doc is None:
+            return
+        self._keys[doc] = None
+        self._removed += 1
+        if self._removed > len(self._doc_of):
+            self._compact()
+
+    def search(self, query):
+        """
+        Keys of the clips matching every token of the query.
+        Returns None for an empty query (meaning: no search active).
+        """
+        tokens = query.lower().split()
+        if not tokens:
+            return None
+        self._sync_packed()
+
+        docs = None
+        # Longest tokens first: they are the most selective
+        for tok in sorted(set(tokens), key=len, reverse=True):
+            hits = self._match(self._pattern(tok), docs)
+            if not hits and len(tok) >= _FUZZY_MIN_LEN:
+                hits = self._fuzzy_match(tok, docs)
+            docs = hits
+            if not docs:
+                return set()
+        keys = self._keys
+        return {keys[d] for d in docs if keys[d] is not None}
+
+    # ------------------------------------------------------------------
+    def _add_doc(self, key, terms):
+        doc = len(self._keys)
+        text = _TERM_SEP.join(dict.fromkeys(
+            t.lower().replace(_REC_SEP, " ").replace(_TERM_SEP, " ") for t in terms if t
+        ))
+        record = text + _REC_SEP
+        self._keys.append(key)
+        self._doc_of[key] = doc
+        self._records.append(record)
+        self._starts.append(self._end)
+        self._end += len(record)
+
+    def _sync_packed(self):
+        # Records added since the last query are joined lazily, once
+        if self._packed_docs < len(self._records):
+            self._packed += "".join(self._records[self._packed_docs:])
+            self._packed_docs = len(self._records)
+
+    @staticmethod
+    def _pattern(tok):
+        if len(tok) < 3:
+            # Word prefix: not preceded by a letter or digit
+            return re.compile(r"(?<![^\W_])" + re.escape(tok))
+        return re.compile(re.escape(tok))
+
+    def _fuzzy_match(self, tok, within):
+        # A single edit leaves one half of the token intact, so clips
+        # containing either half exactly are the only candidates
+        half = len(tok) // 2
+        candidates = set()
+        for piece in (tok[:half], tok[half:]):
+            candidates |= self._match(re.compile(re.escape(piece)), within)
+            if len(candidates) > _FUZZY_LIMIT:
+                return set()
+        pattern = self._fuzzy_pattern(tok)
+        records = self._records
+        return {d for d in candidates if pattern.search(records[d])}
+
+    @staticmethod
+    def _fuzzy_pattern(tok):
+        # One substitution, insertion or deletion anywhere in the token
+        variants = set()
+        for i in range(len(tok)):
+            head, tail = re.escape(tok[:i]), re.escape(tok[i + 1:])
+            variants.add(head + r"[^\n]" + tail)                        # substitution
+            variants.add(head + tail)                                    # deletion
+            variants.add(head + r"[^\n]" + re.escape(tok[i:]))          # insertion
+        return re.compile("|".join(sorted(variants, key=len, reverse=True)))
+
+    def _match(self, pattern, within):
+        if within is not None and len(within) <= _VERIFY_LIMIT:
+            return {d for d in within if pattern.search(self._records[d])}
+
+        hits = set()
+        packed, starts = self._packed, self._starts
+        n_docs = len(starts)
+        pos = 0
+        while True:
+            m = pattern.search(packed, pos)
+            if m is None:
+                break
+            doc = bisect_right(starts, m.start()) - 1
+            hits.add(doc)
+            # Skip the rest of this clip's record
+            pos = starts[doc + 1] if doc + 1 < n_docs else len(packed)
+        return hits if within is None else hits & within
+
+    def _compact(self):
+        live = sorted(self._doc_of.items(), key=lambda kv: kv[1])
+        records = self._records
+        self.build((key, records[doc][:-1].split(_TERM_SEP)) for key, doc in live)
@@ -0,0 +1,999 @@
+"""
+Undo/Redo stress benchmark and randomized consistency harness.
+
+Builds a synthetic project (classification labels, smart predictions,
+localization events, captions and dense captions) and issues N random commands
+covering every CmdType through the managers' own entry points (the slots the
+editors and the inference workers are connected to). It then undoes and redoes
+the whole history through the real HistoryManager and checks that the model
+round-trips exactly.
+
+By default the managers run on a headless host with inert stand-in widgets;
+--ui builds the real main window (offscreen) instead. Commands without a
+manager entry point come from the CommandGenerator: BATCH_ANNOTATION_CONFIRM,
+which no editor pushes, and the localization / dense description commands
+when QtMultimedia cannot be imported. --generator uses it for every command,
+which times the history logic alone.
+
+Usage (from the annotation_tool directory):
+    python tools/history_stress.py --ops 20000 --clips 500 --seed 0
+    python tools/history_stress.py --ui          # drive the real main window (offscreen)
+    python tools/history_stress.py --generator   # history logic only, no managers
+
+Exit code is non-zero if the model does not round-trip.
+"""
+import os
+import sys
+import copy
+import json
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QObject, QItemSelectionModel
+from PyQt6.QtWidgets import QApplication
+
+from models import AppStateModel, CmdType, EventTimeIndex
+from controllers.history_manager import HistoryManager
+from controllers.classification.class_annotation_manager import AnnotationManager
+from controllers.classification.inference_manager import InferenceManager
+from controllers.description.desc_annotation_manager import DescAnnotationManager
+
+
+# Event lists are compared as multisets: undoing a deletion re-appends the
+# event at the end of its clip, and every view sorts events by position anyway.
+UNORDERED_EVENT_STORES = ("localization_events", "dense_description_events")
+
+# Class names of the default inference label map
+PREDICTED_CLASSES = ("Challenge", "Dive", "Elbowing", "Holding", "Pushing", "Tackling")
+
+
+def _media_managers():
+    """(LocalizationManager, DenseManager), or (None, None) if QtMultimedia cannot be imported."""
+    try:
+        from controllers.localization.localization_manager import LocalizationManager
+        from controllers.dense_description.dense_manager import DenseManager
+    except ImportError as e:
+        print(f"[history_stress] localization / dense managers unavailable ({e}); "
+              f"their commands come from the generator")
+        return None, None
+    return LocalizationManager, DenseManager
+
+
+class _Null:
+    """
+    Inert widget: any attribute is another _Null (kept, so it can be replaced),
+    calls return a _Null, and it reads as False, empty and 0.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        null = _Null()
+        setattr(self, name, null)
+        return null
+
+    def __call__(self, *args, **kwargs):
+        return _Null()
+
+    def __bool__(self):
+        return False
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __int__(self):
+        return 0
+
+    __index__ = __int__
+
+    def __lt__(self, other):
+        return 0 < other
+
+    def __le__(self, other):
+        return 0 <= other
+
+    def __gt__(self, other):
+        return 0 > other
+
+    def __ge__(self, other):
+        return 0 >= other
+
+
+class _TextField(_Null):
+    """Line or text edit: keeps its text."""
+
+    def __init__(self):
+        self._text = ""
+
+    def setText(self, text):
+        self._text = text
+
+    setPlainText = setText
+
+    def text(self):
+        return self._text
+
+    toPlainText = text
+
+    def clear(self):
+        self._text = ""
+
+
+class _Player(_Null):
+    def __init__(self):
+        self.position_ms = 0
+
+    def position(self):
+        return self.position_ms
+
+
+class _LabelGroup(_Null):
+    def __init__(self):
+        self.input_field = _TextField()
+
+
+class _ClassificationPanel(_Null):
+    """Keeps the editor state the managers read back (labels, batch results)."""
+
+    def __init__(self):
+        self.label_groups = {}
+        self.is_batch_mode_active = False
+        self.pending_batch_results = {}
+        self.batch_result_text = _TextField()
+        self._annotation = {}
+
+    def setup_dynamic_labels(self, label_definitions):
+        self.label_groups = {head: _LabelGroup() for head in label_definitions}
+
+    def set_annotation(self, data):
+        self.reset_smart_inference()
+        self._annotation = dict(data or {})
+
+    def get_annotation(self):
+        return dict(self._annotation)
+
+    def reset_smart_inference(self):
+        self.is_batch_mode_active = False
+
+    def start_batch_progress(self, total):
+        self.is_batch_mode_active = True
+        self.pending_batch_results = {}
+
+    def append_batch_inference_result(self, result_text, batch_predictions):
+        self.pending_batch_results.update(batch_predictions)
+
+    def display_inference_result(self, target_head, predicted_label, conf_dict):
+        self.is_batch_mode_active = False
+
+    def display_batch_inference_result(self, result_text, batch_predictions):
+        self.is_batch_mode_active = True
+        self.pending_batch_results = batch_predictions
+
+
+class _Tabs:
+    def __init__(self, index):
+        self._index = index
+
+    def currentIndex(self):
+        return self._index
+
+
+class _NullTree:
+    def refresh_path(self, path):
+        pass
+
+    def refresh_all(self):
+        pass
+
+
+class _NullDenseManager:
+    def __init__(self):
+        self.event_index = EventTimeIndex()
+
+
+class HeadlessHost(QObject):
+    """
+    Stand-in for the main window: the real model, HistoryManager and editor
+    managers, with inert widgets. Any other attribute the managers touch
+    resolves to a _Null. With managers=False only the hooks HistoryManager
+    calls are used.
+    """
+
+    def __init__(self, model, managers=True):
+        super().__init__()
+        self.model = model
+        self.current_path = None
+        # -1 matches no mode, so _refresh_active_view() has nothing to redraw
+        self.right_tabs = _Tabs(-1)
+        self.tree_model = _NullTree()
+        self.classification_panel = _ClassificationPanel()
+        self.description_panel = _Null()
+        self.description_panel.caption_edit = _TextField()
+        self.center_panel = _Null()
+        self.center_panel.media_preview.player = _Player()
+        self.dense_manager = _NullDenseManager()
+        self.loc_manager = None
+        self.history_manager = HistoryManager(self)
+        if not managers:
+            return
+        self.annot_manager = AnnotationManager(self)
+        self.desc_annot_manager = DescAnnotationManager(self)
+        self.inference_manager = InferenceManager(self)
+        loc_cls, dense_cls = _media_managers()
+        if loc_cls is not None:
+            self.loc_manager = loc_cls(self, _Null())
+            self.dense_manager = dense_cls(self, _Null())
+            # As the main window does for a new project
+            self.loc_manager.reset_ui()
+            self.dense_manager.reset_ui()
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        null = _Null()
+        setattr(self, name, null)
+        return null
+
+    def get_current_action_path(self):
+        return self.current_path
+
+    def setup_dynamic_ui(self):
+        self.classification_panel.setup_dynamic_labels(self.model.label_definitions)
+
+
+def build_synthetic_project(model, rng, n_clips, n_heads, n_labels):
+    model.reset(full_reset=True)
+    model.json_loaded = True
+
+    for h in range(n_heads):
+        head = f"head_{h}"
+        kind = "single_label" if h % 2 == 0 else "multi_label"
+        model.label_definitions[head] = {
+            "type": kind,
+            "labels": sorted(f"{head}_lbl_{i}" for i in range(n_labels)),
+        }
+
+    for i in range(n_clips):
+        path = f"/synthetic/clip_{i}.mp4"
+        model.action_item_data.append({
+            "name": f"clip_{i}",
+            "path": path,
+            "source_files": [path],
+            "metadata": {"path": path},
+            "captions": [{"lang": "en", "text": f"caption {i}"}] if rng.random() < 0.5 else [],
+        })
+        model.action_path_to_name[path] = f"clip_{i}"
+
+        anno = _random_annotation(model, rng) if rng.random() < 0.5 else None
+        if anno:
+            model.manual_annotations[path] = anno
+        smart = _random_smart(model, rng) if rng.random() < 0.3 else None
+        if smart:
+            model.smart_annotations[path] = smart
+        model.localization_events[path] = [_random_loc_event(model, rng) for _ in range(rng.randint(0, 8))]
+        model.dense_description_events[path] = [_random_dense_event(rng) for _ in range(rng.randint(0, 5))]
+
+
+def _clip_paths(model):
+    return [d["path"] for d in model.action_item_data]
+
+
+def _random_label(model, rng, head):
+    labels = model.label_definitions[head]["labels"]
+    return rng.choice(labels) if labels else None
+
+
+def _random_annotation(model, rng):
+    anno = {}
+    for head, defn in model.label_definitions.items():
+        if not defn["labels"] or rng.random() < 0.3:
+            continue
+        if defn["type"] == "single_label":
+            anno[head] = rng.choice(defn["labels"])
+        else:
+            anno[head] = sorted(rng.sample(defn["labels"], rng.randint(1, len(defn["labels"]))))
+    return anno or None
+
+
+def _random_smart(model, rng):
+    smart = {}
+    for head, defn in model.label_definitions.items():
+        if defn["type"] != "single_label" or not defn["labels"]:
+            continue
+        lbl = rng.choice(defn["labels"])
+        smart[head] = {"label": lbl, "conf_dict": {lbl: round(rng.random(), 4)}}
+    if not smart:
+        return None
+    smart["_confirmed"] = rng.random() < 0.5
+    return smart
+
+
+def _random_loc_event(model, rng):
+    head = rng.choice(list(model.label_definitions))
+    return {"head": head, "label": _random_label(model, rng, head), "position_ms": rng.randint(0, 5_400_000)}
+
+
+def _random_dense_event(rng):
+    return {"position_ms": rng.randint(0, 5_400_000), "lang": "en", "text": f"desc {rng.randint(0, 10**6)}"}
+
+
+class CommandGenerator:
+    """
+    Produces commands shaped like the ones the managers push, computed
+    against the current model state so that each one is applicable.
+    """
+
+    def __init__(self, model, rng):
+        self.model = model
+        self.rng = rng
+        self._uid = 0
+
+    def _fresh(self, prefix):
+        self._uid += 1
+        return f"{prefix}_n{self._uid}"
+
+    def make(self, ctype):
+        """Return a command dict, or None if ctype is not applicable right now."""
+        return getattr(self, f"_gen_{ctype.name.lower()}")()
+
+    # --- Classification ---
+    def _gen_annotation_confirm(self):
+        path = self.rng.choice(_clip_paths(self.model))
+        return {"type": CmdType.ANNOTATION_CONFIRM, "path": path,
+                "old_data": copy.deepcopy(self.model.manual_annotations.get(path)),
+                "new_data": _random_annotation(self.model, self.rng)}
+
+    def _gen_batch_annotation_confirm(self):
+        paths = self.rng.sample(_clip_paths(self.model), min(8, len(self.model.action_item_data)))
+        changes = {p: {"old_data": copy.deepcopy(self.model.manual_annotations.get(p)),
+                       "new_data": _random_annotation(self.model, self.rng)} for p in paths}
+        return {"type": CmdType.BATCH_ANNOTATION_CONFIRM, "batch_changes": changes}
+
+    def _gen_ui_change(self):
+        head = self.rng.choice(list(self.model.label_definitions))
+        path = self.rng.choice(_clip_paths(self.model))
+        # Same old_val as AnnotationManager.handle_ui_selection_change records
+        old_val = self.model.last_ui_value(path, head)
+        new_val = _random_label(self.model, self.rng, head)
+        return {"type": CmdType.UI_CHANGE, "path": path, "head": head,
+                "old_val": copy.deepcopy(old_val), "new_val": new_val}
+
+    def _gen_smart_annotation_run(self):
+        path = self.rng.choice(_clip_paths(self.model))
+        return {"type": CmdType.SMART_ANNOTATION_RUN, "path": path,
+                "old_data": copy.deepcopy(self.model.smart_annotations.get(path)),
+                "new_data": _random_smart(self.model, self.rng)}
+
+    def _gen_batch_smart_annotation_run(self):
+        paths = self.rng.sample(_clip_paths(self.model), min(8, len(self.model.action_item_data)))
+        return {"type": CmdType.BATCH_SMART_ANNOTATION_RUN,
+                "old_data": {p: copy.deepcopy(self.model.smart_annotations.get(p)) for p in paths},
+                "new_data": {p: _random_smart(self.model, self.rng) for p in paths}}
+
+    # --- Schema ---
+    def _gen_schema_add_cat(self):
+        kind = self.rng.choice(["single_label", "multi_label"])
+        head = self._fresh("head")
+        return {"type": CmdType.SCHEMA_ADD_CAT, "head": head,
+                "definition": {"type": kind, "labels": [f"{head}_lbl_0", f"{head}_lbl_1"]}}
+
+    def _gen_schema_del_cat(self):
+        if len(self.model.label_definitions) <= 2:
+            return None
+        head = self.rng.choice(list(self.model.label_definitions))
+        affected = {k: copy.deepcopy(v[head]) for k, v in self.model.manual_annotations.items() if head in v}
+        loc_affected = {}
+        for vid, events in self.model.localization_events.items():
+            aff = [copy.deepcopy(e) for e in events if e.get("head") == head]
+            if aff:
+                loc_affected[vid] = aff
+        return {"type": CmdType.SCHEMA_DEL_CAT, "head": head,
+                "definition": copy.deepcopy(self.model.label_definitions[head]),
+                "affected_data": affected, "loc_affected_events": loc_affected}
+
+    def _gen_schema_ren_cat(self):
+        old = self.rng.choice(list(self.model.label_definitions))
+        return {"type": CmdType.SCHEMA_REN_CAT, "old_name": old, "new_name": self._fresh("head")}
+
+    def _gen_schema_add_lbl(self):
+        head = self.rng.choice(list(self.model.label_definitions))
+        return {"type": CmdType.SCHEMA_ADD_LBL, "head": head, "label": self._fresh(f"{head}_lbl"),
+                "index": len(self.model.label_definitions[head]["labels"])}
+
+    def _gen_schema_del_lbl(self):
+        head = self.rng.choice(list(self.model.label_definitions))
+        defn = self.model.label_definitions[head]
+        if len(defn["labels"]) <= 1:
+            return None
+        lbl = self.rng.choice(defn["labels"])
+        affected = {}
+        for k, v in self.model.manual_annotations.items():
+            if defn["type"] == "single_label" and v.get(head) == lbl:
+                affected[k] = lbl
+            elif defn["type"] == "multi_label" and lbl in (v.get(head) or []):
+                affected[k] = copy.deepcopy(v[head])
+        loc_affected = {}
+        for vid, events in self.model.localization_events.items():
+            aff = [copy.deepcopy(e) for e in events if e.get("head") == head and e.get("label") == lbl]
+            if aff:
+                loc_affected[vid] = aff
+        return {"type": CmdType.SCHEMA_DEL_LBL, "head": head, "label": lbl, "index": defn["labels"].index(lbl),
+                "affected_data": affected, "loc_affected_events": loc_affected}
+
+    def _gen_schema_ren_lbl(self):
+        head = self.rng.choice(list(self.model.label_definitions))
+        if not self.model.label_definitions[head]["labels"]:
+            return None
+        old = _random_label(self.model, self.rng, head)
+        return {"type": CmdType.SCHEMA_REN_LBL, "head": head, "old_lbl": old, "new_lbl": self._fresh(f"{head}_lbl")}
+
+    # --- Localization ---
+    def _pick_event(self, store):
+        candidates = [p for p, evts in store.items() if evts]
+        if not candidates:
+            return None, None
+        path = self.rng.choice(candidates)
+        return path, self.rng.choice(store[path])
+
+    def _gen_loc_event_add(self):
+        if not any(d["labels"] for d in self.model.label_definitions.values()):
+            return None
+        return {"type": CmdType.LOC_EVENT_ADD, "video_path": self.rng.choice(_clip_paths(self.model)),
+                "event": _random_loc_event(self.model, self.rng)}
+
+    def _gen_loc_event_del(self):
+        path, evt = self._pick_event(self.model.localization_events)
+        if evt is None:
+            return None
+        return {"type": CmdType.LOC_EVENT_DEL, "video_path": path, "event": copy.deepcopy(evt)}
+
+    def _gen_loc_event_mod(self):
+        path, evt = self._pick_event(self.model.localization_events)
+        if evt is None:
+            return None
+        new_evt = dict(evt, position_ms=self.rng.randint(0, 5_400_000))
+        return {"type": CmdType.LOC_EVENT_MOD, "video_path": path,
+                "old_event": copy.deepcopy(evt), "new_event": new_evt}
+
+    # --- Description ---
+    def _gen_desc_edit(self):
+        item = self.rng.choice(self.model.action_item_data)
+        new = [{"lang": "en", "text": self._fresh("caption")}] if self.rng.random() < 0.8 else []
+        return {"type": CmdType.DESC_EDIT, "path": item["metadata"]["path"],
+                "old_data": copy.deepcopy(item.get("captions", [])), "new_data": new}
+
+    # --- Dense Description ---
+    def _gen_dense_event_add(self):
+        return {"type": CmdType.DENSE_EVENT_ADD, "video_path": self.rng.choice(_clip_paths(self.model)),
+                "event": _random_dense_event(self.rng)}
+
+    def _gen_dense_event_del(self):
+        path, evt = self._pick_event(self.model.dense_description_events)
+        if evt is None:
+            return None
+        return {"type": CmdType.DENSE_EVENT_DEL, "video_path": path, "event": copy.deepcopy(evt)}
+
+    def _gen_dense_event_mod(self):
+        path, evt = self._pick_event(self.model.dense_description_events)
+        if evt is None:
+            return None
+        new_evt = dict(evt, text=self._fresh("desc"))
+        return {"type": CmdType.DENSE_EVENT_MOD, "video_path": path,
+                "old_event": copy.deepcopy(evt), "new_event": new_evt}
+
+
+class ManagerDriver:
+    """
+    Issues commands through the managers' own entry points, so the command
+    shapes and the forward changes under test are the ones the application
+    really makes. Works on the HeadlessHost and on the real main window.
+
+    The clip is made current as a click in the clip tree would (without
+    loading media), editor widgets are filled in before their slot runs,
+    confirmation dialogs are answered with Yes and name prompts with a fresh
+    name. Command types with no entry point here come from the CommandGenerator.
+    """
+
+    def __init__(self, host, gen):
+        self.host = host
+        self.model = host.model
+        self.gen = gen
+        self.rng = gen.rng
+        self._name = None
+        self._headless = isinstance(host, HeadlessHost)
+        self._drivers = {
+            CmdType.ANNOTATION_CONFIRM: [self._annotation_save, self._annotation_clear],
+            CmdType.UI_CHANGE: [self._ui_change],
+            CmdType.SMART_ANNOTATION_RUN: [self._inference_single, self._smart_confirm, self._smart_clear],
+            CmdType.BATCH_SMART_ANNOTATION_RUN: [self._inference_batch, self._smart_confirm_batch],
+            CmdType.SCHEMA_DEL_CAT: [self._class_head_delete],
+            CmdType.SCHEMA_ADD_LBL: [self._class_label_add],
+            CmdType.SCHEMA_DEL_LBL: [self._class_label_delete],
+            CmdType.DESC_EDIT: [self._desc_edit],
+        }
+        if host.loc_manager is not None:
+            for ctype, driver in (
+                (CmdType.LOC_EVENT_ADD, self._loc_event_add),
+                (CmdType.LOC_EVENT_MOD, self._loc_event_mod),
+                (CmdType.LOC_EVENT_DEL, self._loc_event_del),
+                (CmdType.SCHEMA_ADD_CAT, self._schema_add_cat),
+                (CmdType.SCHEMA_REN_CAT, self._schema_ren_cat),
+                (CmdType.SCHEMA_DEL_CAT, self._schema_del_cat),
+                (CmdType.SCHEMA_ADD_LBL, self._schema_add_lbl),
+                (CmdType.SCHEMA_REN_LBL, self._schema_ren_lbl),
+                (CmdType.SCHEMA_DEL_LBL, self._schema_del_lbl),
+                (CmdType.DENSE_EVENT_ADD, self._dense_event_add),
+                (CmdType.DENSE_EVENT_MOD, self._dense_event_mod),
+                (CmdType.DENSE_EVENT_DEL, self._dense_event_del),
+            ):
+                self._drivers.setdefault(ctype, []).append(driver)
+
+    def handles(self, ctype):
+        return ctype in self._drivers
+
+    def run(self, ctype):
+        """Run one entry point for ctype; True if it pushed a command."""
+        depth = len(self.model.undo_stack)
+        with _auto_answer_dialogs(self):
+            self.rng.choice(self._drivers[ctype])()
+        QApplication.processEvents()
+        return len(self.model.undo_stack) > depth
+
+    def _select(self, path):
+        """Make path the current clip, as a click in the clip tree does (media is not loaded)."""
+        if self._headless:
+            self.host.current_path = path
+            return
+        selection = self.host.left_panel.tree.selectionModel()
+        selection.blockSignals(True)
+        selection.setCurrentIndex(self.host.tree_proxy.index_for_path(path),
+                                  QItemSelectionModel.SelectionFlag.ClearAndSelect)
+        selection.blockSignals(False)
+
+    def _seek(self, position_ms):
+        # The main window has no media loaded: its player stays at 0
+        if self._headless:
+            self.host.center_panel.media_preview.player.position_ms = position_ms
+
+    def _random_position(self, store):
+        """A random position, or one of an existing event (the editors then update that event)."""
+        path, evt = self.gen._pick_event(store)
+        if evt is not None and self.rng.random() < 0.3:
+            return evt["position_ms"]
+        return self.rng.randint(0, 5_400_000)
+
+    def _classification_uses(self, head, label=None):
+        for anno in self.model.manual_annotations.values():
+            val = anno.get(head)
+            if val is not None and (label is None or val == label or (isinstance(val, list) and label in val)):
+                return True
+        return False
+
+    # --- Classification ---
+    def _class_head(self):
+        # The label groups are rebuilt for the current schema, as when the editor is shown
+        if set(self.host.classification_panel.label_groups) != set(self.model.label_definitions):
+            self.host.setup_dynamic_ui()
+        return self.rng.choice(list(self.model.label_definitions))
+
+    def _annotation_save(self):
+        self._class_head()
+        self._select(self.rng.choice(_clip_paths(self.model)))
+        self.host.classification_panel.set_annotation(_random_annotation(self.model, self.rng))
+        self.host.annot_manager.save_manual_annotation()
+
+    def _annotation_clear(self):
+        paths = list(self.model.manual_annotations)
+        if not paths:
+            return
+        self._class_head()
+        self._select(self.rng.choice(paths))
+        self.host.annot_manager.clear_current_manual_annotation()
+
+    def _ui_change(self):
+        head = self._class_head()
+        defn = self.model.label_definitions[head]
+        if defn["type"] == "single_label":
+            value = _random_label(self.model, self.rng, head)
+        else:
+            value = sorted(self.rng.sample(defn["labels"], self.rng.randint(0, len(defn["labels"]))))
+        self._select(self.rng.choice(_clip_paths(self.model)))
+        self.host.annot_manager.handle_ui_selection_change(head, value)
+
+    def _class_head_delete(self):
+        if len(self.model.label_definitions) <= 2:
+            return
+        self.host.annot_manager.handle_remove_label_head(self._class_head())
+
+    def _class_label_add(self):
+        head = self._class_head()
+        group = self.host.classification_panel.label_groups[head]
+        group.input_field.setText(self.gen._fresh(f"{head}_lbl"))
+        self.host.annot_manager.add_custom_type(head)
+
+    def _class_label_delete(self):
+        head = self._class_head()
+        label = _random_label(self.model, self.rng, head)
+        if label is None:
+            return
+        self.host.annot_manager.remove_custom_type(head, label)
+
+    # --- Smart annotation (inference results) ---
+    def _inference_single(self):
+        heads = [h for h, d in self.model.label_definitions.items() if d["type"] == "single_label" and d["labels"]]
+        if not heads:
+            return
+        head = self.rng.choice(heads)
+        label = _random_label(self.model, self.rng, head)
+        self._select(self.rng.choice(_clip_paths(self.model)))
+        # What InferenceWorker.finished_signal delivers
+        self.host.inference_manager._on_inference_success(head, label, {label: round(self.rng.random(), 4)})
+
+    def _smart_confirm(self):
+        paths = list(self.model.smart_annotations)
+        if not paths:
+            return
+        self._select(self.rng.choice(paths))
+        self.host.classification_panel.reset_smart_inference()
+        self.host.annot_manager.confirm_smart_annotation_as_manual()
+
+    def _smart_clear(self):
+        paths = list(self.model.smart_annotations)
+        if not paths:
+            return
+        self._select(self.rng.choice(paths))
+        self.host.annot_manager.clear_current_smart_annotation()
+
+    def _inference_batch(self):
+        """A batch run: progress start, the chunks BatchInferenceWorker.chunk_signal delivers, then success."""
+        manager = self.host.inference_manager
+        clips = self.rng.sample(list(self.model.action_item_data), min(8, len(self.model.action_item_data)))
+        self.host.classification_panel.start_batch_progress(len(clips))
+        chunk_size = self.rng.randint(1, 4)
+        for i in range(0, len(clips), chunk_size):
+            manager._on_batch_chunk([
+                {"id": clip["name"], "gt": "", "pred": self.rng.choice(PREDICTED_CLASSES),
+                 "conf": round(self.rng.uniform(0.3, 1.0), 4), "original_items": [clip]}
+                for clip in clips[i:i + chunk_size]
+            ])
+        manager._on_batch_inference_success({}, False)
+
+    def _smart_confirm_batch(self):
+        # Confirms the results the batch panel shows, after a run if it shows none
+        panel = self.host.classification_panel
+        if not panel.is_batch_mode_active or not panel.pending_batch_results:
+            self._inference_batch()
+        self.host.annot_manager.confirm_smart_annotation_as_manual()
+
+    # --- Description ---
+    def _desc_edit(self):
+        item = self.rng.choice(self.model.action_item_data)
+        self.host.desc_annot_manager.current_action_path = item["metadata"]["path"]
+        text = self.gen._fresh("caption") if self.rng.random() < 0.8 else ""
+        self.host.description_panel.caption_edit.setPlainText(text)
+        self.host.desc_annot_manager.save_current_annotation()
+
+    # --- Localization ---
+    def _loc_clip(self, path):
+        self.host.loc_manager.current_video_path = path
+
+    def _loc_event_add(self):
+        head = self.rng.choice(list(self.model.label_definitions))
+        label = _random_label(self.model, self.rng, head)
+        if label is None:
+            return
+        self._loc_clip(self.rng.choice(_clip_paths(self.model)))
+        self._seek(self.rng.randint(0, 5_400_000))
+        self.host.loc_manager._on_spotting_triggered(head, label)
+
+    def _loc_event_mod(self):
+        path, evt = self.gen._pick_event(self.model.localization_events)
+        if evt is None:
+            return
+        # The table only offers schema labels: an event whose head or label the
+        # classification editor deleted would be re-added to the schema
+        defn = self.model.label_definitions.get(evt.get("head"))
+        if defn is None or evt.get("label") not in defn["labels"]:
+            return
+        self._loc_clip(path)
+        self.host.loc_manager._on_annotation_modified(evt, dict(evt, position_ms=self.rng.randint(0, 5_400_000)))
+
+    def _loc_event_del(self):
+        path, evt = self.gen._pick_event(self.model.localization_events)
+        if evt is None:
+            return
+        self._loc_clip(path)
+        self.host.loc_manager._on_delete_single_annotation(evt)
+
+    def _schema_add_cat(self):
+        self.host.loc_manager._on_head_added(self.gen._fresh("head"))
+
+    def _schema_ren_cat(self):
+        # The localization editor renames events only; heads that classification
+        # labels use are renamed through the generator instead
+        old = self.rng.choice(list(self.model.label_definitions))
+        if self._classification_uses(old):
+            return
+        self.host.loc_manager._on_head_renamed(old, self.gen._fresh("head"))
+
+    def _schema_del_cat(self):
+        if len(self.model.label_definitions) <= 2:
+            return
+        self.host.loc_manager._on_head_deleted(self.rng.choice(list(self.model.label_definitions)))
+
+    def _schema_add_lbl(self):
+        # Also spots the new label on the current clip, if there is one
+        head = self.rng.choice(list(self.model.label_definitions))
+        self._name = self.gen._fresh(f"{head}_lbl")
+        self._loc_clip(self.rng.choice(_clip_paths(self.model) + [None]))
+        self._seek(self.rng.randint(0, 5_400_000))
+        self.host.loc_manager._on_label_add_req(head)
+
+    def _schema_ren_lbl(self):
+        head = self.rng.choice(list(self.model.label_definitions))
+        old = _random_label(self.model, self.rng, head)
+        if old is None or self._classification_uses(head, old):
+            return
+        self._name = self.gen._fresh(f"{head}_lbl")
+        self.host.loc_manager._on_label_rename_req(head, old)
+
+    def _schema_del_lbl(self):
+        head = self.rng.choice(list(self.model.label_definitions))
+        if len(self.model.label_definitions[head]["labels"]) <= 1:
+            return
+        self.host.loc_manager._on_label_delete_req(head, _random_label(self.model, self.rng, head))
+
+    # --- Dense Description ---
+    def _dense_event_add(self):
+        # Submits at the player position: updates the event there if one exists
+        self.host.dense_manager.current_video_path = self.rng.choice(_clip_paths(self.model))
+        self._seek(self._random_position(self.model.dense_description_events))
+        self.host.dense_manager._on_description_submitted(self.gen._fresh("desc"))
+
+    def _dense_event_mod(self):
+        path, evt = self.gen._pick_event(self.model.dense_description_events)
+        if evt is None:
+            return
+        self.host.dense_manager.current_video_path = path
+        self.host.dense_manager._on_annotation_modified(evt, dict(evt, text=self.gen._fresh("desc")))
+
+    def _dense_event_del(self):
+        path, evt = self.gen._pick_event(self.model.dense_description_events)
+        if evt is None:
+            return
+        self.host.dense_manager.current_video_path = path
+        self.host.dense_manager._on_delete_single_annotation(evt)
+
+
+@contextlib.contextmanager
+def _auto_answer_dialogs(driver):
+    from PyQt6.QtWidgets import QMessageBox, QInputDialog
+    saved = (QMessageBox.question, QMessageBox.warning, QInputDialog.getText)
+    yes = staticmethod(lambda *a, **k: QMessageBox.StandardButton.Yes)
+    QMessageBox.question = QMessageBox.warning = yes
+    QInputDialog.getText = staticmethod(lambda *a, **k: (driver._name or "", driver._name is not None))
+    try:
+        yield
+    finally:
+        QMessageBox.question, QMessageBox.warning, QInputDialog.getText = (staticmethod(f) for f in saved)
+        driver._name = None
+
+
+def snapshot(model):
+    """Canonical, comparable copy of everything the history can touch."""
+    snap = {
+        "label_definitions": copy.deepcopy(model.label_definitions),
+        "manual_annotations": copy.deepcopy(model.manual_annotations),
+        "smart_annotations": copy.deepcopy(model.smart_annotations),
+        "captions": {d["path"]: copy.deepcopy(d.get("captions")) for d in model.action_item_data},
+    }
+    for store in UNORDERED_EVENT_STORES:
+        snap[store] = {
+            p: sorted(json.dumps(e, sort_keys=True) for e in evts)
+            for p, evts in getattr(model, store).items() if evts
+        }
+    return snap
+
+
+def diff_snapshots(a, b, limit=5):
+    lines = []
+    for key in a:
+        if a[key] == b[key]:
+            continue
+        ka, kb = a[key], b[key]
+        if isinstance(ka, dict) and isinstance(kb, dict):
+            for k in sorted(set(ka) | set(kb), key=str):
+                if ka.get(k) != kb.get(k):
+                    lines.append(f"  {key}[{k!r}]: {ka.get(k)!r} != {kb.get(k)!r}")
+                    if len(lines) >= limit:
+                        return "\n".join(lines)
+        else:
+            lines.append(f"  {key}: {ka!r} != {kb!r}")
+    return "\n".join(lines)
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate retained size of a nested structure of builtins."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(x, seen) for x in obj)
+    return size
+
+
+def _fmt_stats(samples):
+    samples = sorted(samples)
+    n = len(samples)
+    mean = sum(samples) / n
+    return (f"n={n:<7d} mean={mean * 1e6:9.1f}us  p50={samples[n // 2] * 1e6:9.1f}us  "
+            f"p95={samples[int(n * 0.95)] * 1e6:9.1f}us  max={samples[-1] * 1e6:9.1f}us")
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    if args.ui:
+        from main_window import VideoAnnotationWindow
+        host = VideoAnnotationWindow()
+        host.reset_all_managers()
+        model = host.model
+        build_synthetic_project(model, rng, args.clips, args.heads, args.labels)
+        host.setup_dynamic_ui()
+        host.populate_action_tree()
+        history = host.history_manager
+    else:
+        model = AppStateModel()
+        host = HeadlessHost(model, managers=not args.generator)
+        build_synthetic_project(model, rng, args.clips, args.heads, args.labels)
+        history = host.history_manager
+
+    gen = CommandGenerator(model, rng)
+    driver = None if args.generator else ManagerDriver(host, gen)
+    generated = set()
+    all_types = list(CmdType)
+    timings = {"apply": defaultdict(list), "undo": defaultdict(list), "redo": defaultdict(list)}
+
+    initial = snapshot(model)
+
+    # 1. Forward: every CmdType is issued round-robin first, then at random
+    applied = 0
+    attempts = 0
+    while applied < args.ops and attempts < args.ops * 10:
+        ctype = all_types[attempts % len(all_types)] if attempts < len(all_types) else rng.choice(all_types)
+        attempts += 1
+        if driver is not None and driver.handles(ctype):
+            t0 = time.perf_counter()
+            if not driver.run(ctype):
+                continue
+            # An entry point may push another type (a dense submit on an existing event modifies it)
+            timings["apply"][model.undo_stack.peek()["type"]].append(time.perf_counter() - t0)
+            applied += 1
+            continue
+        cmd = gen.make(ctype)
+        if cmd is None:
+            continue
+        t0 = time.perf_counter()
+        history._apply_state_change(cmd, is_undo=False)
+        model.push_undo(cmd.pop("type"), **cmd)
+        timings["apply"][ctype].append(time.perf_counter() - t0)
+        generated.add(ctype)
+        applied += 1
+
+    final = snapshot(model)
+    n_entries = len(model.undo_stack)
+    stack_bytes = deep_sizeof(list(model.undo_stack))
+
+    # 2. Undo everything
+    ok = True
+    t_start = time.perf_counter()
+    while model.undo_stack:
+        ctype = model.undo_stack.peek()["type"]
+        t0 = time.perf_counter()
+        history.perform_undo()
+        timings["undo"][ctype].append(time.perf_counter() - t0)
+        app.processEvents()
+    undo_total = time.perf_counter() - t_start
+
+    after_undo = snapshot(model)
+    if after_undo != initial:
+        ok = False
+        print("FAIL: undo-all did not restore the initial state\n" + diff_snapshots(initial, after_undo))
+
+    # 3. Redo everything
+    t_start = time.perf_counter()
+    while model.redo_stack:
+        ctype = model.redo_stack.peek()["type"]
+        t0 = time.perf_counter()
+        history.perform_redo()
+        timings["redo"][ctype].append(time.perf_counter() - t0)
+        app.processEvents()
+    redo_total = time.perf_counter() - t_start
+
+    after_redo = snapshot(model)
+    if after_redo != final:
+        ok = False
+        print("FAIL: redo-all did not restore the final state\n" + diff_snapshots(final, after_redo))
+
+    # 4. Sidecar round-trip (persistent history, see models/history_store.py)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "project.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            f.write("{}")
+        t0 = time.perf_counter()
+        model.save_history(json_path)
+        save_s = time.perf_counter() - t0
+        sidecar_bytes = os.path.getsize(json_path + ".history")
+        reloaded = AppStateModel()
+        t0 = time.perf_counter()
+        reloaded.load_history(json_path)
+        load_s = time.perf_counter() - t0
+        if len(reloaded.undo_stack) != len(model.undo_stack):
+            ok = False
+            print("FAIL: sidecar reload lost history entries")
+
+        # Undo everything again, this time with commands paged in from the sidecar
+        model.load_history(json_path)
+        while model.undo_stack:
+            history.perform_undo()
+        if snapshot(model) != initial:
+            ok = False
+            print("FAIL: undo-all from the sidecar did not restore the initial state\n"
+                  + diff_snapshots(initial, snapshot(model)))
+
+    # --- Report ---
+    mode = "main window (offscreen)" if args.ui else "headless, generator only" if args.generator else "headless"
+    print(f"\nHistory stress: {applied} ops, {args.clips} clips, seed={args.seed}, {mode}")
+    if driver is not None and generated:
+        print("  from the generator: " + ", ".join(t.name for t in all_types if t in generated))
+    print(f"  undo-all: {undo_total:.3f}s   redo-all: {redo_total:.3f}s")
+    print(f"  undo stack: {n_entries} entries, ~{stack_bytes / 1024:.0f} KiB in memory "
+          f"({stack_bytes / max(1, n_entries):.0f} B/entry)")
+    print(f"  sidecar: {sidecar_bytes / 1024:.0f} KiB, save {save_s * 1000:.1f}ms, lazy load {load_s * 1000:.2f}ms")
+    for phase in ("apply", "undo", "redo"):
+        print(f"\n  [{phase}]")
+        for ctype in all_types:
+            samples = timings[phase].get(ctype)
+            if samples:
+                print(f"    {ctype.name:<28s} {_fmt_stats(samples)}")
+
+    print("\nRESULT: " + ("OK - model round-trips" if ok else "FAILED"))
+    if args.ui:
+        # The synthetic project is discarded: no unsaved-changes prompt
+        model.is_data_dirty = False
+        host.close()
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=20000, help="number of random commands to apply")
+    parser.add_argument("--clips", type=int, default=500, help="clips in the synthetic project")
+    parser.add_argument("--heads", type=int, default=4, help="initial label heads")
+    parser.add_argument("--labels", type=int, default=6, help="labels per head")
+    parser.add_argument("--seed", type=int, default=0)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--ui", action="store_true", help="drive the real main window instead of a headless host")
+    source.add_argument("--generator", action="store_true",
+                        help="generate every command and apply it through HistoryManager only (no managers)")
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import math
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-    QGroupBox, QLineEdit, QScrollArea, QFrame, QProgressBar, QToolTip, QTextEdit, QTabWidget, QComboBox
+    QGroupBox, QLineEdit, QScrollArea, QFrame, QProgressBar, QToolTip, QTextEdit, QTabWidget, QComboBox, QSpinBox
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QRectF, QPointF
 from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QCursor
@@ -138,7 +138,9 @@ class ClassificationAnnotationPanel(QWidget):
 
     annotation_saved = pyqtSignal(dict)
     smart_confirm_requested = pyqtSignal()  # [NEW] Signal emitted when confirming from the Smart Tab
-    batch_run_requested = pyqtSignal(int, int)
+    # [CHANGED] (start index, end index, clips per chunk)
+    batch_run_requested = pyqtSignal(int, int, int)
+    batch_cancel_requested = pyqtSignal()
 
     # [NEW] Signals for tab-aware clearing
     hand_clear_requested = pyqtSignal()
@@ -151,6 +153,7 @@ class ClassificationAnnotationPanel(QWidget):
         layout.setContentsMargins(5, 5, 5, 5)
         
         self.is_batch_mode_active = False
+        self.batch_running = False   # [NEW] a batch inference is in progress
         self.pending_batch_results = {}
         
         # 1. Undo/Redo removed (moved to menu bar)
@@ -256,6 +259,13 @@ class ClassificationAnnotationPanel(QWidget):
         self.lbl_end = QLabel("End:")
         self.spin_end = QComboBox()
         
+        # [NEW] Clips per inference request; results are shown after each chunk
+        self.lbl_chunk = QLabel("Chunk:")
+        self.spin_chunk = QSpinBox()
+        self.spin_chunk.setRange(1, 256)
+        self.spin_chunk.setValue(8)
+        self.spin_chunk.setToolTip("Clips per inference request")
+
         self.btn_run_batch = QPushButton("Run")
         self.btn_run_batch.setCursor(Qt.CursorShape.PointingHandCursor)
         self.btn_run_batch.clicked.connect(self._on_run_batch_clicked)
@@ -265,6 +275,8 @@ class ClassificationAnnotationPanel(QWidget):
         h_batch.addWidget(self.spin_start)
         h_batch.addWidget(self.lbl_end)
         h_batch.addWidget(self.spin_end)
+        h_batch.addWidget(self.lbl_chunk)
+        h_batch.addWidget(self.spin_chunk)
         h_batch.addWidget(self.btn_run_batch)
         
         self.batch_input_widget.setVisible(False)
@@ -277,6 +289,12 @@ class ClassificationAnnotationPanel(QWidget):
         self.infer_progress = QProgressBar()
         self.infer_progress.setRange(0, 0) 
         self.infer_progress.setVisible(False)
+
+        # [NEW] Stops a batch run after the chunk in progress
+        self.btn_cancel_batch = QPushButton("Cancel Batch")
+        self.btn_cancel_batch.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_cancel_batch.clicked.connect(self._on_cancel_batch_clicked)
+        self.btn_cancel_batch.setVisible(False)
         
         self.chart_widget = NativeDonutChart()
         
@@ -287,6 +305,7 @@ class ClassificationAnnotationPanel(QWidget):
         
         smart_layout.addWidget(self.batch_input_widget)
         smart_layout.addWidget(self.infer_progress)
+        smart_layout.addWidget(self.btn_cancel_batch)
         smart_layout.addWidget(self.chart_widget, alignment=Qt.AlignmentFlag.AlignCenter)
         smart_layout.addWidget(self.batch_result_text)
         
@@ -433,7 +452,7 @@ class ClassificationAnnotationPanel(QWidget):
         try:
             start_idx = int(self.spin_start.text().strip())
             end_idx = int(self.spin_end.text().strip())
-            self.batch_run_requested.emit(start_idx, end_idx)
+            self.batch_run_requested.emit(start_idx, end_idx, self.spin_chunk.value())
         except ValueError:
             pass 
 
@@ -468,6 +487,9 @@ class ClassificationAnnotationPanel(QWidget):
 
     # [MODIFIED] Hide the batch input box upon confirmation or action switch
     def reset_smart_inference(self):
+        # [FIX] A running batch keeps its progress, Cancel button and streamed results
+        if self.batch_running:
+            return
         self.is_batch_mode_active = False
         self.chart_widget.setVisible(False)
         self.batch_result_text.setVisible(False)
@@ -536,16 +558,55 @@ class ClassificationAnnotationPanel(QWidget):
         end_idx = start_idx + self.spin_end.currentIndex()
         
         if start_idx >= 0 and end_idx >= start_idx:
-            self.batch_run_requested.emit(start_idx, end_idx)
+            self.batch_run_requested.emit(start_idx, end_idx, self.spin_chunk.value())
+
+    def _on_cancel_batch_clicked(self):
+        self.btn_cancel_batch.setEnabled(False)
+        self.btn_cancel_batch.setText("Cancelling...")
+        self.batch_cancel_requested.emit()
 
     def show_inference_loading(self, is_loading: bool):
         self.btn_smart_infer.setEnabled(not is_loading)
         self.btn_batch_infer.setEnabled(not is_loading)
+        self.btn_run_batch.setEnabled(not is_loading)
         self.infer_progress.setVisible(is_loading)
+        self.btn_cancel_batch.setVisible(False)
+        if not is_loading:
+            self.batch_running = False
         if is_loading:
+            self.infer_progress.setRange(0, 0)
+            self.infer_progress.setFormat("")
             self.chart_widget.setVisible(False)
             self.batch_result_text.setVisible(False)
 
+    def start_batch_progress(self, total: int):
+        """[NEW] Determinate progress and a cancel button for a batch run of `total` clips."""
+        self.show_inference_loading(True)
+        self.infer_progress.setRange(0, total)
+        self.infer_progress.setValue(0)
+        self.infer_progress.setFormat(f"0 / {total} clips")
+        self.btn_cancel_batch.setText("Cancel Batch")
+        self.btn_cancel_batch.setEnabled(True)
+        self.btn_cancel_batch.setVisible(True)
+        self.batch_running = True
+        self.is_batch_mode_active = True
+        self.pending_batch_results = {}
+        self.batch_result_text.clear()
+
+    def show_batch_progress(self, done: int, total: int, clips_per_s: float, eta_s: float):
+        self.infer_progress.setValue(done)
+        text = f"{done} / {total} clips"
+        if clips_per_s > 0:
+            eta = int(round(eta_s))
+            text += f"  |  {clips_per_s:.2f} clips/s  |  ETA {eta // 60}:{eta % 60:02}"
+        self.infer_progress.setFormat(text)
+
+    def append_batch_inference_result(self, result_text: str, batch_predictions: dict):
+        """[NEW] Show the predictions of one finished chunk while the batch continues."""
+        self.pending_batch_results.update(batch_predictions)
+        self.batch_result_text.append(result_text.rstrip("\n"))
+        self.batch_result_text.setVisible(True)
+
     def display_inference_result(self, target_head: str, predicted_label: str, conf_dict: dict):
         self.show_inference_loading(False)
         self.is_batch_mode_active = False
@@ -3,7 +3,8 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QRadioButton, QTreeView, QDialogButtonBox,
     QAbstractItemView, QGroupBox, QFormLayout, QLineEdit, QHBoxLayout,
     QCheckBox, QFrame, QListWidget, QComboBox, QPushButton, QLabel,
-    QMessageBox, QWidget, QListWidgetItem, QStyle, QButtonGroup, QScrollArea
+    QMessageBox, QWidget, QListWidgetItem, QStyle, QButtonGroup, QScrollArea,
+    QTableWidget, QTableWidgetItem, QHeaderView
 )
 from PyQt6.QtCore import QDir, Qt, QSize
 from PyQt6.QtGui import QFileSystemModel, QIcon
@@ -193,4 +194,82 @@ class MediaErrorDialog(QMessageBox):
         if error_string:
             self.setDetailedText(f"System Diagnostic Logs:\n{error_string}")
             
-        self.setStandardButtons(QMessageBox.StandardButton.Ok)
\ No newline at end of file
+        self.setStandardButtons(QMessageBox.StandardButton.Ok)
+
+class PlaybackStatsDialog(QDialog):
+    """
+    [NEW] Non-modal panel of the playback telemetry (MediaController.stats).
+    One row per clip, the one playing first; refreshed while visible.
+    """
+    COLUMNS = ("Clip", "Codec", "Resolution", "First frame", "Seek (median / p95)",
+               "Frame interval", "Jitter", "Dropped")
+
+    def __init__(self, stats, parent=None) -> None:
+        super().__init__(parent)
+        self.stats = stats
+        self.setWindowTitle("Playback Stats")
+        self.resize(900, 360)
+
+        layout = QVBoxLayout(self)
+        machine = stats.machine
+        self.machine_lbl = QLabel(
+            f"{machine['os']} ({machine['arch']}, {machine['cpus']} CPUs) · Qt {machine['qt']}"
+        )
+        layout.addWidget(self.machine_lbl)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        log_lbl = QLabel(f"Log: {stats.log_path}")
+        log_lbl.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(log_lbl)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        btn_clear = buttons.addButton("Clear", QDialogButtonBox.ButtonRole.ResetRole)
+        btn_clear.clicked.connect(stats.clear)
+        buttons.rejected.connect(self.close)
+        layout.addWidget(buttons)
+
+        stats.statsChanged.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        clips = self.stats.clips()
+        self.table.setRowCount(len(clips))
+        for row, clip in enumerate(clips):
+            d = clip.to_dict()
+            name = os.path.basename(d["path"]) + (" (proxy)" if d["proxy"] else "")
+            if row == 0 and clip is self.stats.current:
+                name = "▶ " + name
+            seek = "—"
+            if d["seeks"]:
+                seek = f"{d['seek_ms_median']:.0f} / {d['seek_ms_p95']:.0f} ms ({d['seeks']})"
+            values = (
+                name,
+                d["codec"] or "—",
+                f"{d['width']}x{d['height']}" if d["width"] else "—",
+                self._ms(d["ttff_ms"]),
+                seek,
+                self._ms(d["frame_interval_ms"]),
+                self._ms(d["jitter_ms"]),
+                "—" if d["dropped_frames"] is None else f"{d['dropped_frames']} / {d['frames']}",
+            )
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 0:
+                    item.setToolTip(d["path"])
+                self.table.setItem(row, col, item)
+
+    @staticmethod
+    def _ms(value):
+        return "—" if value is None else f"{value:.0f} ms"
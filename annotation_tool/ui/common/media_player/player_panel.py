@@ -1,5 +1,8 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
+import math
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QStackedWidget, QSizePolicy
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PyQt6.QtMultimediaWidgets import QVideoWidget
 from PyQt6.QtCore import pyqtSignal, QUrl
 
 # [CHANGED] Import from common
@@ -21,7 +24,17 @@ class MediaPreviewWidget(QWidget):
         
         # [Refactor] Instantiate the Shared VideoSurface
         self.surface = VideoSurface()
-        layout.addWidget(self.surface)
+
+        # [NEW] Page 0: single view, page 1: multi-view grid (cells are reused)
+        self.stack = QStackedWidget()
+        self.stack.addWidget(self.surface)
+        self.grid_widget = QWidget()
+        self.grid_layout = QGridLayout(self.grid_widget)
+        self.grid_layout.setContentsMargins(0, 0, 0, 0)
+        self.grid_layout.setSpacing(2)
+        self.grid_cells = []
+        self.stack.addWidget(self.grid_widget)
+        layout.addWidget(self.stack)
         
         # [Compatibility] Expose internal components for Localization Manager
         self.player = self.surface.player
@@ -29,10 +42,82 @@ class MediaPreviewWidget(QWidget):
         self.video_widget = self.surface.video_widget
         
         # Forward signals
-        self.player.positionChanged.connect(self.positionChanged.emit)
-        self.player.durationChanged.connect(self.durationChanged.emit)
-        self.player.playbackStateChanged.connect(self.stateChanged.emit)
-        self.player.errorOccurred.connect(self._on_error)
+        self._signal_player = None
+        self._connect_player(self.player)
+
+    def set_player(self, player):
+        """
+        [NEW] Swap the displayed player (used by MediaController prefetch).
+        Listeners keep using this widget's signals and `self.player`.
+        """
+        if player is self.player:
+            return
+        self.surface.attach_player(player)
+        self.player = player
+        self._follow(player)
+
+    def _follow(self, player):
+        """Forward the signals of `player` (the displayed clip, or the master view of the grid)."""
+        if player is self._signal_player:
+            return
+        self._disconnect_player(self._signal_player)
+        self._connect_player(player)
+        # Bring the timeline up to date
+        self.durationChanged.emit(player.duration())
+        self.positionChanged.emit(player.position())
+        self.stateChanged.emit(player.playbackState())
+
+    def show_grid(self, players):
+        """[NEW] Render each player in its own cell of the multi-view grid."""
+        while len(self.grid_cells) < len(players):
+            cell = QVideoWidget()
+            cell.setProperty("class", "video_preview_widget")
+            cell.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+            self.grid_cells.append(cell)
+
+        cols = max(1, math.ceil(math.sqrt(len(players))))
+        for i, cell in enumerate(self.grid_cells):
+            self.grid_layout.removeWidget(cell)
+            cell.setVisible(i < len(players))
+            if i < len(players):
+                self.grid_layout.addWidget(cell, i // cols, i % cols)
+                players[i].setVideoOutput(cell)
+        self.stack.setCurrentWidget(self.grid_widget)
+        # The timeline follows the master view (the first one)
+        if players:
+            self._follow(players[0])
+
+    def show_single(self):
+        """[NEW] Back to the single-view surface."""
+        self.stack.setCurrentWidget(self.surface)
+        self._follow(self.player)
+
+    def is_grid_visible(self):
+        return self.stack.currentWidget() is self.grid_widget
+
+    def _connect_player(self, player):
+        self._signal_player = player
+        player.positionChanged.connect(self._forward_position)
+        player.durationChanged.connect(self._forward_duration)
+        player.playbackStateChanged.connect(self._forward_state)
+        player.errorOccurred.connect(self._on_error)
+
+    def _disconnect_player(self, player):
+        if player is None:
+            return
+        player.positionChanged.disconnect(self._forward_position)
+        player.durationChanged.disconnect(self._forward_duration)
+        player.playbackStateChanged.disconnect(self._forward_state)
+        player.errorOccurred.disconnect(self._on_error)
+
+    def _forward_position(self, ms):
+        self.positionChanged.emit(ms)
+
+    def _forward_duration(self, ms):
+        self.durationChanged.emit(ms)
+
+    def _forward_state(self, state):
+        self.stateChanged.emit(state)
 
     def load_video(self, path):
         """Loads source via shared surface but does not auto-play."""
@@ -1,47 +1,587 @@
+import numpy as np
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QSlider, QLabel, QPushButton,
-    QStyle, QStyleOptionSlider, QScrollArea, QScrollBar
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollBar, QSizePolicy
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QPainter, QColor, QPen
+from PyQt6.QtCore import Qt, pyqtSignal, QRect, QRectF, QPoint, QLine, QLineF
+from PyQt6.QtGui import QPainter, QColor, QPen, QPixmap
+
+# [NEW] Hover preview size (the filmstrip tiles fill the track height)
+HOVER_PREVIEW_HEIGHT = 90
+# [NEW] Audio envelope: share of the track height and colour
+WAVEFORM_HEIGHT_RATIO = 0.45
+WAVEFORM_COLOR = QColor(0, 191, 255, 170)
+# [NEW] Marker level of detail: a bucket of DENSITY_BUCKET_PX pixels holding
+# more than DENSITY_MAX_MARKERS markers is drawn as a density bar instead
+DENSITY_BUCKET_PX = 4
+DENSITY_MAX_MARKERS = 3
+# [NEW] Zoom: factor per button click / wheel notch, and the deepest zoom
+# (one frame is MAX_PX_PER_FRAME pixels wide; 25 fps until the clip's rate is known)
+ZOOM_STEP = 1.5
+WHEEL_ZOOM_STEP = 1.25
+MAX_PX_PER_FRAME = 24
+DEFAULT_FRAME_RATE = 25.0
+# Frame boundaries are ticked (and seeks snap to frames) from this frame width on
+FRAME_TICK_MIN_PX = 6
+# [NEW] Track look (formerly the QSlider groove / handle stylesheet)
+GROOVE_HEIGHT = 8
+GROOVE_COLOR = QColor("#202020")
+GROOVE_BORDER_COLOR = QColor("#3A3A3A")
+PLAYED_COLOR = QColor("#444444")
+PLAYHEAD_COLOR = QColor("#FF3333")
+PLAYHEAD_SIZE = (8, 16)
+FRAME_TICK_COLOR = QColor(160, 160, 160, 150)
+# [NEW] Event lanes (one per head) above the track: colour per lane, lane height
+# shrinking from LANE_HEIGHT down to MIN_LANE_HEIGHT to keep all lanes within
+# MAX_LANES_HEIGHT pixels
+LANE_COLORS = ["#00BFFF", "#FF8C00", "#32CD32", "#FF69B4", "#FFD700",
+               "#9370DB", "#00CED1", "#FF6347", "#ADFF2F", "#F08080"]
+LANE_HEIGHT = 10
+MIN_LANE_HEIGHT = 4
+MAX_LANES_HEIGHT = 120
+LANE_STRIPE_COLOR = QColor(255, 255, 255, 14)
+LANE_LABEL_COLOR = QColor(230, 230, 230)
+LANE_LABEL_BACKGROUND = QColor(0, 0, 0, 150)
+# Widget and track heights without lanes
+BASE_HEIGHT = 84
+CANVAS_HEIGHT = 42
+
+
+class TimelineCanvas(QWidget):
+    """
+    [NEW] Custom-painted track of the timeline (replaces the zoomed QSlider).
+
+    Shows the time window [t0, t0 + span] of the clip across the widget,
+    whatever the zoom, down to MAX_PX_PER_FRAME pixels per frame. Only the
+    visible window is painted: the filmstrip, audio envelope, frame ticks and
+    groove form a cached back layer, the markers a cached marker layer; both
+    are rebuilt when the window, the size or their data change, so playhead
+    updates only blit them and draw the played part and the playhead.
+
+    Instead of flat markers, set_lanes() shows one lane per head above the
+    track, each fed by range queries on a HeadEventIndex and cached in its
+    own pixmap (set_markers() and set_lanes() replace each other).
+
+    Clicking or dragging moves the playhead (scrubbed) and seeks on release
+    (seekRequested). The mouse wheel zooms around the cursor; Shift+wheel or
+    a horizontal wheel pans. windowChanged() is emitted on zoom / pan.
+    """
+    seekRequested = pyqtSignal(int)
+    scrubbed = pyqtSignal(int)
+    windowChanged = pyqtSignal()
+    userPanned = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.duration = 0
+        self.position = 0
+        self.t0 = 0.0
+        self.span = 0.0
+        self.fps = None
+        self.is_dragging = False
 
-class AnnotationSlider(QSlider):
-    def __init__(self, orientation, parent=None):
-        super().__init__(orientation, parent)
         self.markers = []
+        # Markers grouped by colour: [(QColor, sorted start_ms array)]
+        self._marker_groups = []
+        self._marker_peak = (None, 0)      # (bucket scale, busiest bucket count)
+        self.density_threshold = DENSITY_MAX_MARKERS
+        # [NEW] Event lanes: HeadEventIndex and one dict per lane
+        # (head, color, ms, peak, layer), top to bottom
+        self.lane_index = None
+        self._lanes = []
+        self.lane_height = LANE_HEIGHT
+        # Filmstrip (controllers.media_cache.thumbnails.Filmstrip) or None
+        self.thumbnails = None
+        # AudioEnvelope (controllers.media_cache.waveform) or None
+        self.audio_envelope = None
+
+        self._back_layer = (None, None)    # (key, QPixmap)
+        self._marker_layer = (None, None)
+        self._hover_label = None
+        self.setMouseTracking(True)
+        self.setMinimumHeight(28)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    # ------------------------------------------------------------------
+    # Time <-> pixel mapping
+    # ------------------------------------------------------------------
+    def _track(self):
+        """Horizontal extent of the time axis (inset so the playhead fits at both ends)."""
+        half = PLAYHEAD_SIZE[0] // 2
+        return QRect(half, 0, max(0, self.width() - 2 * half), self.height())
+
+    def visible_span(self):
+        return self.span if self.span > 0 else float(self.duration)
+
+    def px_per_ms(self):
+        span = self.visible_span()
+        return self._track().width() / span if span > 0 else 0.0
+
+    def x_of(self, ms):
+        return self._track().left() + (ms - self.t0) * self.px_per_ms()
+
+    def ms_at(self, x):
+        scale = self.px_per_ms()
+        if scale <= 0:
+            return 0
+        ms = self.t0 + (x - self._track().left()) / scale
+        return int(round(min(max(ms, 0.0), float(self.duration))))
+
+    def frame_ms(self):
+        return 1000.0 / (self.fps or DEFAULT_FRAME_RATE)
+
+    def min_span(self):
+        """Narrowest window: one frame is MAX_PX_PER_FRAME pixels wide."""
+        return max(1.0, self._track().width() * self.frame_ms() / MAX_PX_PER_FRAME)
+
+    # ------------------------------------------------------------------
+    # Window (zoom / pan)
+    # ------------------------------------------------------------------
+    def set_window(self, t0, span):
+        if self.duration <= 0:
+            t0, span = 0.0, 0.0
+        else:
+            span = min(max(float(span), self.min_span()), float(self.duration))
+            t0 = min(max(float(t0), 0.0), self.duration - span)
+        if (t0, span) != (self.t0, self.span):
+            self.t0, self.span = t0, span
+            self.update()
+            self.windowChanged.emit()
+
+    def zoom(self, factor, anchor_ms=None):
+        """Zoom in (factor > 1) or out around anchor_ms (default: the window centre)."""
+        span = self.visible_span()
+        if span <= 0:
+            return
+        if anchor_ms is None:
+            anchor_ms = self.t0 + span / 2
+        new_span = min(max(span / factor, self.min_span()), float(self.duration))
+        ratio = (anchor_ms - self.t0) / span
+        self.set_window(anchor_ms - ratio * new_span, new_span)
+
+    def zoom_level(self):
+        span = self.visible_span()
+        return self.duration / span if span > 0 else 1.0
+
+    def set_duration(self, ms):
+        zoom = self.zoom_level()
+        self.duration = max(0, int(ms))
+        self.position = min(self.position, self.duration)
+        self._marker_peak = (None, 0)
+        self.set_window(self.t0, self.duration / zoom if zoom > 0 else self.duration)
+        self.update()
+
+    def set_frame_rate(self, fps):
+        self.fps = fps if fps and fps > 0 else None
+        # The deepest zoom depends on the frame duration
+        self.set_window(self.t0, self.visible_span())
+        self._back_layer = (None, None)
+        self.update()
+
+    def set_position(self, ms):
+        self.position = min(max(0, int(ms)), self.duration) if self.duration > 0 else max(0, int(ms))
+        self.update()
+
+    # ------------------------------------------------------------------
+    # Content
+    # ------------------------------------------------------------------
+    def set_markers(self, markers):
+        """
+        Index the markers once: one sorted position array per colour, so
+        painting only bisects the visible window and draws each colour in a
+        single drawLines() call.
+        """
+        self.markers = markers
+        self.lane_index, self._lanes = None, []
+        groups = {}
+        for m in markers:
+            c = m.get('color', QColor('red'))
+            groups.setdefault(c.rgba(), (c, []))[1].append(m.get('start_ms', 0))
+        self._marker_groups = [(c, np.sort(np.asarray(ms, dtype=np.int64))) for c, ms in groups.values()]
+        self._marker_peak = (None, 0)
+        self._marker_layer = (None, None)
+        self.update()
+
+    def set_lanes(self, index, heads):
+        """
+        One lane per head (in the given order) over a models.HeadEventIndex,
+        replacing the flat markers. A lane whose events did not change keeps
+        its cached pixmap, so an edit only repaints the lane it touched.
+        """
+        old = {lane['head']: lane for lane in self._lanes}
+        lanes = []
+        for i, head in enumerate(heads):
+            color = QColor(LANE_COLORS[i % len(LANE_COLORS)])
+            ms = index.positions(head)
+            lane = old.get(head)
+            if lane is None or lane['color'] != color or not np.array_equal(lane['ms'], ms):
+                lane = {'head': head, 'color': color, 'ms': ms, 'peak': (None, 0), 'layer': (None, None)}
+            lanes.append(lane)
+        self.markers, self._marker_groups = [], []
+        self._marker_layer = (None, None)
+        self.lane_index, self._lanes = index, lanes
+        fit = MAX_LANES_HEIGHT // len(lanes) if lanes else LANE_HEIGHT
+        self.lane_height = max(MIN_LANE_HEIGHT, min(LANE_HEIGHT, fit))
+        self.update()
+
+    def lanes_height(self):
+        return len(self._lanes) * self.lane_height
+
+    def lane_at(self, y):
+        """Head of the lane under y, or None."""
+        i = int(y) // self.lane_height if y >= 0 else -1
+        return self._lanes[i]['head'] if 0 <= i < len(self._lanes) else None
+
+    def set_filmstrip(self, strip):
+        self.thumbnails = strip if strip else None
+        self._back_layer = (None, None)
+        self.update()
+
+    def set_audio_envelope(self, envelope):
+        self.audio_envelope = envelope if envelope else None
+        self._back_layer = (None, None)
+        self.update()
+
+    # ------------------------------------------------------------------
+    # Painting
+    # ------------------------------------------------------------------
+    def _band(self):
+        """Track band below the lanes: filmstrip, audio envelope, groove and markers."""
+        top = self.lanes_height()
+        return QRect(0, top, self.width(), max(0, self.height() - top))
+
+    def _groove_rect(self):
+        track = self._track()
+        band = self._band()
+        top = band.top() + (band.height() - GROOVE_HEIGHT) // 2
+        return QRect(track.left(), top, track.width(), GROOVE_HEIGHT)
+
+    def _layer_key(self):
+        return (self.width(), self.height(), self.devicePixelRatioF(), self.t0, self.span, self.duration)
+
+    def _new_layer(self):
+        dpr = self.devicePixelRatioF()
+        layer = QPixmap(max(1, int(self.width() * dpr)), max(1, int(self.height() * dpr)))
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(Qt.GlobalColor.transparent)
+        return layer
 
     def paintEvent(self, event):
-        # 1. Call system draw
-        super().paintEvent(event)
-        
-        if not self.markers or self.maximum() <= 0: return
-        
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        opt = QStyleOptionSlider()
-        self.initStyleOption(opt)
-        
-        groove = self.style().subControlRect(QStyle.ComplexControl.CC_Slider, opt, QStyle.SubControl.SC_SliderGroove, self)
-        handle_rect = self.style().subControlRect(QStyle.ComplexControl.CC_Slider, opt, QStyle.SubControl.SC_SliderHandle, self)
-        
-        available_width = groove.width()
-        x_offset = groove.x()
-        
-        # 2. Draw markers
-        for m in self.markers:
-            start_ms = m.get('start_ms', 0)
-            ratio = start_ms / self.maximum()
-            x = x_offset + int(available_width * ratio)
-            
-            c = m.get('color', QColor('red'))
-            painter.setPen(QPen(c, 2))
-            painter.drawLine(x, groove.top() - 2, x, groove.bottom() + 2)
+        groove = self._groove_rect()
+        if self.duration <= 0 or groove.width() <= 0:
+            self._paint_groove(painter, groove)
+            return
+
+        painter.drawPixmap(0, 0, self._back())
+        # Played part of the groove
+        x = self.x_of(self.position)
+        if x > groove.left():
+            right = min(x, groove.right())
+            painter.fillRect(QRectF(groove.left() + 1, groove.top() + 1, right - groove.left() - 1, groove.height() - 2),
+                             PLAYED_COLOR)
+        if self._marker_groups:
+            painter.drawPixmap(0, 0, self._markers_layer())
+        for i, lane in enumerate(self._lanes):
+            painter.drawPixmap(0, i * self.lane_height, self._lane_layer(i, lane))
+        # Playhead
+        w, h = PLAYHEAD_SIZE
+        if self.t0 <= self.position <= self.t0 + self.visible_span():
+            if self._lanes:
+                painter.setPen(QPen(PLAYHEAD_COLOR, 1))
+                painter.drawLine(QLineF(x, 0, x, self.lanes_height()))
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(QPen(PLAYHEAD_COLOR, 1))
+            painter.setBrush(PLAYHEAD_COLOR)
+            painter.drawRoundedRect(QRectF(x - w / 2, groove.center().y() - h / 2 + 1, w, h), 4, 4)
+
+    def _paint_groove(self, painter, groove):
+        painter.setPen(QPen(GROOVE_BORDER_COLOR, 1))
+        painter.setBrush(GROOVE_COLOR)
+        painter.drawRoundedRect(groove.adjusted(0, 0, -1, -1), 3, 3)
+
+    def _back(self):
+        """Filmstrip, audio envelope, frame ticks and groove of the visible window (cached)."""
+        key = self._layer_key() + (id(self.thumbnails), id(self.audio_envelope), self.fps)
+        if self._back_layer[0] != key:
+            layer = self._new_layer()
+            p = QPainter(layer)
+            if self.thumbnails:
+                self._paint_thumbnails(p)
+            if self.audio_envelope:
+                self._paint_waveform(p)
+            self._paint_groove(p, self._groove_rect())
+            self._paint_frame_ticks(p)
+            p.end()
+            self._back_layer = (key, layer)
+        return self._back_layer[1]
+
+    def _paint_thumbnails(self, painter):
+        """Filmstrip behind the groove, placed by time so it follows the zoom level."""
+        strip = self.thumbnails
+        scale = self.px_per_ms()
+        if not strip or scale <= 0:
+            return
+        band = self._band()
+        tile_h = band.height()
+        first = strip.images[0]
+        tile_w = max(1, first.width() * tile_h // max(1, first.height()))
+        # Only the tiles overlapping the window (the one starting before it included)
+        start = strip.times_ms.searchsorted(self.t0 - tile_w / scale, side="right")
+        next_free = -tile_w
+        painter.setOpacity(0.55)
+        for i in range(max(0, int(start) - 1), len(strip)):
+            x = int(self.x_of(strip.times_ms[i]))
+            if x > self.width():
+                break
+            # When zoomed out, skip tiles that would overlap the previous one
+            if x < next_free:
+                continue
+            painter.drawImage(QRect(x, band.top(), tile_w, tile_h), strip.images[i])
+            next_free = x + tile_w
+        painter.setOpacity(1.0)
+
+    def _paint_waveform(self, painter):
+        """Audio envelope along the bottom edge, one bar per pixel column (max level under it)."""
+        env = self.audio_envelope
+        scale = self.px_per_ms()
+        if not env or scale <= 0:
+            return
+        width = self.width()
+        ms_per_px = 1.0 / scale
+        peaks = env.peaks(self.t0 - self._track().left() * ms_per_px, ms_per_px, width)
+        bottom = self.height() - 1
+        band = self._band().height() * WAVEFORM_HEIGHT_RATIO
+        lines = [QLine(i, bottom, i, bottom - int(level * band)) for i, level in enumerate(peaks.tolist()) if level > 0.02]
+        painter.setPen(QPen(WAVEFORM_COLOR, 1))
+        painter.drawLines(lines)
+
+    def _paint_frame_ticks(self, painter):
+        """Frame boundaries above and below the groove once a frame is FRAME_TICK_MIN_PX wide."""
+        frame = self.frame_ms()
+        step = frame * self.px_per_ms()
+        if step < FRAME_TICK_MIN_PX:
+            return
+        first = int(self.t0 // frame)
+        last = int((self.t0 + self.visible_span()) // frame) + 1
+        groove = self._groove_rect()
+        xs = self.x_of(np.arange(first, last + 1) * frame).astype(np.int64).tolist()
+        painter.setPen(QPen(FRAME_TICK_COLOR, 1))
+        painter.drawLines([QLine(x, groove.top() - 4, x, groove.top() - 1) for x in xs] +
+                          [QLine(x, groove.bottom() + 1, x, groove.bottom() + 4) for x in xs])
+
+    def _markers_layer(self):
+        """
+        Markers of the visible window, from a cached pixmap rebuilt only when
+        the markers, the window or the size change.
+
+        Level of detail: markers are counted per DENSITY_BUCKET_PX bucket
+        (numpy histogram of the position array). Buckets with more than
+        density_threshold markers are drawn as a bar whose height and opacity
+        grow with the count; the others keep individual lines, so zooming in
+        turns the bars back into markers.
+        """
+        key = self._layer_key() + (self.density_threshold,)
+        if self._marker_layer[0] == key:
+            return self._marker_layer[1]
+        layer = self._new_layer()
+        p = QPainter(layer)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        scale = self.px_per_ms()
+        groove = self._groove_rect()
+        top, bottom = groove.top() - 2, groove.bottom() + 2
+        grow = max(0.0, self._band().height() / 2 - 2 - (bottom - top) / 2)
+        lo_ms, hi_ms = self._bucket_window()
+        peak = self._density_peak(scale)
+        for color, ms in self._marker_groups:
+            visible = ms[ms.searchsorted(lo_ms, side="left"):ms.searchsorted(hi_ms, side="right")]
+            self._paint_positions(p, color, visible, peak, top, bottom, grow)
+        p.end()
+        self._marker_layer = (key, layer)
+        return layer
 
-        # 3. Redraw handle on top
-        painter.setPen(QPen(QColor("#FF3333"), 1))
-        painter.setBrush(QColor("#FF3333"))
-        painter.drawRoundedRect(handle_rect, 4, 4)
+    def _lane_layer(self, i, lane):
+        """
+        Pixmap of one lane for the visible window, rebuilt only when the window,
+        the width or the lane's events change: the lane's events come from a
+        range query on lane_index, and crowded buckets use the lane's own peak.
+        """
+        h = self.lane_height
+        key = (self.width(), self.devicePixelRatioF(), self.t0, self.span, self.duration,
+               h, i % 2, self.density_threshold)
+        if lane['layer'][0] == key:
+            return lane['layer'][1]
+        dpr = self.devicePixelRatioF()
+        layer = QPixmap(max(1, int(self.width() * dpr)), max(1, int(h * dpr)))
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(LANE_STRIPE_COLOR if i % 2 == 0 else Qt.GlobalColor.transparent)
+        p = QPainter(layer)
+        scale = self.px_per_ms()
+        if lane['peak'][0] != scale:
+            lane['peak'] = (scale, self._runs_peak(lane['ms'], scale))
+        lo_ms, hi_ms = self._bucket_window()
+        visible = self.lane_index.range(lane['head'], lo_ms, hi_ms)
+        self._paint_positions(p, lane['color'], visible, lane['peak'][1], 1, h - 1, 0.0)
+        if h >= 8:
+            font = p.font()
+            font.setPixelSize(h - 2)
+            p.setFont(font)
+            label = QRect(self._track().left(), 0, p.fontMetrics().horizontalAdvance(lane['head']) + 4, h)
+            p.fillRect(label, LANE_LABEL_BACKGROUND)
+            p.setPen(LANE_LABEL_COLOR)
+            p.drawText(label, Qt.AlignmentFlag.AlignCenter, lane['head'])
+        p.end()
+        lane['layer'] = (key, layer)
+        return layer
+
+    def _bucket_window(self):
+        """
+        Time range to paint, widened to whole DENSITY_BUCKET_PX buckets so edge
+        buckets are fully counted. Buckets are aligned on time 0, so they do not
+        shift while panning.
+        """
+        scale = self.px_per_ms()
+        origin = self.x_of(0)
+        lo_px = (-2 - origin) // DENSITY_BUCKET_PX * DENSITY_BUCKET_PX
+        hi_px = (self.width() + 2 - origin) // DENSITY_BUCKET_PX * DENSITY_BUCKET_PX + DENSITY_BUCKET_PX
+        return lo_px / scale, hi_px / scale
+
+    def _paint_positions(self, painter, color, visible, peak, top, bottom, grow):
+        """
+        Markers at the sorted positions `visible` between top and bottom: crowded
+        buckets as density bars (growing by up to `grow` pixels each side), the
+        other markers as lines.
+        """
+        if not len(visible):
+            return
+        scale = self.px_per_ms()
+        origin = self.x_of(0)
+        offsets = (visible * scale).astype(np.int64)
+        buckets = offsets // DENSITY_BUCKET_PX
+        first = int(buckets[0])
+        counts = np.bincount(buckets - first)
+        crowded = counts > self.density_threshold
+        if crowded.any():
+            self._paint_density(painter, color, origin, first, counts, crowded, peak, top, bottom, grow)
+            offsets = offsets[~crowded[buckets - first]]
+        # Markers falling on the same pixel column are drawn once
+        xs = np.unique((origin + offsets).astype(np.int64))
+        painter.setPen(QPen(color, 2))
+        painter.drawLines([QLine(x, top, x, bottom) for x in xs.tolist()])
+
+    def _density_peak(self, scale):
+        """Busiest bucket of the whole clip at this zoom, over all marker colours."""
+        if self._marker_peak[0] != scale:
+            peak = max((self._runs_peak(ms, scale) for _, ms in self._marker_groups), default=0)
+            self._marker_peak = (scale, peak)
+        return self._marker_peak[1]
+
+    @staticmethod
+    def _runs_peak(ms, scale):
+        """Busiest bucket of a sorted position array (one run-length pass)."""
+        if not len(ms):
+            return 0
+        buckets = (ms * scale).astype(np.int64) // DENSITY_BUCKET_PX
+        starts = np.flatnonzero(np.diff(buckets)) + 1
+        runs = np.diff(np.concatenate(([0], starts, [len(buckets)])))
+        return int(runs.max())
+
+    def _paint_density(self, painter, color, origin, first, counts, crowded, peak, top, bottom, grow):
+        """One bar per crowded bucket, centred between top and bottom and scaled by sqrt(count / peak)."""
+        idx = np.flatnonzero(crowded)
+        level = np.sqrt(counts[idx] / max(1, peak))
+        centre = (top + bottom) / 2
+        half = (bottom - top) / 2 + level * grow
+        alpha = (110 + 145 * level).astype(np.int64)
+        xs = origin + (first + idx) * DENSITY_BUCKET_PX
+        painter.setPen(Qt.PenStyle.NoPen)
+        fill = QColor(color)
+        for x, h, a in zip(xs.tolist(), half.tolist(), alpha.tolist()):
+            fill.setAlpha(a)
+            painter.setBrush(fill)
+            painter.drawRect(QRectF(x, centre - h, DENSITY_BUCKET_PX, 2 * h))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Keep the zoom level; the deepest zoom depends on the width
+        self.set_window(self.t0, self.visible_span())
+
+    # ------------------------------------------------------------------
+    # Mouse
+    # ------------------------------------------------------------------
+    def _target_ms(self, x):
+        """Time under x, snapped to a frame start when frames are ticked."""
+        ms = self.ms_at(x)
+        frame = self.frame_ms()
+        if frame * self.px_per_ms() >= FRAME_TICK_MIN_PX:
+            ms = min(int(round(round(ms / frame) * frame)), self.duration)
+        return ms
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton or self.duration <= 0:
+            return super().mousePressEvent(event)
+        self.is_dragging = True
+        self.hide_hover_preview()
+        self.position = self._target_ms(event.position().x())
+        self.scrubbed.emit(self.position)
+        self.update()
+
+    def mouseMoveEvent(self, event):
+        x = int(event.position().x())
+        if self.is_dragging:
+            self.position = self._target_ms(x)
+            self.scrubbed.emit(self.position)
+            self.update()
+            return
+        if self._lanes:
+            # Lane name and its number of events in view
+            head = self.lane_at(event.position().y())
+            if head is None:
+                self.setToolTip("")
+            else:
+                n = self.lane_index.count(head, self.t0, self.t0 + self.visible_span())
+                self.setToolTip(f"{head}: {n} event(s) in view")
+        if not self.thumbnails:
+            return
+        # Hover preview from the in-memory filmstrip (no decoding)
+        image = self.thumbnails.image_at(self.ms_at(x))
+        if image is None:
+            return
+        if self._hover_label is None:
+            self._hover_label = QLabel(self, Qt.WindowType.ToolTip)
+        pixmap = QPixmap.fromImage(image).scaledToHeight(
+            HOVER_PREVIEW_HEIGHT, Qt.TransformationMode.SmoothTransformation
+        )
+        self._hover_label.setPixmap(pixmap)
+        self._hover_label.resize(pixmap.size())
+        self._hover_label.move(self.mapToGlobal(QPoint(x - pixmap.width() // 2, -pixmap.height() - 4)))
+        self._hover_label.show()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton and self.is_dragging:
+            self.is_dragging = False
+            self.seekRequested.emit(self.position)
+            return
+        super().mouseReleaseEvent(event)
+
+    def wheelEvent(self, event):
+        if self.duration <= 0:
+            return
+        delta = event.angleDelta()
+        if event.modifiers() & Qt.KeyboardModifier.ShiftModifier or abs(delta.x()) > abs(delta.y()):
+            steps = (delta.x() or delta.y()) / 120.0
+            self.set_window(self.t0 - steps * self.visible_span() / 10, self.visible_span())
+            self.userPanned.emit()
+        elif delta.y():
+            self.zoom(WHEEL_ZOOM_STEP ** (delta.y() / 120.0), self.ms_at(event.position().x()))
+        event.accept()
+
+    def leaveEvent(self, event):
+        self.hide_hover_preview()
+        super().leaveEvent(event)
+
+    def hide_hover_preview(self):
+        if self._hover_label is not None:
+            self._hover_label.hide()
 
 
 class TimelineWidget(QWidget):
@@ -50,19 +590,19 @@ class TimelineWidget(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        
-        self.setFixedHeight(60)
-        
+
+        self.setFixedHeight(BASE_HEIGHT)
+
         main_layout = QVBoxLayout(self)
-        main_layout.setSpacing(2) 
+        main_layout.setSpacing(2)
         main_layout.setContentsMargins(0, 5, 0, 5)
-        
+
         # 1. Time Label
         self.time_label = QLabel("00:00.000 / 00:00.000")
         self.time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.time_label.setProperty("class", "timeline_time_lbl")
         main_layout.addWidget(self.time_label)
-        
+
         # 2. Timeline Row
         timeline_row = QHBoxLayout()
         timeline_row.setSpacing(5)
@@ -76,90 +616,135 @@ class TimelineWidget(QWidget):
         self.btn_zoom_out.clicked.connect(lambda: self._change_zoom(-1))
         timeline_row.addWidget(self.btn_zoom_out)
 
-        # Scroll Area
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShape(QScrollArea.Shape.NoFrame)
-        self.scroll_area.setFixedHeight(30)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.scroll_area.setProperty("class", "timeline_scroll_area")
-        
-
-        self.scroll_bar = self.scroll_area.horizontalScrollBar()
+        # [CHANGED] Custom-painted track over a time window, with its own scroll bar
+        track_col = QVBoxLayout()
+        track_col.setSpacing(0)
+        track_col.setContentsMargins(0, 0, 0, 0)
+
+        self.canvas = TimelineCanvas()
+        self.canvas.setProperty("class", "timeline_canvas")
+        self.canvas.setFixedHeight(CANVAS_HEIGHT)
+        self.canvas.scrubbed.connect(self._update_label)
+        self.canvas.seekRequested.connect(self._on_canvas_seek)
+        self.canvas.windowChanged.connect(self._sync_scroll_bar)
+        self.canvas.userPanned.connect(self._on_user_pan)
+        track_col.addWidget(self.canvas)
+
+        self.scroll_bar = QScrollBar(Qt.Orientation.Horizontal)
+        self.scroll_bar.setProperty("class", "timeline_scroll_bar")
+        self.scroll_bar.setFixedHeight(12)
+        policy = self.scroll_bar.sizePolicy()
+        policy.setRetainSizeWhenHidden(True)
+        self.scroll_bar.setSizePolicy(policy)
+        self.scroll_bar.setVisible(False)
+        self.scroll_bar.valueChanged.connect(self._on_scroll_value)
         self.scroll_bar.sliderPressed.connect(self._on_user_scroll_start)
         self.scroll_bar.sliderReleased.connect(self._on_user_scroll_end)
+        track_col.addWidget(self.scroll_bar)
+        timeline_row.addLayout(track_col)
 
-        self.slider = AnnotationSlider(Qt.Orientation.Horizontal)
-        self.slider.setProperty("class", "timeline_slider")
-        self.slider.sliderPressed.connect(self._on_slider_pressed)
-        self.slider.sliderMoved.connect(self._on_slider_moved)
-        self.slider.sliderReleased.connect(self._on_slider_released)
-        
-        self.scroll_area.setWidget(self.slider)
-        timeline_row.addWidget(self.scroll_area)
-        
         # Zoom In
         self.btn_zoom_in = QPushButton("+")
         self.btn_zoom_in.setFixedSize(24, 24)
         self.btn_zoom_in.setProperty("class", "timeline_zoom_btn")
         self.btn_zoom_in.clicked.connect(lambda: self._change_zoom(1))
         timeline_row.addWidget(self.btn_zoom_in)
-        
+
         main_layout.addLayout(timeline_row)
-        
+
         # State
-        self.duration = 0
-        self.is_dragging = False 
-        self.user_is_scrolling = False 
-        self.zoom_level = 1.0
+        self.user_is_scrolling = False
         self.auto_scroll_active = True
-    
-    def resizeEvent(self, event):
-        super().resizeEvent(event)
-        self._update_slider_width()
+        self._syncing_scroll = False
+
+    @property
+    def duration(self):
+        return self.canvas.duration
+
+    @property
+    def is_dragging(self):
+        return self.canvas.is_dragging
+
+    @property
+    def zoom_level(self):
+        return self.canvas.zoom_level()
 
     def set_duration(self, ms):
-        self.duration = ms
-        self.slider.setRange(0, ms)
-        self._update_label(self.slider.value())
+        self.canvas.set_duration(ms)
+        self._sync_scroll_bar()
+        self._update_label(self.canvas.position)
+
+    def set_frame_rate(self, fps):
+        """[NEW] Frame rate of the clip: sets the deepest zoom and the frame ticks."""
+        self.canvas.set_frame_rate(fps)
 
     def set_position(self, ms):
-        if not self.is_dragging:
-            self.slider.setValue(ms)
+        if not self.canvas.is_dragging:
+            self.canvas.set_position(ms)
             self._update_label(ms)
             self._auto_scroll_to_playhead(ms)
 
     def set_markers(self, markers):
-        self.slider.markers = markers
-        self.slider.update()
-        
+        self.canvas.set_markers(markers)
+        self._fit_lanes()
+
+    # [NEW] Per-head event lanes
+    def set_lanes(self, index, heads):
+        """One lane per head (models.HeadEventIndex); replaces the markers."""
+        self.canvas.set_lanes(index, heads)
+        self._fit_lanes()
+
+    def clear_lanes(self):
+        if self.canvas.lane_index is not None:
+            self.set_markers([])
+
+    def _fit_lanes(self):
+        """Grow the timeline by the height of the lanes."""
+        extra = self.canvas.lanes_height()
+        if self.canvas.minimumHeight() != CANVAS_HEIGHT + extra:
+            self.canvas.setFixedHeight(CANVAS_HEIGHT + extra)
+            self.setFixedHeight(BASE_HEIGHT + extra)
+
+    # [NEW] Thumbnail filmstrip
+    def set_filmstrip(self, strip):
+        self.canvas.set_filmstrip(strip)
+
+    def clear_filmstrip(self):
+        self.canvas.hide_hover_preview()
+        self.set_filmstrip(None)
+
+    # [NEW] Audio envelope
+    def set_audio_envelope(self, envelope):
+        self.canvas.set_audio_envelope(envelope)
+
+    def clear_audio_envelope(self):
+        self.set_audio_envelope(None)
+
     def _change_zoom(self, direction):
-        old_level = self.zoom_level
-        if direction > 0:
-            self.zoom_level = min(self.zoom_level * 1.5, 20.0) 
-        else:
-            self.zoom_level = max(self.zoom_level / 1.5, 1.0)
-            
-        if abs(self.zoom_level - 1.0) < 0.05:
-            self.zoom_level = 1.0
-            
-        if old_level != self.zoom_level:
-            center_ratio = self._get_current_center_ratio()
-            self._update_slider_width()
-            self._restore_center_ratio(center_ratio)
-
-    def _update_slider_width(self):
-        viewport_width = self.scroll_area.viewport().width()
-        if self.zoom_level <= 1.0:
-            self.scroll_area.setWidgetResizable(True)
-            self.slider.setMinimumWidth(0)
-            self.slider.setMaximumWidth(16777215)
-        else:
-            self.scroll_area.setWidgetResizable(False)
-            new_width = int(viewport_width * self.zoom_level)
-            self.slider.setMinimumWidth(new_width)
-            self.slider.setMaximumWidth(new_width)
+        # [CHANGED] Zoom the time window around its centre (down to frame level)
+        self.canvas.zoom(ZOOM_STEP if direction > 0 else 1 / ZOOM_STEP)
+
+    def _sync_scroll_bar(self):
+        """Scroll bar range in ms: one page is the visible window."""
+        canvas = self.canvas
+        span = canvas.visible_span()
+        hidden_range = max(0, int(round(canvas.duration - span)))
+        self._syncing_scroll = True
+        self.scroll_bar.setRange(0, hidden_range)
+        self.scroll_bar.setPageStep(max(1, int(span)))
+        self.scroll_bar.setSingleStep(max(1, int(span / 10)))
+        self.scroll_bar.setValue(int(round(canvas.t0)))
+        self._syncing_scroll = False
+        self.scroll_bar.setVisible(hidden_range > 0)
+
+    def _on_scroll_value(self, value):
+        if self._syncing_scroll:
+            return
+        self.canvas.set_window(value, self.canvas.visible_span())
+        self._on_user_pan()
+
+    def _on_user_pan(self):
+        self.auto_scroll_active = False
 
     def _on_user_scroll_start(self):
         self.user_is_scrolling = True
@@ -167,51 +752,19 @@ class TimelineWidget(QWidget):
 
     def _on_user_scroll_end(self):
         self.user_is_scrolling = False
-        self._check_and_restore_auto_follow()
-
-    def _check_and_restore_auto_follow(self):
-        current_ms = self.slider.value()
-        if self.duration <= 0 or self.slider.width() <= 0: return
-
-        ratio = current_ms / self.duration
-        target_x = int(ratio * self.slider.width())
-        
-        viewport_w = self.scroll_area.viewport().width()
-        current_scroll = self.scroll_area.horizontalScrollBar().value()
-        
-        if current_scroll <= target_x <= current_scroll + viewport_w:
-            self.auto_scroll_active = True
 
     def _auto_scroll_to_playhead(self, current_ms):
-        if self.zoom_level <= 1.0 or self.duration <= 0: return
-        if self.user_is_scrolling or not self.auto_scroll_active: return
-
-        ratio = current_ms / self.duration
-        slider_width = self.slider.width()
-        target_x = int(ratio * slider_width)
-        
-        viewport_w = self.scroll_area.viewport().width()
-        current_scroll = self.scroll_area.horizontalScrollBar().value()
-        
-        is_visible = (current_scroll <= target_x <= current_scroll + viewport_w)
-        
+        canvas = self.canvas
+        span = canvas.visible_span()
+        if span >= canvas.duration or self.user_is_scrolling:
+            return
+        is_visible = canvas.t0 <= current_ms <= canvas.t0 + span
+        if not self.auto_scroll_active:
+            # Follow again once the playhead is back in view
+            self.auto_scroll_active = is_visible
+            return
         if not is_visible:
-            center_x = target_x - (viewport_w // 2)
-            self.scroll_area.horizontalScrollBar().setValue(center_x)
-
-    def _get_current_center_ratio(self):
-        if self.slider.width() <= 0: return 0.5
-        scroll = self.scroll_area.horizontalScrollBar().value()
-        viewport = self.scroll_area.viewport().width()
-        center_pixel = scroll + (viewport / 2)
-        return center_pixel / self.slider.width()
-
-    def _restore_center_ratio(self, ratio):
-        new_width = self.slider.width()
-        new_center_pixel = int(new_width * ratio)
-        viewport = self.scroll_area.viewport().width()
-        new_scroll = new_center_pixel - (viewport // 2)
-        self.scroll_area.horizontalScrollBar().setValue(new_scroll)
+            canvas.set_window(current_ms - span / 2, span)
 
     def _update_label(self, current_ms):
         def fmt(ms):
@@ -220,11 +773,7 @@ class TimelineWidget(QWidget):
             return f"{m:02}:{s%60:02}.{ms%1000:03}"
         self.time_label.setText(f"{fmt(current_ms)} / {fmt(self.duration)}")
 
-    def _on_slider_pressed(self): 
-        self.is_dragging = True
+    def _on_canvas_seek(self, ms):
         self.auto_scroll_active = True
-        
-    def _on_slider_moved(self, val): self._update_label(val)
-    def _on_slider_released(self):
-        self.is_dragging = False
-        self.seekRequested.emit(self.slider.value())
\ No newline at end of file
+        self._update_label(ms)
+        self.seekRequested.emit(ms)
@@ -1,9 +1,9 @@
 import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTreeView, # CHANGED: QTreeView instead of QTreeWidget
-    QLabel, QComboBox, QPushButton, QMenu, QAbstractItemView
+    QLabel, QComboBox, QPushButton, QMenu, QAbstractItemView, QLineEdit
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QModelIndex
+from PyQt6.QtCore import Qt, pyqtSignal, QModelIndex, QTimer
 
 
 
@@ -17,6 +17,10 @@ class ProjectNavigatorPanel(QWidget):
     # Emits the QModelIndex of the item to be removed
     request_remove_item = pyqtSignal(QModelIndex)
     addVideoRequested = pyqtSignal()
+    # [NEW] Emitted with the search text once typing pauses
+    searchChanged = pyqtSignal(str)
+
+    SEARCH_DELAY_MS = 150
 
     def __init__(self, 
                  tree_title="Project Items", 
@@ -45,9 +49,24 @@ class ProjectNavigatorPanel(QWidget):
         
         layout.addLayout(header_layout)
         
+        # 2. [NEW] Search box (matches clip names, ids and file names)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search clips...")
+        self.search_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.search_edit)
+        
+        # Debounce so fast typing triggers one filter pass
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(lambda: self.searchChanged.emit(self.search_edit.text()))
+        self.search_edit.textChanged.connect(self._search_timer.start)
+        
         # 3. The Tree View (MV Architecture)
         self.tree = QTreeView()
         self.tree.setHeaderHidden(True)
+        # [NEW] Lets the view skip per-row size queries on very large projects
+        self.tree.setUniformRowHeights(True)
         self.tree.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.tree.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         layout.addWidget(self.tree)
@@ -76,6 +95,17 @@ class ProjectNavigatorPanel(QWidget):
         
         layout.addLayout(bottom_layout)
 
+    def search_text(self):
+        return self.search_edit.text()
+
+    def clear_search(self):
+        """Clears the search box without waiting for the debounce."""
+        self._search_timer.stop()
+        self.search_edit.blockSignals(True)
+        self.search_edit.clear()
+        self.search_edit.blockSignals(False)
+        self.searchChanged.emit("")
+
     def _show_context_menu(self, pos):
         """
         Handles the context menu request. Maps position to Model Index.
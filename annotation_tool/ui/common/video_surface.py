@@ -35,7 +35,19 @@ class VideoSurface(QWidget):
         # 3. Add video widget to layout
         self.layout.addWidget(self.video_widget)
 
-        
+    def attach_player(self, player):
+        """
+        [NEW] Render another (already loaded) player in this surface.
+        The previous player is detached from the widget and the audio output;
+        the caller decides what happens to it.
+        """
+        if player is self.player:
+            return
+        self.player.setAudioOutput(None)
+        self.player.setVideoOutput(None)
+        player.setAudioOutput(self.audio_output)
+        player.setVideoOutput(self.video_widget)
+        self.player = player
 
     def load_source(self, path):
         """
@@ -55,6 +55,7 @@ class DenseTableModel(AnnotationTableModel):
         # Only emit change if actual data differs
         if new_item != old_item:
             self._data[row] = new_item # Update internal data immediately for consistency
+            self._invalidate_index()
             self.itemChanged.emit(old_item, new_item)
             return True
         return False
\ No newline at end of file
@@ -2,12 +2,21 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QTableView, QHeaderView, QMenu,
     QAbstractItemView, QPushButton
 )
-from PyQt6.QtCore import pyqtSignal, Qt, QAbstractTableModel
+from bisect import bisect_left
+
+from PyQt6.QtCore import pyqtSignal, Qt, QAbstractTableModel, QModelIndex
 
 # ==================== Table Model ====================
 class AnnotationTableModel(QAbstractTableModel):
     """
     Data model for the events table.
+
+    [CHANGED] set_annotations() applies a new list as row removals, moves
+    and insertions (matching events by identity) instead of a model reset,
+    so the view keeps its selection and scroll position. Only kept rows whose
+    event differs from what was last shown are repainted (in-place edits
+    included). row_of(event) and row_at_time(ms) look rows up through a
+    lazily built index.
     """
     # Signal emitted when a cell is edited: old_data, new_data
     itemChanged = pyqtSignal(dict, dict)
@@ -16,6 +25,10 @@ class AnnotationTableModel(QAbstractTableModel):
         super().__init__()
         self._data = annotations or []
         self._headers = ["Time", "Head", "Label"]
+        self._rows = None        # id(event) -> row, built on demand
+        self._positions = None   # position_ms per row, or None when not sorted
+        self._shown = {}         # id(event) -> copy of the event as last shown
+        self._remember_shown()
 
     def rowCount(self, parent=None):
         return len(self._data)
@@ -92,9 +105,92 @@ class AnnotationTableModel(QAbstractTableModel):
         return None
 
     def set_annotations(self, annotations):
-        self.beginResetModel()
+        old = self._data
+        new_ids = {id(item) for item in annotations}
+        # A different clip (nothing in common): one reset beats n row inserts
+        if not old or not any(id(item) in new_ids for item in old):
+            self.beginResetModel()
+            self._data = annotations
+            self._invalidate_index()
+            self._remember_shown()
+            self.endResetModel()
+            return
+
+        current = list(old)
+        self._data = current
+        # 1. Removed events, bottom-up so the earlier rows keep their numbers
+        gone = [row for row, item in enumerate(current) if id(item) not in new_ids]
+        for first, last in reversed(_runs(gone)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del current[first:last + 1]
+            self.endRemoveRows()
+
+        # 2. Kept events that changed order (e.g. an edited time)
+        kept_ids = {id(item) for item in current}
+        kept = [item for item in annotations if id(item) in kept_ids]
+        if any(a is not b for a, b in zip(kept, current)):
+            self._reorder(current, kept)
+
+        # 3. New events, in order of their final row
+        new_rows = [row for row, item in enumerate(annotations) if id(item) not in kept_ids]
+        for first, last in _runs(new_rows):
+            self.beginInsertRows(QModelIndex(), first, last)
+            current[first:first] = annotations[first:last + 1]
+            self.endInsertRows()
+
         self._data = annotations
-        self.endResetModel()
+        self._invalidate_index()
+        # [CHANGED] Repaint only the kept events that changed since shown (edited in place or replaced in setData)
+        shown = self._shown
+        changed = [row for row, item in enumerate(annotations) if id(item) in kept_ids and shown.get(id(item)) != item]
+        for first, last in _runs(changed):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, self.columnCount() - 1))
+        self._remember_shown()
+
+    def row_of(self, item):
+        """Row of an event (the same dict object), or -1."""
+        if self._rows is None:
+            self._build_index()
+        return self._rows.get(id(item), -1)
+
+    def row_at_time(self, time_ms, tolerance_ms=0):
+        """First row whose position is within tolerance_ms of time_ms, or -1."""
+        if self._rows is None:
+            self._build_index()
+        positions = self._positions
+        if positions is None:
+            for row, item in enumerate(self._data):
+                if abs(item.get('position_ms', 0) - time_ms) <= tolerance_ms:
+                    return row
+            return -1
+        row = bisect_left(positions, time_ms - tolerance_ms)
+        if row < len(positions) and positions[row] <= time_ms + tolerance_ms:
+            return row
+        return -1
+
+    def _reorder(self, current, ordered):
+        """Move rows to the order of `ordered` (same events) with a layout change."""
+        self.layoutAboutToBeChanged.emit()
+        new_row = {id(item): row for row, item in enumerate(ordered)}
+        moves = [new_row[id(item)] for item in current]
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(moves[idx.row()], idx.column()) for idx in old_indexes]
+        current[:] = ordered
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def _remember_shown(self):
+        self._shown = {id(item): dict(item) for item in self._data}
+
+    def _invalidate_index(self):
+        self._rows = None
+        self._positions = None
+
+    def _build_index(self):
+        self._rows = {id(item): row for row, item in enumerate(self._data)}
+        positions = [item.get('position_ms', 0) for item in self._data]
+        sortable = all(a <= b for a, b in zip(positions, positions[1:]))
+        self._positions = positions if sortable else None
 
     def get_annotation_at(self, row):
         if 0 <= row < len(self._data):
@@ -123,6 +219,17 @@ class AnnotationTableModel(QAbstractTableModel):
         return int(total_seconds * 1000)
 
 
+def _runs(rows):
+    """Sorted row numbers -> [(first, last)] of consecutive runs."""
+    runs = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
 # ==================== Table Widget ====================
 class AnnotationTableWidget(QWidget):
     """